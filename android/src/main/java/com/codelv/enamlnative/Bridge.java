@@ -31,6 +31,7 @@ import org.msgpack.value.ExtensionValue;
 import org.msgpack.value.FloatValue;
 import org.msgpack.value.IntegerValue;
 import org.msgpack.value.Value;
+import org.msgpack.value.ValueType;
 
 import java.io.IOException;
 import java.lang.String;
@@ -74,6 +75,8 @@ public class Bridge implements PythonInterpreter.EventListener {
     public static final String STATIC_METHOD = "sm";
     public static final String FIELD = "f";
     public static final String DELETE = "d";
+    public static final String BULK_DELETE = "bd";
+    public static final String DEF = "def";
     public static final String RESULT = "r";
     public static final String ERROR = "e";
 
@@ -98,6 +101,9 @@ public class Bridge implements PythonInterpreter.EventListener {
 
     final HashMap<Integer, Class[]> mClassSpecCache = new HashMap<Integer, Class[]>();
 
+    // Class and method names python sent with a DEF event
+    final HashMap<Integer,String> mNames = new HashMap<Integer, String>();
+
     final HashMap<Class,HashMap<Integer,Object>> mReflectionCache = new HashMap<>();
 
     // Cache for objects
@@ -1494,6 +1500,19 @@ public class Bridge implements PythonInterpreter.EventListener {
         mMethodCache.clear();
         mReflectionCache.clear();
         mClassSpecCache.clear();
+        mNames.clear();
+    }
+
+    /**
+     * Unpack a class or method name. It is either a string or the id
+     * of a name sent earlier with a DEF event.
+     * @param unpacker
+     */
+    String unpackName(MessageUnpacker unpacker) throws IOException {
+        if (unpacker.getNextFormat().getValueType() == ValueType.INTEGER) {
+            return mNames.get(unpacker.unpackInt());
+        }
+        return unpacker.unpackString();
     }
 
     /**
@@ -1554,7 +1573,7 @@ public class Bridge implements PythonInterpreter.EventListener {
                         case CREATE:
                             int objId = unpacker.unpackInt();
                             int cacheId = unpacker.unpackInt();
-                            String objClass = unpacker.unpackString();
+                            String objClass = unpackName(unpacker);
                             int argCount = unpacker.unpackArrayHeader();
                             Value[] args = new Value[argCount];
                             for (int j=0; j<argCount; j++) {
@@ -1567,7 +1586,7 @@ public class Bridge implements PythonInterpreter.EventListener {
 
                         case PROXY:
                             objId = unpacker.unpackInt();
-                            objClass = unpacker.unpackString();
+                            objClass = unpackName(unpacker);
                             int refId = unpacker.unpackInt();
                             mTaskQueue.add(()->{createProxy(objId, objClass, refId);});
                             break;
@@ -1576,7 +1595,7 @@ public class Bridge implements PythonInterpreter.EventListener {
                             objId = unpacker.unpackInt();
                             int resultId = unpacker.unpackInt();
                             cacheId = unpacker.unpackInt();
-                            String objMethod = unpacker.unpackString();
+                            String objMethod = unpackName(unpacker);
                             argCount = unpacker.unpackArrayHeader();
                             args = new Value[argCount];
                             for (int j=0; j<argCount; j++) {
@@ -1587,10 +1606,10 @@ public class Bridge implements PythonInterpreter.EventListener {
                             mTaskQueue.add(()->{updateObject(objId, resultId, cacheId, objMethod, uv);});
                             break;
                         case STATIC_METHOD:
-                            objClass = unpacker.unpackString();
+                            objClass = unpackName(unpacker);
                             resultId = unpacker.unpackInt();
                             cacheId = unpacker.unpackInt();
-                            objMethod = unpacker.unpackString();
+                            objMethod = unpackName(unpacker);
                             argCount = unpacker.unpackArrayHeader();
                             args = new Value[argCount];
                             for (int j=0; j<argCount; j++) {
@@ -1604,7 +1623,7 @@ public class Bridge implements PythonInterpreter.EventListener {
                         case FIELD:
                             objId = unpacker.unpackInt();
                             cacheId = unpacker.unpackInt();
-                            String objField = unpacker.unpackString();
+                            String objField = unpackName(unpacker);
                             argCount = unpacker.unpackArrayHeader();
                             args = new Value[argCount];
                             for (int j=0; j<argCount; j++) {
@@ -1620,6 +1639,25 @@ public class Bridge implements PythonInterpreter.EventListener {
                             mTaskQueue.add(()->{deleteObject(objId);});
                             break;
 
+                        case BULK_DELETE:
+                            int idCount = unpacker.unpackArrayHeader();
+                            int[] objIds = new int[idCount];
+                            for (int j=0; j<idCount; j++) {
+                                objIds[j] = unpacker.unpackInt();
+                            }
+                            mTaskQueue.add(()->{
+                                for (int id: objIds) {
+                                    deleteObject(id);
+                                }
+                            });
+                            break;
+
+                        case DEF:
+                            // Only used while parsing so no task is needed
+                            int nameId = unpacker.unpackInt();
+                            mNames.put(nameId, unpacker.unpackString());
+                            break;
+
                         case RESULT:
                             objId = unpacker.unpackInt();
                             Value arg = unpacker.unpackValue();
@@ -521,6 +521,9 @@ public class EnamlActivity extends AppCompatActivity {
             put("DISPLAY_WIDTH", metrics.widthPixels/metrics.density);
             put("DISPLAY_HEIGHT", metrics.heightPixels/metrics.density);
             put("DISPLAY_ORIENTATION", getResources().getConfiguration().orientation);
+            put("DISPLAY_REFRESH_RATE", getWindowManager().getDefaultDisplay().getRefreshRate());
+            put("BULK_ADD_VIEWS", true);
+            put("BATCH_RECYCLE", true);
         }};
     }
 
@@ -6,6 +6,7 @@ import android.view.ViewGroup;
 import android.widget.FrameLayout;
 
 import java.util.ArrayList;
+import java.util.Arrays;
 
 /**
  * Created by jrm on 5/3/18.
@@ -18,6 +19,28 @@ public class BridgedRecyclerAdapter extends RecyclerView.Adapter<BridgedRecycler
     BridgedListAdapterListener mListener;
     final ArrayList<View> mRecycleViews = new ArrayList<>();
 
+    // Views bound since the last batch was sent when batching is enabled
+    boolean mBatchRecycle = false;
+    boolean mRecyclePosted = false;
+    int mPendingCount = 0;
+    int[] mPendingIndices = new int[16];
+    int[] mPendingPositions = new int[16];
+
+    // Sends all views bound during the layout pass in one event
+    final Runnable mSendRecycles = new Runnable() {
+        @Override
+        public void run() {
+            int count = mPendingCount;
+            mPendingCount = 0;
+            mRecyclePosted = false;
+            if (count > 0 && mListener != null) {
+                mListener.onRecycleViews(
+                        Arrays.copyOf(mPendingIndices, count),
+                        Arrays.copyOf(mPendingPositions, count));
+            }
+        }
+    };
+
     // Provide a reference to the views for each data item
     // Complex data items may need more than one view per item, and
     // you provide access to all the views for a data item in a view holder
@@ -60,7 +83,36 @@ public class BridgedRecyclerAdapter extends RecyclerView.Adapter<BridgedRecycler
     // Replace the contents of a view (invoked by the layout manager)
     @Override
     public void onBindViewHolder(ViewHolder holder, int position) {
-        mListener.onRecycleView(holder.mIndex, position);
+        if (!mBatchRecycle) {
+            mListener.onRecycleView(holder.mIndex, position);
+            return;
+        }
+        // A view bound again before the batch is sent only needs its last position
+        for (int i = 0; i < mPendingCount; i++) {
+            if (mPendingIndices[i] == holder.mIndex) {
+                mPendingPositions[i] = position;
+                return;
+            }
+        }
+        if (mPendingCount == mPendingIndices.length) {
+            mPendingIndices = Arrays.copyOf(mPendingIndices, 2 * mPendingCount);
+            mPendingPositions = Arrays.copyOf(mPendingPositions, 2 * mPendingCount);
+        }
+        mPendingIndices[mPendingCount] = holder.mIndex;
+        mPendingPositions[mPendingCount] = position;
+        mPendingCount++;
+        if (!mRecyclePosted) {
+            mRecyclePosted = true;
+            mListView.post(mSendRecycles);
+        }
+    }
+
+    /**
+     * Send the views bound in each layout pass with one onRecycleViews event
+     * instead of an onRecycleView event for each.
+     */
+    public void setBatchRecycle(boolean enabled) {
+        mBatchRecycle = enabled;
     }
 
     public void setRecyleListener(BridgedListAdapterListener listener) {
@@ -123,5 +175,6 @@ public class BridgedRecyclerAdapter extends RecyclerView.Adapter<BridgedRecycler
 
     interface BridgedListAdapterListener {
         void onRecycleView(int index, int position);
+        void onRecycleViews(int[] indices, int[] positions);
     }
 }
@@ -0,0 +1,29 @@
+package com.codelv.enamlnative.adapters;
+
+import android.view.View;
+import android.view.ViewGroup;
+
+/**
+ * Helpers to update a ViewGroup with a single bridge call
+ */
+public class BridgedViewGroupUtils {
+
+    /**
+     * Add the views to the parent at the given indices in order. If the layout params of
+     * a view are null the params of the view are used.
+     *
+     * @param parent: The ViewGroup to add the views to
+     * @param views: Views to add
+     * @param indices: Index each view is added at
+     * @param params: LayoutParams of each view or null
+     */
+    public static void addViews(ViewGroup parent, View[] views, int[] indices, ViewGroup.LayoutParams[] params) {
+        for (int i = 0; i < views.length; i++) {
+            if (params[i] != null) {
+                parent.addView(views[i], indices[i], params[i]);
+            } else {
+                parent.addView(views[i], indices[i]);
+            }
+        }
+    }
+}
@@ -74,17 +74,22 @@ int start_logger() {
  * This sends data to the java's PythonInterpreter.publishEvents for handling.
  */
 static PyObject *NativeHooks_publish(PyObject *self, PyObject *args) {
-    Py_ssize_t count;
-    const char* data;
-    if (!PyArg_ParseTuple(args, "s#", &data, &count)) {
+    // Accept any bytes-like object (bytes, bytearray, or memoryview)
+    Py_buffer data;
+#if PY_MAJOR_VERSION >= 3
+    if (!PyArg_ParseTuple(args, "y*", &data)) {
+#else
+    if (!PyArg_ParseTuple(args, "s*", &data)) {
+#endif
         return NULL;
     }
-    jbyteArray buf = (*jenv)->NewByteArray(jenv, count);
-    (*jenv)->SetByteArrayRegion(jenv,buf, 0, count, data);
+    jbyteArray buf = (*jenv)->NewByteArray(jenv, data.len);
+    (*jenv)->SetByteArrayRegion(jenv,buf, 0, data.len, data.buf);
     (*jenv)->CallStaticVoidMethod(jenv, mPythonInterpreter, mPublishEvents, buf);
 
     // Cleanup
     (*jenv)->DeleteLocalRef(jenv, buf);
+    PyBuffer_Release(&data);
 
     Py_RETURN_NONE;
 }
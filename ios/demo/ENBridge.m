@@ -55,6 +55,7 @@
     static NSString* METHOD = @"m";
     static NSString* FIELD  = @"f";
     static NSString* DELETE = @"d";
+    static NSString* BULK_DELETE = @"bd";
     static NSString* RESULT = @"r";
     static NSString* ERROR  = @"e";
     static int IGNORE_RESULT = 0;
@@ -508,6 +509,13 @@
                     [self deleteObject: (NSNumber *) args[0]];
                 }];
                 
+            } else if ([cmd isEqualToString:BULK_DELETE]) {
+                [[NSOperationQueue mainQueue] addOperationWithBlock:^{
+                    for (NSNumber *objId in (NSArray *) args[0]) {
+                        [self deleteObject: objId];
+                    }
+                }];
+                
             } else if ([cmd isEqualToString:RESULT]) {
                 
                 [[NSOperationQueue mainQueue] addOperationWithBlock:^{
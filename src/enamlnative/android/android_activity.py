@@ -144,6 +144,9 @@ class AndroidActivity(ProxyActivity):
         d.width = info["DISPLAY_WIDTH"]
         d.height = info["DISPLAY_HEIGHT"]
         d.orientation = Activity.ORIENTATIONS[info["DISPLAY_ORIENTATION"]]
+        if "DISPLAY_REFRESH_RATE" in info:
+            d.refresh_rate = info["DISPLAY_REFRESH_RATE"]
+            d.app.set_refresh_rate(d.refresh_rate)
         d.api_level = info["SDK_INT"]
         self.window = await activity.getWindow()
 
@@ -18,7 +18,7 @@ class CardView(FrameLayout):
     __nativeclass__ = f"{package}.CardView"
     setCardBackgroundColor = JavaMethod("android.graphics.Color")
     setCardElevation = JavaMethod(float)
-    setContentPadding = JavaMethod(int, int, int, int)
+    setContentPadding = JavaMethod(int, int, int, int, coalesce=True)
     setMaxCardElevation = JavaMethod(float)
     setPreventCornerOverlap = JavaMethod(bool)
     setRadius = JavaMethod(float)
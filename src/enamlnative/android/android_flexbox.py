@@ -107,6 +107,15 @@ class AndroidFlexbox(AndroidViewGroup, ProxyFlexbox):
     #: Update default
     layout_param_type = set_default(FlexboxLayoutParams)  # type: ignore
 
+    #: The params have no state of each child so they can be shared
+    share_layout_params = set_default(True)  # type: ignore
+
+    #: The min size is part of the flexbox params and the offsets are unused
+    WIDGET_LAYOUT_KEYS = AndroidViewGroup.WIDGET_LAYOUT_KEYS - {
+        "min_height",
+        "min_width",
+    }
+
     # -------------------------------------------------------------------------
     # Initialization API
     # -------------------------------------------------------------------------
@@ -156,8 +165,11 @@ class AndroidFlexbox(AndroidViewGroup, ProxyFlexbox):
         return params
 
     def apply_layout(self, child, layout):
-        """Apply the flexbox specific layout."""
-        params = self.create_layout_params(child, layout)
+        """Apply the flexbox specific layout. The params are recreated with
+        the keys that did not change merged in unless only keys applied to
+        the widget changed.
+
+        """
         w = child.widget
         if w:
             # padding
@@ -165,4 +177,7 @@ class AndroidFlexbox(AndroidViewGroup, ProxyFlexbox):
                 dp = self.dp
                 l, t, r, b = layout["padding"]
                 w.setPadding(int(l * dp), int(t * dp), int(r * dp), int(b * dp))
-        child.layout_params = params
+        if child.layout_params and layout.keys() <= self.WIDGET_LAYOUT_KEYS:
+            return
+        layout = {**child.current_layout, **layout}
+        child.layout_params = self.get_layout_params(child, layout)
@@ -35,6 +35,9 @@ class AndroidFrameLayout(AndroidViewGroup, ProxyFrameLayout):
     #: Update default
     layout_param_type = set_default(FrameLayoutParams)  # type: ignore
 
+    #: The params have no state of each child so they can be shared
+    share_layout_params = set_default(True)  # type: ignore
+
     # -------------------------------------------------------------------------
     # Initialization API
     # -------------------------------------------------------------------------
@@ -90,7 +90,7 @@ class AndroidImageView(AndroidView, ProxyImageView):
     # ProxyImageView API
     # -------------------------------------------------------------------------
     def _default_manager(self):
-        return RequestManager(__id__=Glide.with_(self.widget))
+        return Glide.with_(self.widget).proxy()
 
     def set_src(self, src):
         if src.startswith("@"):
@@ -100,7 +100,7 @@ class AndroidImageView(AndroidView, ProxyImageView):
 
             self.widget.setImageDrawable(IconDrawable(self.get_context(), src[1:-1]))
         else:
-            RequestBuilder(__id__=self.manager.load(src)).into(self.widget)
+            self.manager.load(src).proxy().into(self.widget)
 
     def set_max_height(self, height):
         self.widget.setMaxHeight(height)
@@ -34,6 +34,10 @@ class AndroidLinearLayout(AndroidViewGroup, ProxyLinearLayout):
     #: Use LinearLayout params
     layout_param_type = set_default(LinearLayoutParams)  # type: ignore
 
+    #: The params are not shared because the layout modifies them while it
+    #: measures weighted children
+    share_layout_params = set_default(False)  # type: ignore
+
     # -------------------------------------------------------------------------
     # Initialization API
     # -------------------------------------------------------------------------
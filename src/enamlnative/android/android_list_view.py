@@ -7,9 +7,10 @@ The full license is in the file LICENSE, distributed with this software.
 
 Created on May 20, 2017
 """
-from atom.api import Dict, Instance, Property, Typed, observe
-from enamlnative.widgets.list_view import ProxyListItem, ProxyListView
+from atom.api import Dict, Instance, Int, List, Property, Typed, observe
+from enamlnative.widgets.list_view import ListSource, ProxyListItem, ProxyListView
 from enamlnative.core.bridge import encode
+from enamlnative.core.diff import Op, diff, item_key, item_changed
 from .android_content import Context
 from .android_toolkit_object import AndroidToolkitObject
 from .android_view_group import AndroidViewGroup, ViewGroup
@@ -97,8 +98,11 @@ class BridgedRecyclerAdapter(JavaBridgeObject):
     setRecycleViews = JavaMethod("[Landroid.view.View;")
     clearRecycleViews = JavaMethod()
 
+    setBatchRecycle = JavaMethod(bool)
+
     #: BridgedListAdapterListener API
     onRecycleView = JavaCallback(int, int)
+    onRecycleViews = JavaCallback(list[int], list[int])
     onVisibleCountChanged = JavaCallback(int, int)
     onScrollStateChanged = JavaCallback("android.widget.AbsListView", int)
 
@@ -109,6 +113,7 @@ class BridgedRecyclerAdapter(JavaBridgeObject):
     notifyItemRangeChanged = JavaMethod(int, int)
     notifyItemRangeInserted = JavaMethod(int, int)
     notifyItemRangeRemoved = JavaMethod(int, int)
+    notifyItemMoved = JavaMethod(int, int)
 
 
 class AndroidListView(AndroidViewGroup, ProxyListView):
@@ -132,6 +137,19 @@ class AndroidListView(AndroidViewGroup, ProxyListView):
     #: List mapping from index to view
     item_mapping = Dict()
 
+    #: Copy of the items the adapter was last notified about
+    shown_items = List()
+
+    #: Keys of the shown items
+    item_keys = List()
+
+    #: If more updates than this are needed to change the shown items into
+    #: the new items the adapter reloads all of them instead
+    max_item_updates = Int(50)
+
+    #: The source being observed for count changes and loaded pages
+    source = Instance(ListSource)
+
     # -------------------------------------------------------------------------
     # Initialization API
     # -------------------------------------------------------------------------
@@ -177,9 +195,15 @@ class AndroidListView(AndroidViewGroup, ProxyListView):
         # I'm sure this will make someone upset haha
         adapter.setRecyleListener(adapter.getId())
         adapter.onRecycleView.connect(self.on_recycle_view)
+        if self.supports_batch_recycle():
+            adapter.setBatchRecycle(True)
+            adapter.onRecycleViews.connect(self.on_recycle_views)
         # adapter.onVisibleCountChanged.connect(self.on_visible_count_changed)
         # adapter.onScrollStateChanged.connect(self.on_scroll_state_changed)
-        self.set_items(d.items)
+        if d.source is not None:
+            self.set_source(d.source)
+        else:
+            self.reload_items(d.items)
         w.setAdapter(adapter)
         # self.set_selected(d.selected)
         self.refresh_views()
@@ -192,6 +216,23 @@ class AndroidListView(AndroidViewGroup, ProxyListView):
         item = self.list_items[index]
         self.item_mapping[position] = item
         item.recycle_view(position)
+        source = self.declaration.source
+        if source is not None:
+            source.prefetch(position)
+
+    def on_recycle_views(self, indices, positions):
+        """Update the items of all views bound in a layout pass. The events
+        of all of them are sent together.
+
+        """
+        with self.get_context().batched():
+            for index, position in zip(indices, positions):
+                self.on_recycle_view(index, position)
+
+    def supports_batch_recycle(self):
+        """Check if the native adapter can send the views bound together"""
+        d = self.get_activity().declaration
+        return d is not None and d.build_info.get("BATCH_RECYCLE", False)
 
     def on_scroll_state_changed(self, view, state):
         pass
@@ -214,34 +255,146 @@ class AndroidListView(AndroidViewGroup, ProxyListView):
             adapter.setRecycleViews([encode(li.get_view()) for li in self.list_items])
 
     def set_items(self, items):
+        if self.declaration.source is None:
+            self.update_items(items)
+
+    def set_source(self, source):
+        if self.adapter is None:
+            return
+        self.observe_source(source)
+        if source is not None:
+            self.reload_source(source)
+        else:
+            self.reload_items(self.declaration.items)
+
+    def observe_source(self, source):
+        """Stop observing the previous source and observe the given one"""
+        old = self.source
+        if old is not None:
+            old.unobserve("count", self._on_source_count_changed)
+            old.unobserve("loaded", self._on_source_loaded)
+        self.source = source
+        if source is not None:
+            source.observe("count", self._on_source_count_changed)
+            source.observe("loaded", self._on_source_loaded)
+
+    def set_item_key(self, key):
+        self.item_keys = self.get_item_keys(self.shown_items)
+
+    def get_item_keys(self, items):
+        """Return the key of each item using the declaration's item_key"""
+        key = self.declaration.item_key or item_key
+        return [key(item) for item in items]
+
+    def reload_items(self, items):
+        """Tell the adapter to reload all items"""
+        self.shown_items = list(items)
+        self.item_keys = self.get_item_keys(items)
         adapter = self.adapter
         adapter.setItemCount(len(items))
         adapter.notifyDataSetChanged()
 
+    def reload_source(self, source):
+        """Tell the adapter to reload all items from the source. The items
+        are pulled from it as the views are bound.
+
+        """
+        self.shown_items = []
+        self.item_keys = []
+        adapter = self.adapter
+        adapter.setItemCount(len(source))
+        adapter.notifyDataSetChanged()
+
+    def update_items(self, items):
+        """Tell the adapter which items were removed, moved, inserted, or
+        changed since it was last notified. Only the affected rows are
+        updated and animated.
+
+        Parameters
+        ----------
+        items: list
+            The new items
+
+        """
+        adapter = self.adapter
+        if adapter is None:
+            return
+        shown = self.shown_items
+        keys = self.get_item_keys(items)
+        try:
+            ops = diff(
+                self.item_keys,
+                keys,
+                changed=lambda i, j: item_changed(shown[i], items[j]),
+                limit=self.max_item_updates,
+            )
+        except TypeError:
+            return self.reload_items(items)  # Unhashable keys
+        if ops is None:
+            return self.reload_items(items)
+        self.shown_items = list(items)
+        self.item_keys = keys
+        adapter.setItemCount(len(items))
+        for op, a, b in ops:
+            if op == Op.REMOVE:
+                adapter.notifyItemRangeRemoved(a, b)
+            elif op == Op.MOVE:
+                adapter.notifyItemMoved(a, b)
+            elif op == Op.INSERT:
+                adapter.notifyItemRangeInserted(a, b)
+            elif op == Op.CHANGE:
+                adapter.notifyItemRangeChanged(a, b)
+
     @observe("declaration.items")
     def _on_items_changed(self, change):
         """Observe container events on the items list and update the
-        adapter appropriately.
+        adapter appropriately. Items added to the end are inserted directly
+        and all other changes are diffed with the shown items.
+        """
+        if (
+            change["type"] != "container"
+            or self.adapter is None
+            or self.declaration.source is not None
+        ):
+            return
+        items = change["value"]
+        if change["operation"] in ("append", "extend", "__iadd__"):
+            start = len(self.shown_items)
+            added = items[start:]
+            self.shown_items.extend(added)
+            self.item_keys.extend(self.get_item_keys(added))
+            adapter = self.adapter
+            adapter.setItemCount(len(items))
+            adapter.notifyItemRangeInserted(start, len(added))
+        else:
+            self.update_items(items)
+
+    def _on_source_count_changed(self, change):
+        """Insert the items added to the end when the number of items in the
+        source grows and reload them otherwise.
+
         """
-        if change["type"] != "container":
+        adapter = self.adapter
+        if change["type"] != "update" or adapter is None:
             return
-        op = change["operation"]
-        if op == "append":
-            i = len(change["value"]) - 1
-            self.adapter.notifyItemInserted(i)
-        elif op == "insert":
-            self.adapter.notifyItemInserted(change["index"])
-        elif op in ("pop", "__delitem__"):
-            self.adapter.notifyItemRemoved(change["index"])
-        elif op == "__setitem__":
-            self.adapter.notifyItemChanged(change["index"])
-        elif op == "extend":
-            n = len(change["items"])
-            i = len(change["value"]) - n
-            self.adapter.notifyItemRangeInserted(i, n)
-        elif op in ("remove", "reverse", "sort"):
-            # Reset everything for these
-            self.adapter.notifyDataSetChanged()
+        old, count = change["oldvalue"], change["value"]
+        if count > old:
+            adapter.setItemCount(count)
+            adapter.notifyItemRangeInserted(old, count - old)
+        else:
+            self.reload_source(self.source)
+
+    def _on_source_loaded(self, change):
+        """Rebind the views showing the items of the page that was loaded.
+        Their events are sent together.
+
+        """
+        start, stop = change["value"]
+        with self.get_context().batched():
+            for item in self.list_items:
+                position = item.declaration.index
+                if start <= position < stop:
+                    item.recycle_view(position)
 
     def set_arrangement(self, arrangement):
         ctx = self.get_context()
@@ -285,6 +438,11 @@ class AndroidListView(AndroidViewGroup, ProxyListView):
     def scroll_to_position(self, position):
         self.widget.scrollToPosition(position)
 
+    def destroy(self):
+        """Stop observing the source before destroying the widget"""
+        self.observe_source(None)
+        super().destroy()
+
 
 class AndroidListItem(AndroidToolkitObject, ProxyListItem):
 
@@ -308,8 +466,15 @@ class AndroidListItem(AndroidToolkitObject, ProxyListItem):
     def recycle_view(self, position):
         """Tell the view to render the item at the given position"""
         d = self.declaration
-
-        if position < len(d.parent.items):
+        source = d.parent.source
+        if source is not None:
+            if position < len(source):
+                d.index = position
+                d.item = source.get(position)
+            else:
+                d.index = -1
+                d.item = None
+        elif position < len(d.parent.items):
             d.index = position
             d.item = d.parent.items[position]
         else:
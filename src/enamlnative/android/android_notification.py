@@ -10,6 +10,7 @@ Created on Apr 4, 2018
 from typing import ClassVar, Optional
 from atom.api import Bool, Instance, List, Typed
 from enaml.application import deferred_call
+from enamlnative.core.declared import get_declared_items
 from enamlnative.widgets.notification import ProxyNotification
 from .android_content import (
     BroadcastReceiver,
@@ -531,6 +532,10 @@ class NotificationChannelManager(SystemService):
     createNotificationChannel = JavaMethod(NotificationChannel)
 
 
+#: Members of the declaration that are not set by their handler
+EXPLICIT_KEYS = ("show", "icon", "settings")
+
+
 class AndroidNotification(AndroidToolkitObject, ProxyNotification):
     """An Android implementation of an Enaml ProxyNotification."""
 
@@ -611,14 +616,10 @@ class AndroidNotification(AndroidToolkitObject, ProxyNotification):
         d = self.declaration
         engine = d._d_engine
         if engine:
-            for k, h in engine._handlers.items():
-                # Handlers with read operations
-                if not h.read_pair:
-                    continue
-                v = getattr(d, k)
-                if k in ("show", "icon", "settings"):
-                    continue  # We set these explicitly
-                yield (k, v)
+            # These are set explicitly so they are grouped out of the keys
+            items = get_declared_items(type(self), engine, EXPLICIT_KEYS)
+            for k in items.keys:
+                yield (k, getattr(d, k))
 
     def refresh(self):
         """If the"""
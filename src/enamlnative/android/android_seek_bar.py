@@ -26,7 +26,9 @@ class SeekBar(ProgressBar):
     )
     setKeyProgressIncrement = JavaMethod(int)
 
-    onProgressChanged = JavaCallback("android.widget.SeekBar", int, bool)
+    onProgressChanged = JavaCallback(
+        "android.widget.SeekBar", int, bool, coalesce="latest"
+    )
     onStartTrackingTouch = JavaCallback("android.widget.SeekBar")
     onStopTrackingTouch = JavaCallback("android.widget.SeekBar")
 
@@ -92,7 +92,7 @@ class Sensor(JavaBridgeObject):
     # -------------------------------------------------------------------------
     # SensorEventListener API
     # -------------------------------------------------------------------------
-    onSensorChanged = JavaCallback("android.hardware.SensorEvent")
+    onSensorChanged = JavaCallback("android.hardware.SensorEvent", coalesce="latest")
     onAccuracyChanged = JavaCallback("android.hardware.Sensor", int)
 
     #: Sensor state
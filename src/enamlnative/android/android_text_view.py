@@ -42,7 +42,9 @@ class TextView(View):
     #: TextWatcher API
     afterTextChanged = JavaCallback("android.text.Editable")
     beforeTextChanged = JavaCallback("java.lang.CharSequence", int, int, int)
-    onTextChanged = JavaCallback("java.lang.CharSequence", int, int, int)
+    onTextChanged = JavaCallback(
+        "java.lang.CharSequence", int, int, int, coalesce="latest"
+    )
 
     #: EditorAction API
     onEditorAction = JavaCallback(
@@ -21,14 +21,14 @@ class Toolbar(ViewGroup):
     setTitle = JavaMethod("java.lang.CharSequence")
     setSubtitle = JavaMethod("java.lang.CharSequence")
     setSubtitleTextColor = JavaMethod("android.graphics.Color")
-    setTitleMargin = JavaMethod(int, int, int, int)
+    setTitleMargin = JavaMethod(int, int, int, int, coalesce=True)
     setTitleTextColor = JavaMethod("android.graphics.Color")
     setNavigationOnClickListener = JavaMethod("android.view.View$OnClickListener")
     setOnMenuItemClickListener = JavaMethod(
         "android.widget.Toolbar$OnMenuItemClickListener"
     )
-    setContentInsetsAbsolute = JavaMethod(int, int)
-    setContentInsetsRelative = JavaMethod(int, int)
+    setContentInsetsAbsolute = JavaMethod(int, int, coalesce=True)
+    setContentInsetsRelative = JavaMethod(int, int, coalesce=True)
     onNavigationClick = JavaCallback("android.view.View")
     onMenuItemClick = JavaCallback("android.view.MenuItem")
 
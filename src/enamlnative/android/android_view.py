@@ -7,7 +7,8 @@ The full license is in the file LICENSE, distributed with this software.
 
 Created on May 20, 2017
 """
-from atom.api import Dict, Float, Instance, Subclass, Typed
+from atom.api import Bool, Dict, Float, Instance, Subclass, Typed
+from enamlnative.core.declared import get_declared_items
 from enamlnative.widgets.view import ProxyView, coerce_size
 from .android_toolkit_object import AndroidToolkitObject
 from .android_content import Context
@@ -69,7 +70,7 @@ class View(JavaBridgeObject):
     setLayoutDirection = JavaMethod(int)
 
     setLayoutParams = JavaMethod("android.view.ViewGroup$LayoutParams")
-    setPadding = JavaMethod(int, int, int, int)
+    setPadding = JavaMethod(int, int, int, int, coalesce=True)
 
     getWindowToken = JavaMethod(returns="android.os.IBinder")
 
@@ -131,9 +132,38 @@ class AndroidView(AndroidToolkitObject, ProxyView):
     #: Layout params
     layout_params = Instance(LayoutParams)
 
+    #: Children with the same layout use the same layout params. Only enable
+    #: this if the params of this view have no state of each child and are
+    #: not modified after they are created, by us or by the container itself
+    #: while it measures. When a child's layout changes it gets new params
+    #: instead.
+    share_layout_params = Bool()
+
+    #: Layout keys applied to the widget instead of the layout params. These
+    #: are not part of the key used to share params.
+    WIDGET_LAYOUT_KEYS = {
+        "padding",
+        "left",
+        "top",
+        "right",
+        "bottom",
+        "x",
+        "y",
+        "z",
+        "min_height",
+        "min_width",
+    }
+
     #: Default layout params
     default_layout = Dict(default={"width": "wrap_content", "height": "wrap_content"})
 
+    #: The layout the params were created with including the defaults
+    current_layout = Dict()
+
+    #: Layout keys changed since the last batch was sent. They are applied
+    #: together right before the next batch is sent.
+    pending_layout = Dict()
+
     def _default_dp(self):
         return self.get_display_density()
 
@@ -163,10 +193,22 @@ class AndroidView(AndroidToolkitObject, ProxyView):
         # Initialize the widget by updating only the members that
         # have read expressions declared. This saves a lot of time and
         # simplifies widget initialization code
-        for k, v in self.get_declared_items():
-            handler = getattr(self, f"set_{k}", None)
-            if handler:
-                handler(v)
+        if type(self).get_declared_items is not AndroidView.get_declared_items:
+            for k, v in self.get_declared_items():
+                handler = getattr(self, f"set_{k}", None)
+                if handler:
+                    handler(v)
+            return
+
+        d = self.declaration
+        engine = d._d_engine
+        if engine:
+            items = get_declared_items(type(self), engine, LAYOUT_KEYS)
+            for k, handler in zip(items.keys, items.handlers):
+                if handler:
+                    handler(self, getattr(d, k))
+            if items.layout:
+                self.set_layout({k: getattr(d, k) for k in items.layout})
 
     def get_declared_items(self):
         """Get the members that were set in the enamldef block for this
@@ -182,19 +224,11 @@ class AndroidView(AndroidToolkitObject, ProxyView):
         d = self.declaration
         engine = d._d_engine
         if engine:
-            layout = {}
-            for k, h in engine._handlers.items():
-                # Handlers with read operations
-                if not h.read_pair:
-                    continue
-                v = getattr(d, k)
-                if k in LAYOUT_KEYS:
-                    layout[k] = v
-                    continue
-                yield (k, v)
-
-            if layout:
-                yield ("layout", layout)
+            items = get_declared_items(type(self), engine, LAYOUT_KEYS)
+            for k in items.keys:
+                yield (k, getattr(d, k))
+            if items.layout:
+                yield ("layout", {k: getattr(d, k) for k in items.layout})
 
     # -------------------------------------------------------------------------
     # OnClickListener API
@@ -334,6 +368,7 @@ class AndroidView(AndroidToolkitObject, ProxyView):
         update = self.layout_params is not None
         params = self.default_layout.copy()
         params.update(layout)
+        self.current_layout = params
 
         # Create the layout params
         parent = self.parent()
@@ -351,7 +386,9 @@ class AndroidView(AndroidToolkitObject, ProxyView):
         """Updates the LayoutParams of this widget.
 
         This delegates to the parent and expects the parent to update the
-        existing layout without recreating it.
+        existing layout without recreating it. Updates made within the same
+        iteration of the event loop (such as animating the width and height)
+        are merged and applied once. See `apply_pending_layout`.
 
         Parameters
         ----------
@@ -360,7 +397,71 @@ class AndroidView(AndroidToolkitObject, ProxyView):
             child.  The widget defaults are updated with user passed values.
 
         """
-        self.parent().apply_layout(self, params)
+        pending = self.pending_layout
+        if not pending:
+            self.get_context().before_flush(self.apply_pending_layout)
+        pending.update(params)
+
+    def apply_pending_layout(self):
+        """Apply the layout keys changed since the last batch was sent and
+        set the layout params on the widget if the parent created new ones.
+
+        """
+        layout = self.pending_layout
+        self.pending_layout = {}
+        w = self.widget
+        if w is None or not layout:
+            return  # Destroyed
+        parent = self.parent()
+        if not isinstance(parent, AndroidView):
+            parent = self  # Root node
+        self.current_layout.update(layout)
+        layout_params = self.layout_params
+        parent.apply_layout(self, layout)
+        if self.layout_params is not layout_params:
+            w.setLayoutParams(self.layout_params)
+
+    def get_layout_params(self, child, layout):
+        """Get the LayoutParams for a child with it's requested layout
+        parameters. If `share_layout_params` is enabled the params created
+        for a previous child with the same layout are reused. They are never
+        modified so a child that changes its layout gets new params.
+
+        Parameters
+        ----------
+        child: AndroidView
+            A view to get layout params for.
+        layout: Dict
+            A dict of layout parameters to use to create the layout.
+
+        Returns
+        -------
+        layout_params: LayoutParams
+            A LayoutParams bridge object with the requested layout options.
+
+        """
+        if not self.share_layout_params:
+            return self.create_layout_params(child, layout)
+        try:
+            key = (
+                self.layout_param_type,
+                self.dp,
+                tuple(
+                    sorted(
+                        (k, tuple(v) if isinstance(v, list) else v)
+                        for k, v in layout.items()
+                        if k not in self.WIDGET_LAYOUT_KEYS
+                    )
+                ),
+            )
+            hash(key)
+        except TypeError:
+            return self.create_layout_params(child, layout)
+        pool = self.get_context().layout_params_pool
+        layout_params = pool.get(key)
+        if layout_params is None:
+            layout_params = pool[key] = self.create_layout_params(child, layout)
+        return layout_params
 
     def create_layout_params(self, child, layout):
         """Create the LayoutParams for a child with it's requested
@@ -410,7 +511,11 @@ class AndroidView(AndroidToolkitObject, ProxyView):
         """
         layout_params = child.layout_params
         if not layout_params:
-            layout_params = self.create_layout_params(child, layout)
+            layout_params = self.get_layout_params(child, layout)
+        elif self.share_layout_params and not layout.keys() <= self.WIDGET_LAYOUT_KEYS:
+            # Shared params are never modified so other children keep theirs
+            merged = {**child.current_layout, **layout}
+            layout_params = self.get_layout_params(child, merged)
         w = child.widget
         if w:
             dp = self.dp
@@ -7,10 +7,11 @@ The full license is in the file LICENSE, distributed with this software.
 
 Created on May 20, 2017
 """
-from atom.api import Typed, set_default
+from atom.api import List, Typed, set_default
+from enamlnative.core.bridge import encode
 from enamlnative.widgets.view_group import ProxyViewGroup
 from .android_view import AndroidView, LayoutParams, View
-from .bridge import JavaBridgeObject, JavaMethod
+from .bridge import JavaBridgeObject, JavaMethod, JavaStaticMethod
 
 
 class ViewGroup(View):
@@ -26,7 +27,7 @@ class ViewGroup(View):
 class MarginLayoutParams(LayoutParams):
     __nativeclass__ = "android.view.ViewGroup$MarginLayoutParams"
     __signature__ = [int, int]
-    setMargins = JavaMethod(int, int, int, int)
+    setMargins = JavaMethod(int, int, int, int, coalesce=True)
     setLayoutDirection = JavaMethod(int)
 
 
@@ -34,6 +35,16 @@ class LayoutTransition(JavaBridgeObject):
     __nativeclass__ = "android.animation.LayoutTransition"
 
 
+class BridgedViewGroupUtils(JavaBridgeObject):
+    __nativeclass__ = "com.codelv.enamlnative.adapters.BridgedViewGroupUtils"
+    addViews = JavaStaticMethod(
+        ViewGroup,
+        "[Landroid.view.View;",
+        list[int],
+        "[Landroid.view.ViewGroup$LayoutParams;",
+    )
+
+
 class AndroidViewGroup(AndroidView, ProxyViewGroup):
     """An Android implementation of an Enaml ProxyViewGroup."""
 
@@ -46,6 +57,10 @@ class AndroidViewGroup(AndroidView, ProxyViewGroup):
     #: Default layout params
     default_layout = set_default({"width": "match_parent", "height": "match_parent"})  # type: ignore
 
+    #: Children added since the last batch was sent. They are added to the
+    #: widget together right before the next batch is sent.
+    pending_children = List()
+
     # -------------------------------------------------------------------------
     # Initialization API
     # -------------------------------------------------------------------------
@@ -56,38 +71,75 @@ class AndroidViewGroup(AndroidView, ProxyViewGroup):
     def init_layout(self):
         """Add all child widgets to the view"""
         super().init_layout()
-        widget = self.widget
-        i = 0
-        for child in self.children():
-            child_widget = child.widget
-            if child_widget:
-                if child.layout_params:
-                    widget.addView_(child_widget, i, child.layout_params)
-                else:
-                    widget.addView(child_widget, i)
-                i += 1
+        self.add_views([c for c in self.children() if c.widget])
 
         # Force layout using the default params
         if not self.layout_params:
             self.set_layout({})
 
+    def add_views(self, children):
+        """Add the widgets of the children to the widget at the index of
+        each child. If the native side supports it they are all added with
+        a single call.
+
+        Parameters
+        ----------
+        children: list[AndroidView]
+            The children to add in the order they are in this view.
+
+        """
+        widget = self.widget
+        index = {id(w): i for i, w in enumerate(self.child_widgets())}
+        if len(children) > 1 and self.supports_bulk_add():
+            BridgedViewGroupUtils.addViews(
+                widget,
+                [encode(c.widget) for c in children],
+                [index[id(c.widget)] for c in children],
+                [
+                    encode(c.layout_params) if c.layout_params else None
+                    for c in children
+                ],
+            )
+            return
+        for child in children:
+            i = index[id(child.widget)]
+            if child.layout_params:
+                widget.addView_(child.widget, i, child.layout_params)
+            else:
+                widget.addView(child.widget, i)
+
+    def supports_bulk_add(self):
+        """Check if the native side can add views with one call"""
+        d = self.get_activity().declaration
+        return d is not None and d.build_info.get("BULK_ADD_VIEWS", False)
+
     def child_added(self, child):
         """Handle the child added event from the declaration.
 
         This handler will unparent the child toolkit widget. Subclasses
         which need more control should reimplement this method.
 
+        Children added within the same iteration of the event loop (such
+        as the items of a Looper) are added to the widget together.
+
         """
         super().child_added(child)
-
-        widget = self.widget
-        #: TODO: Should index be cached?
-        for i, child_widget in enumerate(self.child_widgets()):
-            if child_widget == child.widget:
-                if child.layout_params:
-                    widget.addView_(child_widget, i, child.layout_params)
-                else:
-                    widget.addView(child_widget, i)
+        pending = self.pending_children
+        if not pending:
+            self.get_context().before_flush(self.add_pending_children)
+        pending.append(child)
+
+    def add_pending_children(self):
+        """Add the widgets of the children added since the last batch"""
+        pending = self.pending_children
+        self.pending_children = []
+        if self.widget is None:
+            return  # Destroyed
+        children = [c for c in pending if c.parent() is self and c.widget]
+        if len(children) > 1:
+            order = {c: i for i, c in enumerate(self.children())}
+            children.sort(key=order.__getitem__)
+        self.add_views(children)
 
     def child_moved(self, child):
         """Handle the child moved event from the declaration."""
@@ -104,6 +156,8 @@ class AndroidViewGroup(AndroidView, ProxyViewGroup):
 
         """
         super().child_removed(child)
+        if child in self.pending_children:
+            self.pending_children.remove(child)
         if child.widget is not None:
             self.widget.removeView(child.widget)
 
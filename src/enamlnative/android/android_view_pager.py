@@ -34,7 +34,7 @@ class ViewPager(ViewGroup):
     setPageMargin = JavaMethod(int)
     setAdapter = JavaMethod(f"{package}.PagerAdapter")
     onPageScrollStateChanged = JavaCallback(int)
-    onPageScrolled = JavaCallback(int, float, int)
+    onPageScrolled = JavaCallback(int, float, int, coalesce="latest")
     onPageSelected = JavaCallback(int)
     setPagingEnabled = JavaMethod(bool)
     setPageTransformer = JavaMethod(bool, f"{package}.ViewPager$PageTransformer")
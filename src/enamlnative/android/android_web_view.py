@@ -45,7 +45,7 @@ class BridgedWebViewClient(JavaBridgeObject):
     onPageFinished = JavaCallback(WebView, str)
     onScaleChanged = JavaCallback(WebView, float, float)
     onReceivedError = JavaCallback(WebView, int, str, str)
-    onProgressChanged = JavaCallback(WebView, int)
+    onProgressChanged = JavaCallback(WebView, int, coalesce="latest")
     onReceivedTitle = JavaCallback(WebView, str)
 
 
@@ -5,13 +5,20 @@ Distributed under the terms of the MIT License.
 
 The full license is in the file LICENSE, distributed with this software.
 """
-import nativehooks
 from asyncio import Future
-from atom.api import Dict, Int
+from weakref import WeakValueDictionary
+from atom.api import Dict, Int, Typed
 from enaml.application import ProxyResolver
 from enamlnative.android import factories
 from enamlnative.core.app import BridgedApplication
 
+try:
+    import nativehooks
+except ImportError:
+    # Only exists when running within an app. The headless app does not
+    # use it, see enamlnative.android.headless
+    nativehooks = None
+
 
 class AndroidApplication(BridgedApplication):
     """An Android implementation of an Enaml Native BridgedApplication.
@@ -27,6 +34,10 @@ class AndroidApplication(BridgedApplication):
     #: Pending permission request listeners
     _permission_requests = Dict(int, Future)
 
+    #: Layout params shared by views with the same layout. They are released
+    #: once no view uses them. See `AndroidView.get_layout_params`
+    layout_params_pool = Typed(WeakValueDictionary, ())
+
     # -------------------------------------------------------------------------
     # Defaults
     # -------------------------------------------------------------------------
@@ -100,12 +111,8 @@ class AndroidApplication(BridgedApplication):
             return
         from .android_toast import Toast
 
-        async def show_toast():
-            toast_id = await Toast.makeText(self, msg, 1 if long else 0)
-            t = Toast(__id__=toast_id)
-            t.show()
-
-        self.deferred_call(show_toast)
+        # Show is sent with makeText instead of waiting for the result
+        Toast.makeText(self, msg, 1 if long else 0).proxy(Toast).show()
 
     # --------------------------------------------------------------------------
     # Bridge API Implementation
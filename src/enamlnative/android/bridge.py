@@ -16,7 +16,8 @@ from enamlnative.core.bridge import (
     BridgeObject,
     BridgeStaticMethod,
     Command,
-    CACHE,
+    cache_object,
+    encode,
     msgpack_encoder,
 )
 
@@ -42,6 +43,44 @@ def encode_args(method: BridgeMethod, args: tuple, encoder=msgpack_encoder):
     return (name, [encoder(sig, arg) for sig, arg in zip(signature, args)])
 
 
+def compile_args(method: BridgeMethod):
+    """Create a function that packs the args of the method the same way as
+    `encode_args` but only works out the name and signature once.
+
+    """
+    signature = method.__signature__
+    name = method.name.rstrip("_")
+    if not signature:
+
+        def pack_no_args(args, kwargs):
+            return (name, [])
+
+        return pack_no_args
+
+    if signature[-1].endswith("..."):
+        nparams = len(signature)
+        end = nparams - 1
+        fixed = signature[:end]
+        varg = signature[-1][0:-3]
+
+        def pack_varargs(args, kwargs):
+            nargs = len(args)
+            if nargs > nparams:
+                msg = f"Invalid number of arguments: Got {args}, expected {signature}"
+                raise ValueError(msg)
+            packed = [(sig, encode(arg)) for sig, arg in zip(fixed, args)]
+            if nargs > end:
+                packed.append((varg, encode(args[end])))
+            return (name, packed)
+
+        return pack_varargs
+
+    def pack(args, kwargs):
+        return (name, [(sig, encode(arg)) for sig, arg in zip(signature, args)])
+
+    return pack
+
+
 class JavaMethod(BridgeMethod):
     """Description of a method of a View (or subclass) in Java. When called,
     this serializes call, packs the arguments, and delegates handling to a
@@ -53,11 +92,17 @@ class JavaMethod(BridgeMethod):
         # The obj param is handled by the superclass
         return encode_args(self, args)
 
+    def compile(self):
+        return compile_args(self)
+
 
 class JavaStaticMethod(BridgeStaticMethod):
     def pack_args(self, *args, **kwargs):
         return encode_args(self, args)
 
+    def compile(self):
+        return compile_args(self)
+
 
 class JavaField(BridgeField):
     """The superclass implementation is sufficient but extend for possible
@@ -137,7 +182,7 @@ class JavaProxy(JavaBridgeObject):
 
         # Send the event over the bridge to construct the view
         __id__ = kwargs.get("__id__", None)
-        CACHE[self.__id__] = self
+        cache_object(self)
         if __id__ is None:
             ref = ref or self
             app = self.__app__
@@ -0,0 +1,68 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+from atom.api import Dict, Typed
+from enamlnative.core.headless import HeadlessBridge
+from .app import AndroidApplication
+
+#: There is no display so DISPLAY_REFRESH_RATE is not reported and events are
+#: sent right away instead of once per frame. See `app.set_refresh_rate`
+BUILD_INFO = {
+    "DISPLAY_DENSITY": 2.625,
+    "DISPLAY_WIDTH": 411,
+    "DISPLAY_HEIGHT": 731,
+    "DISPLAY_ORIENTATION": 1,
+    "BULK_ADD_VIEWS": True,
+    "BATCH_RECYCLE": True,
+    "SDK_INT": 32,
+}
+
+
+class HeadlessAndroidApplication(AndroidApplication):
+    """An AndroidApplication that sends events to an in-process
+    HeadlessBridge instead of the Java bridge. Use this to run views in
+    tests and benchmarks without a device.
+
+    """
+
+    #: The native side of the bridge
+    native = Typed(HeadlessBridge)
+
+    #: Info returned by `Activity.getBuildInfo`
+    build_info = Dict(default=BUILD_INFO)
+
+    def _default_native(self):
+        return HeadlessBridge(
+            app=self,
+            handlers={
+                "getBuildInfo": self._on_get_build_info,
+                "requestPermissions": self._on_request_permissions,
+            },
+        )
+
+    # -------------------------------------------------------------------------
+    # Bridge API Implementation
+    # -------------------------------------------------------------------------
+    def dispatch_events(self, data):
+        """Send the data to the headless bridge for processing"""
+        self.native.process_events(data)
+
+    # -------------------------------------------------------------------------
+    # Headless handlers
+    # -------------------------------------------------------------------------
+    def _on_get_build_info(self, bridge, obj, args):
+        return self.build_info
+
+    def _on_request_permissions(self, bridge, obj, args):
+        """Grant all permissions"""
+        permissions, code = args
+        results = [0 for p in permissions]
+        bridge.send_event(
+            obj.__id__, "onRequestPermissionsResult", code, permissions, results
+        )
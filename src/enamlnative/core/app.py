@@ -7,23 +7,38 @@ The full license is in the file LICENSE, distributed with this software.
 """
 import json
 import traceback
-from asyncio import Future
-from time import time
-from typing import Optional, Union
-from inspect import iscoroutinefunction
+import msgpack
+from asyncio import Future, ensure_future
+from collections import deque
+from time import perf_counter, time
+from typing import Any, Coroutine, Optional, Union
+from inspect import iscoroutine
 from atom.api import Atom, Bool, Dict, Float, Event, Instance, Int, List, Str, Value
 from enaml.application import Application
 from tornado.ioloop import IOLoop
+from enamlnative.core import bridge
 from enamlnative.core.bridge import (
+    CALLBACK_POLICIES,
+    EXPIRED,
     BridgeFuture,
     Command,
     loads,
-    dumps,
     encode,
     get_handler,
+    get_handler_info,
     BridgeReferenceError,
     BridgeException,
 )
+from enamlnative.core.flush import (
+    BridgeBatch,
+    BridgeLane,
+    FlushPolicy,
+    FrameFlushPolicy,
+    Lane,
+)
+from enamlnative.core.optimize import NameTable, coalesce_callbacks, event_refs
+from enamlnative.core.profiler import BridgeProfiler
+from enamlnative.core.trace import Tracer
 from enamlnative.widgets.activity import Activity
 
 
@@ -72,14 +87,63 @@ class BridgedApplication(Application):
     #: Event loop
     loop = Instance(IOLoop, factory=IOLoop.current)
 
-    #: Events to send to the bridge
-    _bridge_queue = List()
+    #: Events to send to the bridge in each lane. See `Lane`
+    _bridge_lanes = List()
+
+    #: Packer reused for each batch of events sent
+    _bridge_packer = Instance(msgpack.Packer, kwargs={"autoreset": False})
+
+    #: Number of `batched` contexts entered
+    _bridge_batch_depth = Int()
+
+    #: Decides when queued events are sent. Unless it is set a
+    #: `FrameFlushPolicy` is used once the activity reports the refresh rate
+    #: of the display. See `set_refresh_rate`
+    flush_policy = Instance(FlushPolicy, optional=False)
+
+    #: The `flush_policy` used until one is set
+    _default_policy = Instance(FlushPolicy, ())
+
+    #: Flush policies of lanes that do not use the `flush_policy`
+    lane_policies = Dict()
+
+    #: Callbacks queued with `before_flush`
+    _flush_callbacks = List()
+
+    #: Callbacks queued with `idle_call`
+    _idle_queue = Instance(deque, ())
+
+    #: Whether `_run_idle` is scheduled
+    _idle_scheduled = Bool()
 
-    #: Time last sent
-    _bridge_max_delay = Float(0.005)
+    #: Passes run on the events before they are sent to reduce the number
+    #: sent. See enamlnative.core.optimize
+    bridge_optimizers = List()
 
-    #: Time last sent
-    _bridge_last_scheduled = Float()
+    #: Send each class and method name only once and refer to it by id
+    #: afterwards when set. The native bridge must support the DEF command.
+    name_table = Instance(NameTable)
+
+    #: Records bridge traffic when set. See `start_profiling`
+    profiler = Instance(BridgeProfiler)
+
+    #: Records event loop and bridge activity when set. See `start_tracing`
+    tracer = Instance(Tracer)
+
+    #: Seconds to wait for the result of a bridge method before failing with
+    #: an `asyncio.TimeoutError`. Zero waits forever.
+    bridge_timeout = Float()
+
+    #: Triggered by `sweep_futures` with the results that are still pending
+    #: keyed by method name. See `start_future_sweep`
+    futures_pending = Event(dict)
+
+    #: Interval and max age of the sweep if running
+    _future_sweep = Value()
+
+    #: Last event held by each throttled callback keyed by (ptr, method). The
+    #: key is present while the interval of the callback is running.
+    _throttled = Dict()
 
     #: Entry points to load plugins
     plugins = Dict()
@@ -90,6 +154,19 @@ class BridgedApplication(Application):
     # -------------------------------------------------------------------------
     # Defaults
     # -------------------------------------------------------------------------
+    def _default__bridge_lanes(self):
+        return [BridgeLane(priority=i) for i in range(Lane.BACKGROUND + 1)]
+
+    def _default_lane_policies(self):
+        return {
+            Lane.RESULT: FlushPolicy(),
+            Lane.INTERACTION: FlushPolicy(),
+            Lane.BACKGROUND: FlushPolicy(first_delay=0.05, max_delay=0.1),
+        }
+
+    def _default_flush_policy(self):
+        return self._default_policy
+
     def _default_plugins(self):
         """Get entry points to load any plugins installed.
         The build process should create an "entry_points.json" file
@@ -116,6 +193,9 @@ class BridgedApplication(Application):
         initialize the proxy resolver.
 
         """
+        # Get the loop before this becomes the app instance in case objects
+        # released while the loop is created try to send events with it
+        self.loop
         super().__init__(*args, **kwargs)
         if self.dev:
             self.start_dev_session()
@@ -152,6 +232,8 @@ class BridgedApplication(Application):
             the callback.
 
         """
+        if self.tracer is not None:
+            callback = self.tracer.wrap(callback)
         self.loop.add_callback(callback, *args, **kwargs)
 
     def timed_call(self, ms, callback, *args, **kwargs):
@@ -172,8 +254,111 @@ class BridgedApplication(Application):
             the callback.
 
         """
+        if self.tracer is not None:
+            callback = self.tracer.wrap(callback)
         self.loop.call_later(ms / 1000, callback, *args, **kwargs)
 
+    def before_flush(self, callback, *args):
+        """Invoke a callable once right before the next batch with normal
+        updates is sent. Use this to merge changes made within the same
+        iteration (or frame) of the event loop into fewer events.
+
+        Parameters
+        ----------
+        callback : callable
+            The callable object to execute before the events are sent.
+
+        *args
+            Any additional positional arguments to pass to the callback.
+
+        """
+        callbacks = self._flush_callbacks
+        callbacks.append((callback, args))
+        if len(callbacks) == 1 and not self._bridge_lanes[Lane.NORMAL].events:
+            self._bridge_schedule(Lane.NORMAL)
+
+    def _run_flush_callbacks(self):
+        """Run the callbacks added with `before_flush` including any they
+        add themselves.
+
+        """
+        callbacks = self._flush_callbacks
+        while callbacks:
+            self._flush_callbacks = []
+            for callback, args in callbacks:
+                try:
+                    callback(*args)
+                except Exception as e:
+                    self.handle_error(callback, e)
+            callbacks = self._flush_callbacks
+
+    def idle_call(self, callback, *args, **kwargs):
+        """Invoke a low priority callable on the main event loop thread.
+        If the flush policy limits the time per frame (see `FrameFlushPolicy`)
+        and the current frame is over budget it runs in a later frame.
+
+        Parameters
+        ----------
+        callback : callable
+            The callable object to execute at some point in the future.
+
+        *args, **kwargs
+            Any additional positional and keyword arguments to pass to
+            the callback.
+
+        """
+        self._idle_queue.append((callback, args, kwargs))
+        if not self._idle_scheduled:
+            self._idle_scheduled = True
+            self.deferred_call(self._run_idle)
+
+    def _run_idle(self):
+        """Run idle callbacks until the frame budget is used up. At least
+        one is run each time so they are never starved.
+
+        """
+        policy = self.flush_policy
+        queue = self._idle_queue
+        ran = False
+        while queue:
+            if ran:
+                now = time()
+                if policy.budget_left(now) <= 0:
+                    self.timed_call(policy.schedule(now) * 1000, self._run_idle)
+                    return
+            callback, args, kwargs = queue.popleft()
+            ran = True
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                self.handle_error(callback, e)
+        self._idle_scheduled = False
+
+    def set_refresh_rate(self, refresh_rate: float):
+        """Called by the activity with the refresh rate of the display. Unless
+        the `flush_policy` was set, a `FrameFlushPolicy` using this rate is
+        installed so at most one batch is sent per frame.
+
+        Parameters
+        ----------
+        refresh_rate: float
+            Refresh rate of the display in Hz
+
+        """
+        policy = self.flush_policy
+        if isinstance(policy, FrameFlushPolicy):
+            policy.refresh_rate = refresh_rate
+        elif policy is self._default_policy:
+            self.flush_policy = FrameFlushPolicy(refresh_rate=refresh_rate)
+
+    def reset_bridge(self):
+        """Called when the native side of the bridge is started or reloaded
+        and no longer knows the names sent before.
+
+        """
+        if self.name_table is not None:
+            self.name_table.clear()
+
     def is_main_thread(self):
         """Indicates whether the caller is on the main gui thread.
 
@@ -207,9 +392,23 @@ class BridgedApplication(Application):
         # HACK: Reassign the discard method to show errors
         self.loop._discard_future_result = self._on_future_result
 
-    def create_future(self, return_type: Optional[type] = None) -> BridgeFuture:
-        """Create a future object using the EventLoop implementation"""
-        return BridgeFuture(return_type)
+    def create_future(
+        self, return_type: Optional[type] = None, timeout: Optional[float] = None
+    ) -> BridgeFuture:
+        """Create a future object using the EventLoop implementation
+
+        Parameters
+        ----------
+        return_type: type
+            The type the result is converted to
+        timeout: float
+            If given, seconds until the future fails with a timeout error
+
+        """
+        f = BridgeFuture(return_type, self.profiler, self)
+        if timeout:
+            f.set_timeout(timeout)
+        return f
 
     # -------------------------------------------------------------------------
     # Bridge API Implementation
@@ -233,31 +432,102 @@ class BridgedApplication(Application):
 
             now: boolean
                 Send the event now
+            lane: int
+                The `Lane` to send the event in. Results use `Lane.RESULT`
+                and everything else `Lane.NORMAL` by default.
+            nativeclass: str
+                The class of the object for the profiler if the event does
+                not include it.
 
         """
-        n = len(self._bridge_queue)
+        lanes = self._bridge_lanes
+        index = kwargs.get("lane")
+        if index is None:
+            index = Lane.RESULT if name == Command.RESULT else Lane.NORMAL
+        for i in range(index + 1, len(lanes)):
+            if lanes[i].events:
+                index = self._bridge_route(index, name, args)
+                break
+        lane = lanes[index]
+        queue = lane.events
+        n = len(queue)
 
         # Add to queue
-        self._bridge_queue.append((name, args))
+        queue.append((name, args))
+
+        if self.profiler is not None:
+            self.profiler.record_event(name, args, kwargs.get("nativeclass", ""))
+
+        if self._bridge_batch_depth:
+            # Results and calls that are waited on cannot be held until the
+            # batch exits as the batch may be waiting for them
+            if (
+                kwargs.get("now")
+                or index == Lane.RESULT
+                or (name in (Command.METHOD, Command.STATIC_METHOD) and args[1])
+            ):
+                self._bridge_send(now=True, reason="batch", lane=index)
+            return  # Sent when the batch exits
 
         if n == 0:
             # First event, send at next available time
-            self._bridge_last_scheduled = time()
-            self.deferred_call(self._bridge_send)
+            self._bridge_schedule(index)
             return
         elif kwargs.get("now"):
-            self._bridge_send(now=True)
+            self._bridge_send(now=True, lane=index)
             return
 
-        # If it's been over 5 ms since we last scheduled, run now
-        dt = time() - self._bridge_last_scheduled
-        if dt > self._bridge_max_delay:
-            self._bridge_send(now=True)
+        policy = self.lane_policies.get(index, self.flush_policy)
+        reason = policy.check(n + 1, time() - lane.queued_at)
+        if reason is not None:
+            self._bridge_send(now=True, reason=reason, lane=index)
+
+    def _bridge_schedule(self, index: int):
+        """Schedule sending the lane using its flush policy"""
+        policy = self.lane_policies.get(index, self.flush_policy)
+        now = self._bridge_lanes[index].queued_at = time()
+        delay = policy.schedule(now)
+        if delay > 0:
+            self.timed_call(delay * 1000, self._bridge_send, lane=index)
+        else:
+            self.deferred_call(self._bridge_send, lane=index)
+
+    def _bridge_route(self, index: int, name: str, args: tuple) -> int:
+        """Return the lane the event must be sent in so it is not sent before
+        the events already queued in lower priority lanes for the same
+        objects.
+
+        """
+        refs = event_refs(name, args)
+        if refs:
+            lanes = self._bridge_lanes
+            for i in range(len(lanes) - 1, index, -1):
+                lane = lanes[i]
+                if lane.events and lane.uses(refs):
+                    return i
+        return index
+
+    def batched(self) -> BridgeBatch:
+        """Hold all events sent within the context and send them together
+        when it exits. This can be used with `with` or `async with` and
+        nested.
+
+            with app.batched():
+                for item in items:
+                    update(item)
+
+        Returns
+        -------
+        batch: BridgeBatch
+            The context manager
+
+        """
+        return BridgeBatch(app=self)
 
     def force_update(self):
         """Force an update now."""
         #: So we don't get out of order
-        self._bridge_send(now=True)
+        self._bridge_send(now=True, reason="force")
 
     def _on_future_result(self, future: Future) -> None:
         """Avoid unhandled-exception warnings from spawned coroutines."""
@@ -266,7 +536,12 @@ class BridgedApplication(Application):
         except Exception as e:
             self.handle_error(future, e)
 
-    def _bridge_send(self, now: bool = False):
+    def _bridge_send(
+        self,
+        now: bool = False,
+        reason: Optional[str] = None,
+        lane: int = Lane.BACKGROUND,
+    ):
         """Send the events over the bridge to be processed by the native
         handler.
 
@@ -275,78 +550,247 @@ class BridgedApplication(Application):
         now: boolean
             Send all pending events now instead of waiting for deferred calls
             to finish. Use this when you want to update the screen
+        reason: str
+            Why the events are being sent. This is only used by the profiler.
+        lane: int
+            Send the events of this lane and all lanes with a higher
+            priority. All lanes are sent by default.
 
         """
-        if len(self._bridge_queue):
+        if self._bridge_batch_depth and not now:
+            return  # Sent when the batch exits
+        if self._flush_callbacks and lane >= Lane.NORMAL:
+            self._run_flush_callbacks()
+        events: list[tuple] = []
+        for queue in self._bridge_lanes[: lane + 1]:
+            if queue.events:
+                if events:
+                    events.extend(queue.take())
+                else:
+                    events = queue.take()
+        if len(events):
+            for optimize in self.bridge_optimizers:
+                events = optimize(events)
             if self.debug:
                 print("======== Py --> Native ======")
-                for i, event in enumerate(self._bridge_queue):
+                for i, event in enumerate(events):
                     print(f"{i}: {event}")
                 print("===========================")
-            self.dispatch_events(dumps(self._bridge_queue))
-            self._bridge_queue = []
+            if self.name_table is not None:
+                events = self.name_table.intern(events)
+            profiler = self.profiler
+            tracer = self.tracer
+            if profiler is not None or tracer is not None:
+                start = perf_counter()
+
+            #: Pack into the reused buffer and pass a view of it. If any
+            #: events are sent during dispatch a new packer is used.
+            packer = self._bridge_packer
+            del self._bridge_packer
+            packer.pack(events)
+            data = packer.getbuffer()
+            size = len(data)
+            if reason is None:
+                reason = "now" if now else "first"
+            if profiler is not None:
+                dt = perf_counter() - start
+                profiler.record_batch(len(events), size, dt, reason)
+            try:
+                self.dispatch_events(data)
+            finally:
+                data.release()
+                packer.reset()
+                self._bridge_packer = packer
+            if tracer is not None:
+                args = {"events": len(events), "bytes": size, "reason": reason}
+                tracer.record("bridge_send", "bridge", start, args)
 
     def dispatch_events(self, data):
-        """Send events to the bridge using the system specific implementation."""
+        """Send events to the bridge using the system specific implementation.
+        The data is a memoryview that is only valid during this call.
+
+        """
         raise NotImplementedError
 
     async def process_events(self, data: str):
         """The native implementation must use this call to"""
+        tracer = self.tracer
+        if tracer is not None:
+            start = perf_counter()
         events = loads(data)
         if self.debug:
             print("======== Py <-- Native ======")
             for event in events:
                 print(event)
             print("===========================")
+        received = len(events)
+        if CALLBACK_POLICIES:
+            events = coalesce_callbacks(events)
         for t, event in events:
             if t == "event":
-                await self.handle_event(*event)
+                if CALLBACK_POLICIES and self._throttle(event):
+                    continue
+                # Sync handlers finish here, only async ones are awaited
+                pending = self.dispatch_event(*event)
+                if pending is not None:
+                    await pending
+        if tracer is not None:
+            args = {"events": received, "bytes": len(data)}
+            tracer.record("process_events", "bridge", start, args)
+
+    def _throttle(self, event: list) -> bool:
+        """Check if the event is of a callback declared with a `throttle`
+        that was already handled within the interval. If so the event is
+        held and replaces any other held event of the callback on the object,
+        the last one is handled when the interval ends.
+
+        """
+        result_id, ptr, method, args = event
+        if result_id or method not in CALLBACK_POLICIES:
+            return False
+        interval = get_handler_info(type(bridge.CACHE.get(ptr)), method).throttle
+        if not interval:
+            return False
+        key = (ptr, method)
+        throttled = self._throttled
+        if key in throttled:
+            throttled[key] = event
+            return True
+        throttled[key] = None
+        self.timed_call(interval, self._release_throttled, key, interval)
+        return False
+
+    async def _release_throttled(self, key: tuple, interval: int):
+        """Handle the last event held during the interval and start the next
+        interval if there was one.
+
+        """
+        event = self._throttled.pop(key, None)
+        if event is not None:
+            self._throttled[key] = None
+            self.timed_call(interval, self._release_throttled, key, interval)
+            await self.handle_event(*event)
 
     async def handle_event(self, result_id: int, ptr: int, method: str, args: list):
         """When we get an 'event' type from the bridge
         handle it by invoking the handler and if needed
         sending back the result.
 
+        """
+        pending = self.dispatch_event(result_id, ptr, method, args)
+        if pending is not None:
+            await pending
+
+    def dispatch_event(
+        self, result_id: int, ptr: int, method: str, args: list
+    ) -> Optional[Coroutine]:
+        """Invoke the handler of an event. If the handler is async, the
+        coroutine that finishes handling the event (and sends the result) is
+        returned and must be awaited, unless the callback is `concurrent` in
+        which case it is run as a task.
+
         """
         obj = None
         result = None
+        pending = None
+        tracer = self.tracer
+        start = perf_counter() if tracer is not None else 0.0
         try:
             obj, handler = get_handler(ptr, method)
             if method == "set_exception":
                 # Remote call failed
                 obj.set_exception(BridgeException(args))
-            elif iscoroutinefunction(handler):
-                result = await handler(*(v for t, v in args))
             else:
                 result = handler(*(v for t, v in args))
+                if iscoroutine(result):
+                    info = get_handler_info(obj.__class__, method)
+                    pending = self._finish_event(
+                        result_id, ptr, method, args, obj, result, start
+                    )
+                    if info.concurrent:
+                        task = ensure_future(pending)
+                        task.add_done_callback(self._on_event_task_done)
+                        return None
+                    return pending
         except BridgeReferenceError as e:
+            if ptr in EXPIRED:
+                #: The result came after the future expired and was released
+                del EXPIRED[ptr]
+                return None
             #: Log the event, don't blow up here
             event = (result_id, ptr, method, args)
             print(f"Error processing event: {event} - {e}")
             self.error_occurred(e)  # type: ignore
             # self.show_error(msg)
         except Exception as e:
-            #: Log the event, blow up in user's face
-            self.error_occurred(e)  # type: ignore
-            err = traceback.format_exc()
-            event = (result_id, ptr, method, args)
-            msg = f"Error processing event: {event} - {err}"
-            print(msg)
-            self.show_error(msg)
+            self._event_failed(result_id, ptr, method, args, e)
             raise
         finally:
-            if result_id:
-                if hasattr(obj, "__nativeclass__"):
-                    sig, ret_type = getattr(obj.__class__, method).__returns__
-                else:
-                    sig = result.__class__.__name__
+            if pending is None:
+                self._event_done(result_id, ptr, method, obj, result, start)
+        return None
+
+    async def _finish_event(
+        self,
+        result_id: int,
+        ptr: int,
+        method: str,
+        args: list,
+        obj: Any,
+        coro: Coroutine,
+        start: float,
+    ):
+        """Wait for the async handler of an event and send the result"""
+        result = None
+        try:
+            result = await coro
+        except Exception as e:
+            self._event_failed(result_id, ptr, method, args, e)
+            raise
+        finally:
+            self._event_done(result_id, ptr, method, obj, result, start)
 
-                self.send_event(
-                    Command.RESULT,  #: method
-                    result_id,
-                    (sig, encode(result)),  #: args
-                    now=True,
-                )
+    def _event_done(
+        self, result_id: int, ptr: int, method: str, obj: Any, result: Any, start
+    ):
+        """Record the event and send the result if the native side is
+        waiting for one.
+
+        """
+        tracer = self.tracer
+        if tracer is not None:
+            args = {"ptr": ptr, "result_id": result_id}
+            tracer.record(method, "handle_event", start, args)
+        if result_id:
+            sig = get_handler_info(obj.__class__, method).returns
+            if sig is None:
+                sig = result.__class__.__name__
+
+            self.send_event(
+                Command.RESULT,  #: method
+                result_id,
+                (sig, encode(result)),  #: args
+                now=True,
+            )
+
+    def _event_failed(
+        self, result_id: int, ptr: int, method: str, args: list, e: Exception
+    ):
+        """Log the event, blow up in user's face"""
+        self.error_occurred(e)  # type: ignore
+        err = traceback.format_exc()
+        event = (result_id, ptr, method, args)
+        msg = f"Error processing event: {event} - {err}"
+        print(msg)
+        self.show_error(msg)
+
+    def _on_event_task_done(self, task: Future):
+        """Retrieve the error of a concurrent event task. It was already
+        shown by `_finish_event`.
+
+        """
+        if not task.cancelled():
+            task.exception()
 
     def handle_error(self, callback, exc: Exception):
         """Called when an error occurs in an event loop callback.
@@ -410,6 +854,157 @@ class BridgedApplication(Application):
         except Exception:
             self.show_error(traceback.format_exc())
 
+    # -------------------------------------------------------------------------
+    # Profiler API
+    # -------------------------------------------------------------------------
+    def start_profiling(self) -> BridgeProfiler:
+        """Start recording the bridge traffic. If the profiler is already
+        running the existing stats are kept.
+
+        Returns
+        -------
+        profiler: BridgeProfiler
+            The profiler recording the bridge traffic.
+
+        """
+        if self.profiler is None:
+            self.profiler = BridgeProfiler()
+        return self.profiler
+
+    def stop_profiling(self) -> Optional[BridgeProfiler]:
+        """Stop recording the bridge traffic.
+
+        Returns
+        -------
+        profiler: BridgeProfiler or None
+            The profiler with the stats recorded or None if it was not
+            running.
+
+        """
+        profiler = self.profiler
+        self.profiler = None
+        return profiler
+
+    # -------------------------------------------------------------------------
+    # Tracing API
+    # -------------------------------------------------------------------------
+    def start_tracing(self, maxlen: int = 100000) -> Tracer:
+        """Start recording event loop callbacks and bridge activity. Use
+        `tracer.save(path)` to write the trace to a file that can be opened
+        in chrome://tracing or https://ui.perfetto.dev
+
+        Parameters
+        ----------
+        maxlen: int
+            The max number of spans to keep. Once full the oldest are dropped.
+
+        Returns
+        -------
+        tracer: Tracer
+            The tracer recording the activity.
+
+        """
+        if self.tracer is None:
+            self.tracer = Tracer(maxlen=maxlen)
+        return self.tracer
+
+    def stop_tracing(self) -> Optional[Tracer]:
+        """Stop recording event loop and bridge activity.
+
+        Returns
+        -------
+        tracer: Tracer or None
+            The tracer with the recorded spans or None if it was not running.
+
+        """
+        tracer = self.tracer
+        self.tracer = None
+        return tracer
+
+    # -------------------------------------------------------------------------
+    # Pending results API
+    # -------------------------------------------------------------------------
+    def pending_futures(self) -> list[BridgeFuture]:
+        """Return the results of bridge methods that were not received yet,
+        oldest first.
+
+        """
+        futures = [
+            f
+            for f in list(bridge.CACHE.values())
+            if isinstance(f, BridgeFuture) and f.__method__ and not f.done()
+        ]
+        futures.sort(key=lambda f: f.__created__)
+        return futures
+
+    def sweep_futures(
+        self, max_age: float = 60, cancel: bool = False
+    ) -> dict[str, tuple[int, float]]:
+        """Find the results of bridge methods that were not received within
+        `max_age` seconds. If any are found they are logged and
+        `futures_pending` is triggered.
+
+        Parameters
+        ----------
+        max_age: float
+            Seconds after which a result is considered lost
+        cancel: bool
+            Cancel the futures found so they are released
+
+        Returns
+        -------
+        pending: dict
+            The number of futures and the age of the oldest in seconds keyed
+            by the method name.
+
+        """
+        pending: dict[str, tuple[int, float]] = {}
+        for f in self.pending_futures():
+            age = f.age
+            if age < max_age:
+                break
+            count, oldest = pending.get(f.__method__, (0, age))
+            pending[f.__method__] = (count + 1, oldest)
+            if cancel:
+                f.cancel()
+        if pending:
+            for method, (count, age) in pending.items():
+                print(f"[WARNING] {count} results of {method} pending for {age:.1f}s")
+            self.futures_pending(pending)  # type: ignore
+        return pending
+
+    def start_future_sweep(
+        self, interval: float = 60, max_age: float = 60, cancel: bool = False
+    ):
+        """Periodically check for results that were not received. See
+        `sweep_futures`.
+
+        Parameters
+        ----------
+        interval: float
+            Seconds between each check
+        max_age: float
+            Seconds after which a result is considered lost
+        cancel: bool
+            Cancel the futures found so they are released
+
+        """
+        sweep = self._future_sweep = (interval, max_age, cancel)
+        self.timed_call(interval * 1000, self._run_future_sweep, sweep)
+
+    def stop_future_sweep(self):
+        """Stop checking for results that were not received"""
+        self._future_sweep = None
+
+    def _run_future_sweep(self, sweep: tuple):
+        if self._future_sweep is not sweep:
+            return  # Stopped or restarted
+        interval, max_age, cancel = sweep
+        try:
+            self.sweep_futures(max_age, cancel)
+        finally:
+            self.timed_call(interval * 1000, self._run_future_sweep, sweep)
+
     # -------------------------------------------------------------------------
     # Plugin implementation
     # -------------------------------------------------------------------------
@@ -7,23 +7,44 @@ The full license is in the file LICENSE, distributed with this software.
 
 Created on June 21, 2017
 """
+import asyncio
 import functools
 import msgpack
 from asyncio import Future
 from contextlib import contextmanager
-from typing import Any, ClassVar, Optional, Union, Type
+from time import perf_counter
+from typing import Any, Callable, ClassVar, NamedTuple, Optional, Union, Type
 from weakref import WeakValueDictionary
 from types import GenericAlias
-from atom.api import Atom, Dict, ForwardInstance, Instance, Int, Property, Str
+from atom.api import Atom, Dict, ForwardInstance, Instance, Int, Property, Str, Value
 
-CACHE: WeakValueDictionary[int, Union[Future, "BridgeObject"]] = WeakValueDictionary()
+#: Objects that can be referenced over the bridge keyed by id. Use
+#: `set_registry` to replace it.
+CACHE: Any = WeakValueDictionary()
 __global_id__: int = 0
 __method_id__: int = 0
 
+#: Allocates ids if the registry provides it
+__allocate__: Optional[Callable[[], int]] = None
+
 
 #: Mapping of nativeclass str to subclasses
 REGISTRY: dict[str, "BridgeObject"] = {}
 
+#: Mapping of method id to whether calls can be coalesced for methods that
+#: set it explicitly. See enamlnative.core.optimize
+COALESCE: dict[int, bool] = {}
+
+#: Names of the callbacks declared with `coalesce` or `throttle`. Only
+#: events of these are checked by `coalesce_callbacks`.
+CALLBACK_POLICIES: set[str] = set()
+
+#: Ids of results that expired or were cancelled before they were received so
+#: a result that arrives later can be ignored. Only the last `MAX_EXPIRED` are
+#: kept as the native side may never send them.
+EXPIRED: dict[int, None] = {}
+MAX_EXPIRED = 1024
+
 
 class Command:
     CREATE = "c"
@@ -32,6 +53,7 @@ class Command:
     STATIC_METHOD = "sm"
     FIELD = "f"
     DELETE = "d"
+    BULK_DELETE = "bd"
     RESULT = "r"
     ERROR = "e"
     DEF = "def"
@@ -45,10 +67,34 @@ class ExtType:
 def generate_id() -> int:
     """Generate an id for an object"""
     global __global_id__
+    if __allocate__ is not None:
+        return __allocate__()
     __global_id__ += 1
     return __global_id__
 
 
+def set_registry(registry: Any):
+    """Replace the table of objects that can be referenced over the bridge
+    such as with a `enamlnative.core.registry.SlotMap`. It must support the
+    same operations as a WeakValueDictionary. If it has an `allocate` method
+    it is used to generate ids.
+
+    Objects in the current table are moved to the new one. This should be
+    done before creating the app.
+
+    Parameters
+    ----------
+    registry: WeakValueDictionary or SlotMap
+        The table to use
+
+    """
+    global CACHE, __allocate__
+    for key, obj in list(CACHE.items()):
+        registry[key] = obj
+    CACHE = registry
+    __allocate__ = getattr(registry, "allocate", None)
+
+
 def method_id():
     global __method_id__
     __method_id__ += 1
@@ -85,6 +131,11 @@ def get_object_with_id(id):
     return CACHE[id]
 
 
+def cache_object(obj):
+    """Add the object to the cache using its id"""
+    CACHE[obj.__id__] = obj
+
+
 def _cleanup_id(obj):
     """Removes the object from the"""
     try:
@@ -105,7 +156,10 @@ def get_app_class():
 def encode(obj):
     """Encode an object for proper decoding by Java or ObjC"""
     if hasattr(obj, "__id__"):
-        return msgpack.ExtType(ExtType.REF, msgpack.packb(obj.__id__))
+        try:
+            return obj.__ref__
+        except AttributeError:
+            return msgpack.ExtType(ExtType.REF, msgpack.packb(obj.__id__))
     return obj
 
 
@@ -159,6 +213,49 @@ def get_handler(ptr: int, method: str) -> tuple:
     return obj, handler
 
 
+class HandlerInfo(NamedTuple):
+    """How events of a method of a class are handled"""
+
+    #: Signature of the result sent back or None to use the type of the result
+    returns: Optional[str]
+
+    #: Run async handlers as a task instead of waiting for them to finish
+    #: before handling the next event
+    concurrent: bool
+
+    #: Drop events replaced by a later event in the batch received
+    coalesce: bool
+
+    #: Handle at most one event per this many ms
+    throttle: int
+
+
+def get_handler_info(cls: type, method: str) -> HandlerInfo:
+    """Return how events of the method are handled. This is looked up once
+    for each class and method and kept in the `__handlers__` of the class so
+    it is released along with the class.
+
+    """
+    handlers = cls.__dict__.get("__handlers__")
+    if handlers is None:
+        handlers = {}
+        try:
+            setattr(cls, "__handlers__", handlers)
+        except TypeError:
+            pass  # Builtin types, such as NoneType for unknown objects
+    info = handlers.get(method)
+    if info is None:
+        member = getattr(cls, method, None)
+        returns = getattr(member, "__returns__", None)
+        info = handlers[method] = HandlerInfo(
+            returns[0] if returns else None,
+            getattr(member, "__concurrent__", False),
+            getattr(member, "__coalesce__", False),
+            getattr(member, "__throttle__", 0),
+        )
+    return info
+
+
 class BridgeObject(Atom):
     """A proxy to a class in java. This sends the commands over
     the bridge for execution.  The object is stored in a map
@@ -200,6 +297,9 @@ class BridgeObject(Atom):
     #: Bridge object ID
     __id__ = Int(0, factory=generate_id)
 
+    #: Encoded reference to this object used when passing it as an argument
+    __ref__ = Value()
+
     #: Prefix to add to all names used during method and property calls
     #: used for nested objects
     __prefix__ = Str()
@@ -217,9 +317,20 @@ class BridgeObject(Atom):
         cls.__constructor_ids__ = [method_id() for i in range(n)]
         REGISTRY[cls.__nativeclass__] = cls
 
+        #: Build the arg packers of the BridgeMethod and BridgeStaticMethod
+        #: members defined in this class
+        for member in cls.__dict__.values():
+            if isinstance(member, Property) and hasattr(member, "__packer__"):
+                member.__packer__ = member.compile()
+                if getattr(member, "__coalesce__", False):
+                    CALLBACK_POLICIES.add(member.name)
+
     def _default___app__(self):
         return get_app_class().instance()
 
+    def _default___ref__(self):
+        return msgpack.ExtType(ExtType.REF, msgpack.packb(self.__id__))
+
     def getId(self):
         return self.__id__
 
@@ -232,6 +343,14 @@ class BridgeObject(Atom):
         if __id__ is not None:
             if isinstance(__id__, int):
                 kwargs["__id__"] = __id__
+            elif isinstance(__id__, BridgeFuture):
+                #: The future caches and resolves to this object when the
+                #: result arrives. Until then it can already be used as the
+                #: native side stores the result with the same id.
+                f = __id__
+                f.__proxy__ = self
+                kwargs["__id__"] = f.__id__
+                cache = False
             elif isinstance(__id__, Future):
                 #: If a future is given don't store this object in the cache
                 #: until after the future completes
@@ -257,6 +376,10 @@ class BridgeObject(Atom):
         #: Construct the object
         super().__init__(**kwargs)
 
+        #: Bind the app now, otherwise an object that outlives its app would
+        #: send the DELETE to whichever app exists when it is released
+        app = self.__app__
+
         if cache:
             CACHE[self.__id__] = self
 
@@ -265,7 +388,7 @@ class BridgeObject(Atom):
                 constructor_id = self.__constructor_ids__[len(args) - 1]
             else:
                 constructor_id = self.__constructor_ids__[0]
-            self.__app__.send_event(
+            app.send_event(
                 Command.CREATE,  #: method
                 self.__id__,  #: id to assign in bridge cache
                 constructor_id,
@@ -281,7 +404,9 @@ class BridgeObject(Atom):
         reference the bridge implementation holds (allowing it to be released).
         """
         ref = self.__id__
-        self.__app__.send_event(Command.DELETE, ref)
+        app = self.__app__
+        if app is not None:
+            app.send_event(Command.DELETE, ref, nativeclass=self.__nativeclass__)
         try:
             del CACHE[ref]
         except KeyError:
@@ -321,6 +446,30 @@ class NestedBridgeObject(BridgeObject):
         pass
 
 
+class BoundBridgeMethod(functools.partial):
+    """A BridgeMethod bound to an object. Calling it invokes the method."""
+
+    __slots__ = ()
+
+    def suppressed(self):
+        """Suppress calls within this context to avoid feedback loops"""
+        return self.func.suppressed(self.args[0])
+
+
+class BoundBridgeCallback(BoundBridgeMethod):
+    """A BridgeCallback bound to an object."""
+
+    __slots__ = ()
+
+    def connect(self, callback):
+        """Set the callback to be fired when the event occurs."""
+        self.func.connect(self.args[0], callback)
+
+    def disconnect(self, callback=None):
+        """Remove the callback to be fired when the event occurs."""
+        self.func.disconnect(self.args[0], callback)
+
+
 class BridgeMethod(Property):
     """A method that is callable via the bridge.
     When called, this serializes the call, packs the arguments,
@@ -337,13 +486,33 @@ class BridgeMethod(Property):
     #: Use it
     view.addView(view2)
 
+    Pass `coalesce=True` if a call replaces the value set by any earlier call
+    (or `False` if it does not) so only the last call in a batch is sent
+    when setter coalescing is enabled. By default this is assumed for methods
+    named "set..." that take one argument.
+
+    Pass `timeout` (in seconds) to fail the result with an
+    `asyncio.TimeoutError` if it's not received in time. It can also be
+    passed to each call. By default the app's `bridge_timeout` is used.
+
     """
 
-    __slots__ = ("__signature__", "__returns__", "__cache__", "__method_id__")
+    __slots__ = (
+        "__signature__",
+        "__returns__",
+        "__cache__",
+        "__method_id__",
+        "__packer__",
+        "__timeout__",
+    )
     __returns__: Optional[tuple[str, type]]
     __signature__: tuple[str, ...]
     __cache__: dict[int, Future]
     __method_id__: int
+    __timeout__: Optional[float]
+
+    #: Function that packs the args of a call, see `compile`
+    __packer__: Optional[Callable[[tuple, dict], tuple[str, list]]]
 
     def __init__(self, *args, **kwargs):
         return_type = kwargs.get("returns", None)
@@ -354,6 +523,11 @@ class BridgeMethod(Property):
         self.__signature__ = tuple(convert_arg(arg) for arg in args)
         self.__cache__ = {}  # Result cache otherwise gc cleans up
         self.__method_id__ = method_id()
+        self.__packer__ = None
+        self.__timeout__ = kwargs.get("timeout", None)
+        coalesce = kwargs.get("coalesce", None)
+        if coalesce is not None:
+            COALESCE[self.__method_id__] = coalesce
         super().__init__(self.__fget__)
 
     @contextmanager
@@ -364,22 +538,30 @@ class BridgeMethod(Property):
         obj.__suppressed__[self.name] = False
 
     def __fget__(self, obj):
-        f = functools.partial(self.__call__, obj)
-        f.suppressed = functools.partial(self.suppressed, obj)
-        return f
+        return BoundBridgeMethod(self, obj)
 
     def __call__(self, obj, *args, **kwargs):
         """The Swift like syntax is used"""
         if obj.__suppressed__.get(self.name):
             return
+        timeout = kwargs.pop("timeout", None) if kwargs else None
 
         #: Format the args as needed
-        method_name, method_args = self.pack_args(obj, *args, **kwargs)
+        packer = self.__packer__
+        if packer is None:
+            method_name, method_args = self.pack_args(obj, *args, **kwargs)
+        else:
+            method_name, method_args = packer(args, kwargs)
 
         #: Create a future to retrieve the result if needed
         app = obj.__app__
         if self.__returns__:
-            result = app.create_future(self.__returns__[1])
+            if timeout is None:
+                timeout = self.__timeout__
+            if timeout is None:
+                timeout = app.bridge_timeout
+            result = app.create_future(self.__returns__[1], timeout)
+            result.__method__ = f"{obj.__nativeclass__}.{method_name}"
             #: Store in local cache or global cache (weakref) removes it
             #: resulting in a Reference error when the result is returned
             result_id = result.__id__
@@ -414,6 +596,16 @@ class BridgeMethod(Property):
         """
         raise NotImplementedError
 
+    def compile(self):
+        """Called when the BridgeObject subclass defining this method is
+        created. Subclasses can return a function `packer(args, kwargs)` that
+        returns the same result as `pack_args` with everything that does not
+        depend on the args already worked out. It is then used instead of
+        `pack_args` for each call.
+
+        """
+        return None
+
 
 class BridgeStaticMethod(Property):
     """A method that is callable via the bridge.
@@ -435,6 +627,8 @@ class BridgeStaticMethod(Property):
         "__cache__",
         "__owner__",
         "__method_id__",
+        "__packer__",
+        "__timeout__",
     )
     #: Return type
     __returns__: Optional[tuple[str, type]]
@@ -447,6 +641,12 @@ class BridgeStaticMethod(Property):
     __owner__: Optional[Type[BridgeObject]]
     __method_id__: int
 
+    #: Seconds to wait for the result, see `BridgeMethod`
+    __timeout__: Optional[float]
+
+    #: Function that packs the args of a call, see `BridgeMethod.compile`
+    __packer__: Optional[Callable[[tuple, dict], tuple[str, list]]]
+
     def __init__(self, *args, **kwargs):
         return_type = kwargs.get("returns", None)
         if return_type is None:
@@ -457,6 +657,8 @@ class BridgeStaticMethod(Property):
         self.__owner__ = None
         self.__cache__ = {}  # Result cache otherwise gc cleans up
         self.__method_id__ = method_id()
+        self.__packer__ = None
+        self.__timeout__ = kwargs.get("timeout", None)
         super().__init__()
 
     def __get__(self, instance, owner):
@@ -466,14 +668,25 @@ class BridgeStaticMethod(Property):
         return super().__get__(instance, owner)
 
     def __call__(self, *args, **kwargs):
+        timeout = kwargs.pop("timeout", None) if kwargs else None
+
         #: Format the args as needed
-        method_name, method_args = self.pack_args(*args, **kwargs)
+        packer = self.__packer__
+        if packer is None:
+            method_name, method_args = self.pack_args(*args, **kwargs)
+        else:
+            method_name, method_args = packer(args, kwargs)
 
         app = get_app_class().instance()
 
         #: Create a future to retrieve the result if needed
         if self.__returns__:
-            result = app.create_future(self.__returns__[1])
+            if timeout is None:
+                timeout = self.__timeout__
+            if timeout is None:
+                timeout = app.bridge_timeout
+            result = app.create_future(self.__returns__[1], timeout)
+            result.__method__ = f"{self.__owner__.__nativeclass__}.{method_name}"
             result_id = result.__id__
             #: Store in local cache or global cache (weakref) removes it
             #: resulting in a Reference error when the result is returned
@@ -508,6 +721,10 @@ class BridgeStaticMethod(Property):
         """
         raise NotImplementedError
 
+    def compile(self):
+        """See `BridgeMethod.compile`"""
+        return None
+
 
 class BridgeField(Property):
     """Allows you to set fields or properties over the bridge using normal
@@ -550,7 +767,7 @@ class BridgeField(Property):
             obj.__id__,
             self.__method_id__,
             f"{obj.__prefix__}{self.name}",  #: method name
-            [msgpack_encoder(self.__signature__, arg)],  #: args
+            [(self.__signature__, encode(arg))],  #: args
         )
 
     def __fget__(self, obj):
@@ -594,14 +811,39 @@ class BridgeCallback(BridgeMethod):
         def _impl_hashCode(self):
             return self.__id__
 
+    Callbacks that fire very often (sensors, scrolling, touches) can pass
+    `coalesce="latest"` so only the last event of an object in each batch
+    received is handled. Pass `throttle` (in ms) to also handle at most one
+    event per interval, the latest event received during the interval is
+    handled when it ends. Events that expect a result are never dropped.
+
+    Events are handled in the order received and async callbacks are
+    awaited before the next event is handled. Pass `concurrent=True` to run
+    them as a task instead if they do not depend on each other. A throttled
+    event held until its interval ends is the exception, it is handled after
+    the events received later, including those of other callbacks of the
+    same object. Only throttle callbacks whose handlers do not depend on the
+    order of the other events.
+
     """
 
+    __slots__ = ("__coalesce__", "__throttle__", "__concurrent__")
+    __coalesce__: bool
+    __throttle__: int
+    __concurrent__: bool
+
+    def __init__(self, *args, **kwargs):
+        self.__concurrent__ = kwargs.pop("concurrent", False)
+        coalesce = kwargs.pop("coalesce", None)
+        if coalesce not in (None, "latest"):
+            raise ValueError(f"Invalid coalesce policy: {coalesce}")
+        self.__throttle__ = kwargs.pop("throttle", 0)
+        self.__coalesce__ = bool(coalesce or self.__throttle__)
+        super().__init__(*args, **kwargs)
+
     def __fget__(self, obj):
-        f = super().__fget__(obj)
-        #: Add a method so it can be connected like in Qt
-        f.connect = functools.partial(self.connect, obj)
-        f.disconnect = functools.partial(self.disconnect, obj)
-        return f
+        #: Can be connected like in Qt
+        return BoundBridgeCallback(self, obj)
 
     def __call__(self, obj, *args):
         """Fire the callback if one is connected"""
@@ -630,18 +872,164 @@ class BridgeFuture(Future):
     __id__: int
     __returns__: Optional[type]
 
-    def __init__(self, return_type: Optional[type] = None):
+    #: Name of the bridge method that returns this result
+    __method__: str
+
+    #: Time the future was created
+    __created__: float
+
+    #: Profiler to record the time it took to get the result
+    __profiler__: Optional[Any]
+
+    #: Set if it timed out before the result was received
+    __expired__: bool
+
+    #: Object used in place of the result before it was received. See `proxy`
+    __proxy__: Optional["BridgeObject"]
+
+    #: App the call that returns this result was sent with
+    __app__: Optional[Any]
+
+    def __init__(
+        self,
+        return_type: Optional[type] = None,
+        profiler: Optional[Any] = None,
+        app: Optional[Any] = None,
+    ):
         result_id = self.__id__ = generate_id()
         CACHE[result_id] = self
         self.__returns__ = return_type
+        self.__app__ = app
+        self.__method__ = ""
+        self.__created__ = perf_counter()
+        self.__profiler__ = profiler
+        self.__expired__ = False
+        self.__proxy__ = None
         super().__init__()
 
+    @property
+    def __ref__(self) -> msgpack.ExtType:
+        """Encode the future as a reference to the object it resolves to so
+        it can be passed as an argument before the result is received. The
+        native side resolves it as it stores the result with the id of the
+        future. Results which are not objects are only passed once received.
+
+        """
+        if self.done():
+            return encode(self.result())
+        if self.__proxy__ is None and self._proxy_class() is None:
+            raise TypeError(
+                f"{self.__method__ or 'Result'} does not return an object "
+                "so it cannot be used before it is received"
+            )
+        return msgpack.ExtType(ExtType.REF, msgpack.packb(self.__id__))
+
+    def _proxy_class(self) -> Optional[type]:
+        """Return the BridgeObject subclass of the result if known"""
+        return_type = self.__returns__
+        if isinstance(return_type, str):
+            return_type = REGISTRY.get(return_type)
+        if isinstance(return_type, type) and issubclass(return_type, BridgeObject):
+            return return_type
+        return None
+
+    def proxy(self, cls: Optional[type] = None) -> "BridgeObject":
+        """Return an object that refers to the result of this future and can
+        be used right away. Calls made with it are sent after the call that
+        creates the result so they run without waiting for a round trip.
+
+            toast = Toast.makeText(context, "Hello", 1).proxy()
+            toast.show()
+
+        Parameters
+        ----------
+        cls: type
+            The BridgeObject subclass of the result. By default the return
+            type of the method is used.
+
+        """
+        proxy = self.__proxy__
+        if proxy is None:
+            if cls is None:
+                cls = self._proxy_class()
+                if cls is None:
+                    raise TypeError(
+                        f"{self.__method__ or 'Result'} does not return an "
+                        "object, pass the class to use"
+                    )
+            proxy = cls(__id__=self)
+        return proxy
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the future was created"""
+        return perf_counter() - self.__created__
+
+    def record_latency(self):
+        """Record the time elapsed since the future was created"""
+        profiler = self.__profiler__
+        if profiler is not None and self.__method__:
+            profiler.record_latency(self.__method__, perf_counter() - self.__created__)
+
+    def set_timeout(self, timeout: float):
+        """Fail with an `asyncio.TimeoutError` if the result is not set
+        within the given number of seconds.
+
+        """
+        handle = self.get_loop().call_later(timeout, self._on_timeout, timeout)
+        self.add_done_callback(lambda f: handle.cancel())
+
+    def _on_timeout(self, timeout: float):
+        if not self.done():
+            method = self.__method__ or "Result"
+            msg = f"{method} was not received within {timeout}s"
+            self.__expired__ = True
+            super().set_exception(asyncio.TimeoutError(msg))
+            self.release_result()
+
+    def cancel(self, msg: Any = None) -> bool:
+        cancelled = super().cancel(msg)
+        if cancelled:
+            self.release_result()
+        return cancelled
+
+    def release_result(self):
+        """Tell the native side to delete the result stored with the id of
+        this future. The result is ignored if it arrives later and this
+        future may be released before then.
+
+        """
+        result_id = self.__id__
+        EXPIRED[result_id] = None
+        if len(EXPIRED) > MAX_EXPIRED:
+            del EXPIRED[next(iter(EXPIRED))]
+        if self.__proxy__ is not None:
+            return  # The proxy deletes it when it is released
+        app = self.__app__
+        if app is not None:
+            app.send_event(Command.DELETE, result_id)
+
+    def set_exception(self, exception):
+        if self.__expired__ or self.cancelled():
+            return  # The result came too late
+        self.record_latency()
+        super().set_exception(exception)
+
     def set_result(self, result):
         return_type = self.__returns__
-        if (
+        proxy = self.__proxy__
+        if proxy is not None:
+            CACHE[self.__id__] = proxy
+            result = proxy
+        elif (
             isinstance(result, int)
             and isinstance(return_type, type)
             and issubclass(return_type, BridgeObject)
         ):
+            # If the result came too late this is released right away so the
+            # native side can free the object
             result = return_type(__id__=result)
+        if self.__expired__ or self.cancelled():
+            return  # The result came too late
+        self.record_latency()
         super().set_result(result)
@@ -0,0 +1,99 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Looks up which members of a declaration have read expressions so proxies
+only initialize the values that were set in the enamldef.
+
+Created on Oct 18, 2026
+"""
+from typing import Any, Callable, NamedTuple, Optional
+from atom.api import atomref
+
+
+class DeclaredItems(NamedTuple):
+    """The members of an engine with read expressions as seen by a proxy
+    class.
+
+    """
+
+    #: Names of the members in the order they were declared excluding the
+    #: layout keys
+    keys: tuple[str, ...]
+
+    #: The unbound `set_<key>` handler of the proxy class for each key or
+    #: None if it does not have one
+    handlers: tuple[Optional[Callable], ...]
+
+    #: Names of the members that are layout keys
+    layout: tuple[str, ...]
+
+
+#: Items keyed by the id of the engine then by (proxy class, layout keys).
+#: Declarations stamped out of the same enamldef share the engine so this is
+#: only computed once for all of them. Engines do not support weakrefs so a
+#: weak atomref to the engine is kept with the items to detect a reused id
+#: without keeping the engine alive.
+CACHE: dict[int, tuple[Any, dict[tuple, DeclaredItems]]] = {}
+
+#: Size of the cache at which entries of released engines are removed
+SWEEP_SIZE = 256
+
+
+def sweep():
+    """Remove the items of engines that were released"""
+    global SWEEP_SIZE
+    for key, (ref, items) in list(CACHE.items()):
+        if not ref:
+            del CACHE[key]
+    SWEEP_SIZE = max(256, 2 * len(CACHE))
+
+
+def get_declared_items(
+    cls: type, engine: Any, layout_keys: tuple[str, ...] = ()
+) -> DeclaredItems:
+    """Get the members with read expressions in the engine.
+
+    Parameters
+    ----------
+    cls: type
+        The proxy class the handlers are looked up on
+    engine: ExpressionEngine
+        The `_d_engine` of the declaration
+    layout_keys: tuple[str, ...]
+        Names of the members that are grouped into the layout
+
+    Returns
+    -------
+    items: DeclaredItems
+        The keys, handlers, and layout keys. The result is cached.
+
+    """
+    entry = CACHE.get(id(engine))
+    if entry is None or entry[0]() is not engine:
+        if len(CACHE) >= SWEEP_SIZE:
+            sweep()
+        entry = CACHE[id(engine)] = (atomref(engine), {})
+    cache = entry[1]
+    key = (cls, layout_keys)
+    items = cache.get(key)
+    if items is None:
+        keys = []
+        layout = []
+        for k, h in engine._handlers.items():
+            # Handlers with read operations
+            if not h.read_pair:
+                continue
+            if k in layout_keys:
+                layout.append(k)
+            else:
+                keys.append(k)
+        items = cache[key] = DeclaredItems(
+            keys=tuple(keys),
+            handlers=tuple(getattr(cls, f"set_{k}", None) for k in keys),
+            layout=tuple(layout),
+        )
+    return items
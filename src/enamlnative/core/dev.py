@@ -736,6 +736,7 @@ class DevServerSession(Atom):
         """Called when the dev server wants to reload the view."""
         #: TODO: This should use the autorelaoder
         app = self.app
+        app.reset_bridge()
         app.activity.show_loading("Reloading...")
         self.save_changed_files(msg)
         try:
@@ -764,6 +765,24 @@ class DevServerSession(Atom):
             #: Display the error
             app.send_event(Command.ERROR, traceback.format_exc())
 
+    def do_profiler(self, msg):
+        """Control the bridge profiler. The message "action" can be "start",
+        "stop", "reset", or "dump" (the default). The recorded stats are
+        returned for every action.
+
+        """
+        app = self.app
+        action = msg.get("action", "dump")
+        if action == "start":
+            profiler = app.start_profiling()
+        elif action == "stop":
+            profiler = app.stop_profiling()
+        else:
+            profiler = app.profiler
+            if profiler is not None and action == "reset":
+                profiler.reset()
+        return profiler.dump() if profiler is not None else None
+
     # -------------------------------------------------------------------------
     # Utility methods
     # -------------------------------------------------------------------------
@@ -0,0 +1,268 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Computes the updates that turn one list into another so list views can
+update the rows that changed instead of reloading all of them.
+
+Created on Oct 18, 2026
+"""
+import sys
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from typing import Callable, Hashable, Optional, Sequence
+
+
+class Op:
+    """Kinds of updates returned by `diff`"""
+
+    #: ("remove", position, count)
+    REMOVE = "remove"
+
+    #: ("move", from_position, to_position)
+    MOVE = "move"
+
+    #: ("insert", position, count)
+    INSERT = "insert"
+
+    #: ("change", position, count)
+    CHANGE = "change"
+
+
+def item_key(item) -> Hashable:
+    """The default key of a list item. Hashable items are compared by value
+    and all others by identity.
+
+    """
+    try:
+        hash(item)
+    except TypeError:
+        return id(item)
+    return item
+
+
+def item_changed(old, new) -> bool:
+    """Whether a row showing the `old` item must be updated to show the `new`
+    one with the same key. Like `item_key` hashable items are compared by
+    value and all others by identity.
+
+    """
+    if old is new:
+        return False
+    try:
+        hash(old)
+        hash(new)
+    except TypeError:
+        return True
+    return bool(old != new)
+
+
+def diff(
+    old: Sequence[Hashable],
+    new: Sequence[Hashable],
+    changed: Optional[Callable[[int, int], bool]] = None,
+    limit: Optional[int] = None,
+) -> Optional[list[tuple]]:
+    """Compute the updates that turn the list with the `old` keys into the
+    list with the `new` keys.
+
+    The items of the longest matching subsequence stay in place, other items
+    whose key is in both lists are moved, and the rest are removed or
+    inserted. Each update uses the positions of the list after all previous
+    updates were applied, which is what RecyclerView adapters (and
+    `list.insert(to, list.pop(from))` for moves) expect.
+
+    Parameters
+    ----------
+    old: Sequence[Hashable]
+        Keys of the items in the current list
+    new: Sequence[Hashable]
+        Keys of the items in the updated list
+    changed: Callable[[int, int], bool]
+        Optional function called with the old and new index of each item
+        that was kept which returns whether its contents changed.
+    limit: int
+        If given, stop and return None as soon as more updates than this
+        are needed.
+
+    Returns
+    -------
+    ops: list[tuple] or None
+        The removes, then moves, then inserts, then changes. See `Op`.
+
+    """
+    if limit is None:
+        limit = sys.maxsize
+
+    # Trim the common ends so appending or removing at the ends is cheap
+    n, m = len(old), len(new)
+    start = 0
+    while start < n and start < m and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < n - start and end < m - start and old[n - 1 - end] == new[m - 1 - end]:
+        end += 1
+
+    old_end, new_end = n - end, m - end
+
+    #: Index in old of each item in new or None if it is inserted
+    source: list[Optional[int]] = list(range(start))
+    source.extend([None] * (new_end - start))
+    source.extend(range(old_end, n))
+    if start < old_end and start < new_end:
+        matcher = SequenceMatcher(
+            None, old[start:old_end], new[start:new_end], autojunk=False
+        )
+        for a, b, size in matcher.get_matching_blocks():
+            for k in range(size):
+                source[start + b + k] = start + a + k
+
+    # Pair the remaining items with the same key as moves
+    unmatched: dict[Hashable, list[int]] = {}
+    matched = {i for i in source if i is not None}
+    for i in range(old_end - 1, start - 1, -1):
+        if i not in matched:
+            unmatched.setdefault(old[i], []).append(i)
+    #: (new index, old index) of each moved item
+    moved: list[tuple[int, int]] = []
+    if unmatched:
+        for j in range(start, new_end):
+            if source[j] is None:
+                indices = unmatched.get(new[j])
+                if indices:
+                    i = source[j] = indices.pop()
+                    moved.append((j, i))
+    kept = {i for i in source if i is not None}
+
+    ops: list[tuple] = []
+
+    # Remove from the end so the positions are those of the old list
+    i = n - 1
+    while i >= 0:
+        if i in kept:
+            i -= 1
+            continue
+        last = i
+        while i >= 0 and i not in kept:
+            i -= 1
+        ops.append((Op.REMOVE, i + 1, last - i))
+        if len(ops) > limit:
+            return None
+
+    # Move each item after the item before it in the new list
+    if moved:
+        if len(ops) + len(moved) > limit:
+            # Moving an item may not be needed but usually most are
+            return None
+        ops.extend(moves(source, moved))
+
+    # Insert in order so the positions before each are already updated
+    j = 0
+    while j < m:
+        if source[j] is not None:
+            j += 1
+            continue
+        first = j
+        while j < m and source[j] is None:
+            j += 1
+        ops.append((Op.INSERT, first, j - first))
+        if len(ops) > limit:
+            return None
+
+    if changed is not None:
+        j = 0
+        while j < m:
+            src = source[j]
+            if src is None or not changed(src, j):
+                j += 1
+                continue
+            first = j
+            j += 1
+            while j < m:
+                src = source[j]
+                if src is None or not changed(src, j):
+                    break
+                j += 1
+            ops.append((Op.CHANGE, first, j - first))
+            if len(ops) > limit:
+                return None
+
+    return ops
+
+
+def moves(source: list[Optional[int]], moved: list[tuple[int, int]]) -> list[tuple]:
+    """Compute the moves that put each moved item after the item before it
+    in the new list.
+
+    Items that are not moved keep their order. Each one starts a segment
+    made of the items already moved into place after it, in the new order,
+    followed by the items still to be moved that were after it, in the old
+    order. Sorting by (segment, moved, index) gives the position of every
+    item at any step, and a Fenwick tree counts the items before one in
+    O(log n).
+
+    Parameters
+    ----------
+    source: list[Optional[int]]
+        Index in the old list of each item in the new list
+    moved: list[tuple[int, int]]
+        The new and old index of each moved item in the new order
+
+    Returns
+    -------
+    ops: list[tuple]
+        The moves
+
+    """
+    is_moved = {j for j, i in moved}
+    stay_new = []
+    stay_old = []
+    for j, i in enumerate(source):
+        if i is not None and j not in is_moved:
+            stay_new.append(j)
+            stay_old.append(i)
+
+    keys: list[tuple[int, int, int]] = [(k, 0, 0) for k in range(len(stay_new))]
+    for j, i in moved:
+        keys.append((bisect_left(stay_old, i) - 1, 2, i))
+        keys.append((bisect_left(stay_new, j) - 1, 1, j))
+    keys.sort()
+    rank = {key: r + 1 for r, key in enumerate(keys)}
+
+    # Fenwick tree of the items in the list at their rank
+    size = len(keys)
+    tree = [0] * (size + 1)
+
+    def add(r: int, value: int):
+        while r <= size:
+            tree[r] += value
+            r += r & -r
+
+    def count(r: int) -> int:
+        """Number of items ranked below r"""
+        total = 0
+        r -= 1
+        while r > 0:
+            total += tree[r]
+            r -= r & -r
+        return total
+
+    for k in range(len(stay_new)):
+        add(rank[(k, 0, 0)], 1)
+    for j, i in moved:
+        add(rank[(bisect_left(stay_old, i) - 1, 2, i)], 1)
+
+    ops = []
+    for j, i in moved:
+        r = rank[(bisect_left(stay_old, i) - 1, 2, i)]
+        src = count(r)
+        add(r, -1)
+        r = rank[(bisect_left(stay_new, j) - 1, 1, j)]
+        dst = count(r)
+        add(r, 1)
+        if src != dst:
+            ops.append((Op.MOVE, src, dst))
+    return ops
@@ -0,0 +1,208 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Decides when the events queued by the app are sent over the bridge.
+
+Created on Oct 18, 2026
+"""
+from math import inf
+from time import time
+from typing import Optional
+from atom.api import Atom, Float, Int, List, Value
+from .optimize import event_refs
+
+
+class FlushPolicy(Atom):
+    """Decides when queued events are sent. The first event queued is sent
+    after `first_delay` (on the next event loop iteration by default) along
+    with any events queued before then. Events are sent earlier if they were
+    queued for longer than `max_delay` or if `max_events` are queued.
+
+    Use larger values to send fewer, bigger batches (throughput) or smaller
+    values to update the screen sooner (latency). Subclasses can override
+    `check` to use other rules.
+
+    """
+
+    #: Seconds to wait before sending the first event queued. Zero sends it
+    #: on the next iteration of the event loop.
+    first_delay = Float()
+
+    #: Send the queue once the first event was queued longer than this
+    #: many seconds
+    max_delay = Float(0.005)
+
+    #: Send the queue once it has this many events. Zero has no limit.
+    max_events = Int()
+
+    def check(self, count: int, age: float) -> Optional[str]:
+        """Called each time an event is queued.
+
+        Parameters
+        ----------
+        count: int
+            Number of events in the queue
+        age: float
+            Seconds since the first event in the queue was added
+
+        Returns
+        -------
+        reason: str or None
+            Why the queue should be sent now or None to keep waiting.
+
+        """
+        if age > self.max_delay:
+            return "timeout"
+        max_events = self.max_events
+        if max_events and count >= max_events:
+            return "size"
+        return None
+
+    def schedule(self, now: float) -> float:
+        """Return the seconds to wait before sending the first event queued
+        at `now`.
+
+        """
+        return self.first_delay
+
+    def budget_left(self, now: float) -> float:
+        """Return the seconds low priority work may still run for before it
+        is postponed. See `app.idle_call`.
+
+        """
+        return inf
+
+
+class FrameFlushPolicy(FlushPolicy):
+    """Sends the queued events once per frame of the display so the native
+    side processes at most one batch per frame. Events queued within a
+    frame are sent at the start of the next one unless `now` is used or
+    `max_events` are queued.
+
+    Low priority work queued with `app.idle_call` only runs during the first
+    `budget` fraction of each frame and is postponed to the next frame
+    after that.
+
+    The frames are counted from `epoch` using the clock of the python side
+    so they have the rate but not the phase of the display refresh.
+
+    """
+
+    #: Display refresh rate in Hz. See `Activity.refresh_rate`
+    refresh_rate = Float(60)
+
+    #: Fraction of each frame low priority work may use
+    budget = Float(0.5)
+
+    #: Time the first frame started
+    epoch = Float(factory=time)
+
+    def check(self, count: int, age: float) -> Optional[str]:
+        max_events = self.max_events
+        if max_events and count >= max_events:
+            return "size"
+        return None
+
+    def schedule(self, now: float) -> float:
+        """Return the seconds until the next frame starts"""
+        period = 1 / self.refresh_rate
+        return period - (now - self.epoch) % period
+
+    def budget_left(self, now: float) -> float:
+        period = 1 / self.refresh_rate
+        return self.budget * period - (now - self.epoch) % period
+
+
+class Lane:
+    """Priorities of the queues events are sent from. Pass one as the `lane`
+    of a bridge call to use it, for example `view.setPressed(True,
+    lane=Lane.INTERACTION)`. Each lane is flushed using its own policy and
+    flushing a lane also sends the lanes with a higher priority (lower
+    number) first.
+
+    """
+
+    #: Results of callbacks the native side is waiting on
+    RESULT = 0
+
+    #: Feedback to the user such as pressed states
+    INTERACTION = 1
+
+    #: All other updates (the default)
+    NORMAL = 2
+
+    #: Work that can wait such as notifications or prefetching
+    BACKGROUND = 3
+
+
+class BridgeLane(Atom):
+    """The events queued in a lane that were not sent yet"""
+
+    #: Position in the app's lanes. See `Lane`
+    priority = Int()
+
+    #: Events to send
+    events = List()
+
+    #: Time the first event in the queue was added
+    queued_at = Float()
+
+    #: Ids of the objects used by the first `scanned` events. These are only
+    #: found once an event from a higher priority lane needs to check them.
+    refs = Value(factory=set)
+    scanned = Int()
+
+    def uses(self, refs: set[int]) -> bool:
+        """Check if any queued event uses one of the objects"""
+        events = self.events
+        n = len(events)
+        if self.scanned < n:
+            used = self.refs
+            for i in range(self.scanned, n):
+                used.update(event_refs(*events[i]))
+            self.scanned = n
+        return not self.refs.isdisjoint(refs)
+
+    def take(self) -> list:
+        """Remove and return the queued events"""
+        events = self.events
+        self.events = []
+        if self.scanned:
+            self.refs = set()
+            self.scanned = 0
+        return events
+
+
+class BridgeBatch(Atom):
+    """Holds all events sent within the context until it exits and then
+    sends them in one batch. Batches can be nested, the events are sent
+    when the outermost exits. Use `app.batched()` to create one.
+
+    Events sent with `now=True`, results, and calls that return a result
+    are sent right away along with the events held before them so the
+    result can be awaited within the batch.
+
+    """
+
+    #: The app
+    app = Value()
+
+    def __enter__(self):
+        self.app._bridge_batch_depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        app = self.app
+        app._bridge_batch_depth -= 1
+        if not app._bridge_batch_depth:
+            app._bridge_send(now=True, reason="batch")
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc):
+        self.__exit__(*exc)
@@ -0,0 +1,357 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+An in-process stand-in for the native side of the bridge. It decodes the
+batches python sends, keeps a table of the objects that would exist on the
+native side and replies to calls that expect a result. This allows rendering
+views and measuring the bridge without a device.
+
+Created on Oct 18, 2026
+"""
+import msgpack
+from typing import Any, Optional, Union
+from types import GenericAlias
+from asyncio import Future
+from atom.api import Atom, Bool, Callable, Dict, Event, Int, List, Str, Value
+from . import bridge
+from .bridge import BridgeObject, Command, ExtType
+
+#: Reply for primitive return types when no handler is registered
+DEFAULT_RESULTS: dict[Any, Any] = {
+    bool: False,
+    int: 0,
+    float: 0.0,
+    str: "",
+    bytes: b"",
+    dict: {},
+    list: [],
+    tuple: [],
+}
+
+#: Signature used when sending results back
+RESULT_SIGNATURES: dict[Any, str] = {
+    bool: "bool",
+    int: "int",
+    float: "float",
+    str: "str",
+}
+
+
+class HeadlessObject(Atom):
+    """A record of an object which would exist on the native side"""
+
+    #: Id python assigned to the object
+    __id__ = Int()
+
+    #: Native class name (or the static class for results)
+    nativeclass = Str()
+
+    #: Decoded constructor arguments
+    args = Value()
+
+    #: Last arguments passed to each method or field
+    state = Dict()
+
+    #: Number of calls and field updates made on this object
+    calls = Int()
+
+    def __repr__(self):
+        return f"<{self.nativeclass} id={self.__id__}>"
+
+
+class HeadlessRef(Atom):
+    """A reference to an object that is not in the object table"""
+
+    __id__ = Int()
+
+    def __repr__(self):
+        return f"<ref id={self.__id__}>"
+
+
+class HeadlessBridge(Atom):
+    """Decodes events the same way the Java or ObjC bridge does and
+    replies to results so the python side can run as if a device was
+    connected.
+
+    """
+
+    #: Application to send replies to.
+    app = Value()
+
+    #: Objects keyed by the __id__ python assigned to them
+    objects = Dict()
+
+    #: Handlers for methods that need a specific reply. Handlers are called
+    #: with the bridge, the target object (or class name for static methods)
+    #: and the decoded args and must return the result to send back.
+    handlers = Dict(str, Callable())
+
+    #: Record the last value of each method or field call on the object
+    record = Bool(True)
+
+    #: Send replies of a batch back in a single event batch
+    replies = List()
+
+    #: Pending results for callbacks invoked from "native"
+    results = Dict(int, Future)
+
+    #: Error messages sent by python
+    errors = List()
+
+    #: Class and method names sent with DEF events keyed by id
+    names = Dict(int, str)
+
+    #: Counters
+    batch_count = Int()
+    event_count = Int()
+    bytes_received = Int()
+
+    #: Used to generate ids for callbacks requiring a result
+    _result_count = Int()
+
+    #: Number of batches being processed. Objects released while processing a
+    #: batch may cause python to send another one before the first is done.
+    _depth = Int()
+
+    #: Fired with (obj, method, args) after each method or field call
+    called = Event()
+
+    def _default_handlers(self):
+        return {}
+
+    # -------------------------------------------------------------------------
+    # Bridge.processEvents API
+    # -------------------------------------------------------------------------
+    def process_events(self, data: bytes):
+        """Decode and process a batch of events sent from python."""
+        events = msgpack.loads(
+            data, use_list=False, raw=False, ext_hook=self.decode_ext
+        )
+        self.batch_count += 1
+        self.event_count += len(events)
+        self.bytes_received += len(data)
+        self._depth += 1
+        try:
+            for cmd, args in events:
+                handler = getattr(self, f"on_{COMMANDS[cmd]}")
+                handler(*args)
+        finally:
+            self._depth -= 1
+        if not self._depth:
+            # Only the outermost batch sends them so none are sent twice
+            self.send_replies()
+
+    def decode_ext(self, code: int, data: bytes):
+        """Decode ExtType references. These are resolved when the event is
+        handled as the object may be created within the same batch.
+
+        """
+        if code == ExtType.REF:
+            return HeadlessRef(__id__=msgpack.loads(data))
+        return msgpack.ExtType(code, data)
+
+    def decode_args(self, args: tuple) -> list:
+        """Drop the signatures and resolve any references"""
+        objects = self.objects
+        return [
+            objects.get(v.__id__, v) if isinstance(v, HeadlessRef) else v
+            for s, v in args
+        ]
+
+    def decode_name(self, name: Union[int, str]) -> str:
+        """Lookup the name if it was sent using the id from a DEF event"""
+        if isinstance(name, int):
+            return self.names[name]
+        return name
+
+    # -------------------------------------------------------------------------
+    # Command handlers
+    # -------------------------------------------------------------------------
+    def on_def(self, name_id: int, name: str):
+        self.names[name_id] = name
+
+    def on_create(self, obj_id: int, cache_id: int, nativeclass: str, *args):
+        # iOS sends the init method name before the args
+        args = args[-1] if args else ()
+        obj = HeadlessObject(
+            __id__=obj_id,
+            nativeclass=self.decode_name(nativeclass),
+            args=self.decode_args(args),
+        )
+        self.objects[obj_id] = obj
+
+    def on_proxy(self, obj_id: int, nativeclass: str, ref_id: int):
+        self.objects[obj_id] = HeadlessObject(
+            __id__=obj_id, nativeclass=self.decode_name(nativeclass), args=[ref_id]
+        )
+
+    def on_method(
+        self, obj_id: int, result_id: int, cache_id: int, method: str, args: tuple
+    ):
+        obj = self.get_object(obj_id)
+        method = self.decode_name(method)
+        values = self.decode_args(args)
+        self.record_call(obj, method, values)
+        if result_id:
+            self.reply(result_id, obj, method, values)
+
+    def on_static_method(
+        self, cls: str, result_id: int, cache_id: int, method: str, args: tuple
+    ):
+        cls = self.decode_name(cls)
+        method = self.decode_name(method)
+        values = self.decode_args(args)
+        self.called((cls, method, values))  # type: ignore
+        if result_id:
+            self.reply(result_id, cls, method, values)
+
+    def on_field(self, obj_id: int, cache_id: int, field: str, args: tuple):
+        obj = self.get_object(obj_id)
+        self.record_call(obj, self.decode_name(field), self.decode_args(args))
+
+    def on_delete(self, obj_id: int):
+        self.objects.pop(obj_id, None)
+
+    def on_bulk_delete(self, obj_ids: list[int]):
+        for obj_id in obj_ids:
+            self.objects.pop(obj_id, None)
+
+    def on_result(self, result_id: int, result: tuple):
+        f = self.results.pop(result_id, None)
+        if f is not None and not f.done():
+            sig, value = result
+            f.set_result(value)
+
+    def on_error(self, msg: Any):
+        if isinstance(msg, bytes):
+            msg = msg.decode()
+        self.errors.append(msg)
+
+    # -------------------------------------------------------------------------
+    # Object table
+    # -------------------------------------------------------------------------
+    def get_object(self, obj_id: int) -> HeadlessObject:
+        """Get the object with the given id. Objects the python side refers
+        to without creating them (such as the activity) are added on demand.
+
+        """
+        obj = self.objects.get(obj_id)
+        if obj is None:
+            ref = bridge.CACHE.get(obj_id)
+            nativeclass = getattr(ref, "__nativeclass__", "")
+            obj = self.objects[obj_id] = HeadlessObject(
+                __id__=obj_id, nativeclass=nativeclass
+            )
+        return obj
+
+    def record_call(self, obj: HeadlessObject, method: str, values: list):
+        obj.calls += 1
+        if self.record:
+            obj.state[method] = values
+        self.called((obj, method, values))  # type: ignore
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+    def reply(self, result_id: int, obj: Any, method: str, args: list):
+        """Queue the result of a call that python is waiting on. Custom
+        handlers are used first, then the default for the return type
+        of the future.
+
+        """
+        handler = self.handlers.get(method)
+        f = bridge.CACHE.get(result_id)
+        return_type = getattr(f, "__returns__", None)
+        if handler is not None:
+            result = handler(self, obj, args)
+        else:
+            result = self.default_result(result_id, return_type)
+        sig = RESULT_SIGNATURES.get(type(result), "")
+        self.replies.append(("event", (0, result_id, "set_result", [(sig, result)])))
+
+    def default_result(self, result_id: int, return_type: Any):
+        """Return a default result for the given type. Objects are added
+        to the table using the result id like the native implementation.
+
+        """
+        if return_type in DEFAULT_RESULTS:
+            return DEFAULT_RESULTS[return_type]
+        if isinstance(return_type, GenericAlias):
+            return DEFAULT_RESULTS.get(return_type.__origin__)
+        if return_type is None or return_type is object:
+            return None
+        if isinstance(return_type, type) and issubclass(return_type, BridgeObject):
+            nativeclass = return_type.__nativeclass__
+        else:
+            nativeclass = str(return_type)
+        self.objects[result_id] = HeadlessObject(
+            __id__=result_id, nativeclass=nativeclass
+        )
+        return result_id
+
+    def send_replies(self):
+        """Send all queued replies to python"""
+        replies = self.replies
+        if replies:
+            self.replies = []
+            self.app.on_events(msgpack.dumps(replies))
+
+    # -------------------------------------------------------------------------
+    # Native callback API
+    # -------------------------------------------------------------------------
+    def send_event(
+        self, ptr: int, method: str, *args, returns: bool = False
+    ) -> Optional[Future]:
+        """Invoke a callback on the python object with the given ptr as if
+        the native side triggered it.
+
+        Parameters
+        ----------
+        ptr: int
+            The __id__ of the python object
+        method: str
+            The callback name
+        args: args
+            Values to pass to the callback
+        returns: bool
+            If true a future is returned that resolves when python sends
+            the result back.
+
+        Returns
+        -------
+        result: Future or None
+            The future which resolves with the result of the callback.
+
+        """
+        result_id = 0
+        f = None
+        if returns:
+            self._result_count += 1
+            result_id = self._result_count
+            f = self.results[result_id] = Future()
+        event = (result_id, ptr, method, [("", v) for v in args])
+        self.app.on_events(msgpack.dumps([("event", event)]))
+        return f
+
+    def find(self, nativeclass: str) -> list[HeadlessObject]:
+        """Find all objects with the given nativeclass"""
+        return [o for o in self.objects.values() if o.nativeclass == nativeclass]
+
+
+#: Map of command to handler name
+COMMANDS: dict[str, str] = {
+    Command.CREATE: "create",
+    Command.PROXY: "proxy",
+    Command.METHOD: "method",
+    Command.STATIC_METHOD: "static_method",
+    Command.FIELD: "field",
+    Command.DELETE: "delete",
+    Command.BULK_DELETE: "bulk_delete",
+    Command.DEF: "def",
+    Command.RESULT: "result",
+    Command.ERROR: "error",
+}
@@ -0,0 +1,306 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Passes that reduce the number of events sent over the bridge. Each pass
+takes the list of queued `(cmd, args)` events and returns a new list. Add them
+to the app's `bridge_optimizers` to enable them.
+
+Created on Oct 18, 2026
+"""
+import msgpack
+from atom.api import Atom, Dict
+from . import bridge
+from .bridge import CALLBACK_POLICIES, COALESCE, Command, ExtType, get_handler_info
+
+
+def iter_refs(value):
+    """Yield the ids of all objects referenced in the encoded value"""
+    if isinstance(value, msgpack.ExtType):
+        if value.code == ExtType.REF:
+            yield msgpack.unpackb(value.data)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from iter_refs(v)
+
+
+def event_refs(cmd: str, args: tuple) -> set[int]:
+    """Return the ids of all objects the event uses"""
+    if cmd == Command.METHOD:
+        # The result is stored with its id so later events can refer to it
+        refs = set(iter_refs(args[-1]))
+        refs.add(args[0])
+        if args[1]:
+            refs.add(args[1])
+        return refs
+    elif cmd == Command.FIELD or cmd == Command.CREATE:
+        refs = set(iter_refs(args[-1]))
+        refs.add(args[0])
+        return refs
+    elif cmd == Command.DELETE:
+        return {args[0]}
+    elif cmd == Command.PROXY:
+        return {args[0], args[2]}
+    elif cmd == Command.BULK_DELETE:
+        return set(args[0])
+    elif cmd == Command.STATIC_METHOD:
+        refs = set(iter_refs(args[-1]))
+        if args[1]:
+            refs.add(args[1])
+        return refs
+    elif cmd == Command.RESULT:
+        return set(iter_refs(args[-1]))
+    return set()
+
+
+def is_setter(name: str, result_id: int, method_id: int, args: list) -> bool:
+    """Check if a method call only sets a value and a later call with the
+    same method replaces the value set by an earlier one.
+
+    By default setters are methods named "set..." that take a single argument
+    and do not return a result. Use the `coalesce` argument of the method to
+    override this.
+
+    """
+    if result_id:
+        return False
+    coalesce = COALESCE.get(method_id)
+    if coalesce is not None:
+        return coalesce
+    return name[:3] == "set" and len(args) == 1
+
+
+def coalesce_setters(events: list) -> list:
+    """Only keep the last call of a setter (or field update) on an object
+    when it was called multiple times in the batch.
+
+    Any other method call on the object, creating or deleting it, or passing
+    it to any call prevents earlier calls from being merged with later ones.
+    Anything that may observe the state of other objects (such as a call that
+    returns a result) does so for all objects.
+
+    """
+    dropped = set()
+    #: Index of the last setter call keyed by (obj_id, method_id, name)
+    last: dict[tuple, int] = {}
+    #: Keys in last for each object
+    pending: dict[int, list] = {}
+
+    def flush(obj_id: int):
+        for key in pending.pop(obj_id, ()):
+            del last[key]
+
+    for i, (cmd, args) in enumerate(events):
+        if cmd == Command.METHOD:
+            obj_id, result_id, method_id, name, method_args = args
+            if result_id:
+                last.clear()
+                pending.clear()
+                continue
+            # The values of objects passed to the call are used as they are
+            for ref in iter_refs(method_args):
+                flush(ref)
+            if not is_setter(name, result_id, method_id, method_args):
+                flush(obj_id)
+                continue
+        elif cmd == Command.FIELD:
+            obj_id, method_id, name, method_args = args
+            for ref in iter_refs(method_args):
+                flush(ref)
+        elif cmd == Command.CREATE:
+            for ref in iter_refs(args[-1]):
+                flush(ref)
+            flush(args[0])
+            continue
+        elif cmd == Command.PROXY or cmd == Command.DELETE:
+            flush(args[0])
+            continue
+        else:
+            last.clear()
+            pending.clear()
+            continue
+
+        key = (obj_id, method_id, name)
+        j = last.get(key)
+        if j is None:
+            pending.setdefault(obj_id, []).append(key)
+        else:
+            dropped.add(j)
+        last[key] = i
+
+    if not dropped:
+        return events
+    return [event for i, event in enumerate(events) if i not in dropped]
+
+
+def elide_temporary_objects(events: list) -> list:
+    """Drop all events of objects that are created and deleted within the
+    batch if they have no effect on anything else.
+
+    An object has no effect if it is never referenced by another event and
+    only fields or "set..." methods that do not return a result are used.
+    Calling any other method on it may have side effects (such as showing
+    a dialog) so those objects are always kept.
+
+    """
+    dropped = set()
+    #: Indices of the events of each object created in the batch
+    created: dict[int, list] = {}
+
+    for i, (cmd, args) in enumerate(events):
+        if cmd == Command.CREATE:
+            for ref in iter_refs(args[1:]):
+                created.pop(ref, None)
+            created[args[0]] = [i]
+        elif cmd == Command.DELETE:
+            indices = created.pop(args[0], None)
+            if indices is not None:
+                dropped.update(indices)
+                dropped.add(i)
+        elif cmd == Command.METHOD or cmd == Command.FIELD:
+            obj_id = args[0]
+            indices = created.get(obj_id)
+            if indices is not None:
+                if cmd == Command.FIELD or (not args[1] and args[3][:3] == "set"):
+                    indices.append(i)
+                else:
+                    del created[obj_id]
+            for ref in iter_refs(args[-1]):
+                created.pop(ref, None)
+        else:
+            if cmd == Command.PROXY:
+                created.pop(args[0], None)
+                created.pop(args[2], None)
+            for ref in iter_refs(args):
+                created.pop(ref, None)
+
+    if not dropped:
+        return events
+    return [event for i, event in enumerate(events) if i not in dropped]
+
+
+def merge_deletes(events: list) -> list:
+    """Replace the DELETE events in the batch with a single BULK_DELETE
+    event with the ids of all the deleted objects at the end of the batch.
+
+    """
+    deleted = sum(1 for cmd, args in events if cmd == Command.DELETE)
+    if deleted < 2:
+        return events
+    result = []
+    #: Ids deleted in order and as a set to check if one is reused
+    pending: list[int] = []
+    ids: set[int] = set()
+    for event in events:
+        cmd, args = event
+        if cmd == Command.DELETE:
+            pending.append(args[0])
+            ids.add(args[0])
+            continue
+        elif cmd == Command.CREATE or cmd == Command.PROXY:
+            reused = args[0] in ids
+        elif cmd == Command.METHOD or cmd == Command.STATIC_METHOD:
+            reused = args[1] in ids  # The result is stored with this id
+        else:
+            reused = False
+        if reused:
+            # The id was reused so the old object must be deleted first
+            result.append((Command.BULK_DELETE, (pending,)))
+            pending = []
+            ids = set()
+        result.append(event)
+    if pending:
+        result.append((Command.BULK_DELETE, (pending,)))
+    return result
+
+
+def coalesce_callbacks(events: list) -> list:
+    """Drop the events received from the native side that are replaced by a
+    later event of the same callback on the same object in the batch. Only
+    callbacks declared with `coalesce` or `throttle` are merged and events
+    that expect a result are always kept.
+
+    Unlike the passes above this runs on the events received, not sent.
+
+    """
+    dropped = set()
+    #: Index of the last event keyed by (ptr, method)
+    last: dict[tuple, int] = {}
+    for i, (t, event) in enumerate(events):
+        if t != "event":
+            continue
+        result_id, ptr, method, args = event
+        if result_id or method not in CALLBACK_POLICIES:
+            continue
+        if not get_handler_info(type(bridge.CACHE.get(ptr)), method).coalesce:
+            continue
+        key = (ptr, method)
+        j = last.get(key)
+        if j is not None:
+            dropped.add(j)
+        last[key] = i
+
+    if not dropped:
+        return events
+    return [event for i, event in enumerate(events) if i not in dropped]
+
+
+class NameTable(Atom):
+    """Replaces the class and method names in events with an integer id.
+    The first time a name is used a DEF event with the id and name is sent
+    before the event using it so the native side can look it up.
+
+    Unlike the passes above this must run after all other passes as they
+    need the names. Set it as the `name_table` of the app to enable it.
+
+    """
+
+    #: Id of each name that has been sent
+    ids = Dict(str, int)
+
+    def intern(self, events: list) -> list:
+        """Return the events with the names replaced by their id"""
+        ids = self.ids
+        result: list[tuple] = []
+        append = result.append
+
+        def lookup(name: str) -> int:
+            i = ids.get(name)
+            if i is None:
+                i = ids[name] = len(ids) + 1
+                append((Command.DEF, (i, name)))
+            return i
+
+        for event in events:
+            cmd, args = event
+            if cmd == Command.METHOD:
+                obj_id, result_id, method_id, name, method_args = args
+                event = (
+                    cmd,
+                    (obj_id, result_id, method_id, lookup(name), method_args),
+                )
+            elif cmd == Command.FIELD:
+                obj_id, method_id, name, field_args = args
+                event = (cmd, (obj_id, method_id, lookup(name), field_args))
+            elif cmd == Command.CREATE:
+                obj_id, ctor_id, nativeclass, *ctor_args = args
+                event = (cmd, (obj_id, ctor_id, lookup(nativeclass), *ctor_args))
+            elif cmd == Command.PROXY:
+                obj_id, nativeclass, ref_id = args
+                event = (cmd, (obj_id, lookup(nativeclass), ref_id))
+            elif cmd == Command.STATIC_METHOD:
+                nativeclass, result_id, method_id, name, method_args = args
+                nativeclass = lookup(nativeclass)
+                event = (
+                    cmd,
+                    (nativeclass, result_id, method_id, lookup(name), method_args),
+                )
+            append(event)
+        return result
+
+    def clear(self):
+        """Forget all names sent. Use this if the native side was reset."""
+        self.ids = {}
@@ -0,0 +1,268 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+from math import log
+from time import perf_counter
+from atom.api import Atom, Dict, Event, Float, Int, List
+from . import bridge
+from .bridge import Command, dumps
+
+#: Readable names of each command
+COMMAND_NAMES = {
+    Command.CREATE: "create",
+    Command.PROXY: "proxy",
+    Command.METHOD: "method",
+    Command.STATIC_METHOD: "static_method",
+    Command.FIELD: "field",
+    Command.DELETE: "delete",
+    Command.BULK_DELETE: "bulk_delete",
+    Command.RESULT: "result",
+    Command.ERROR: "error",
+}
+
+
+def describe_event(cmd: str, args: tuple, nativeclass: str = "") -> tuple[str, str]:
+    """Get the nativeclass and method name of an event sent over the bridge.
+
+    Parameters
+    ----------
+    cmd: str
+        The Command of the event
+    args: tuple
+        The args passed to send_event
+    nativeclass: str
+        The nativeclass of the object if the event does not include it
+
+    Returns
+    -------
+    result: tuple[str, str]
+        The nativeclass and method name. Either may be empty if it is
+        not known.
+
+    """
+    if cmd == Command.METHOD or cmd == Command.FIELD:
+        obj = bridge.CACHE.get(args[0])
+        name = args[3] if cmd == Command.METHOD else args[2]
+        return (obj.__nativeclass__ if obj is not None else "", name)
+    elif cmd == Command.CREATE:
+        return (args[2], "<init>")
+    elif cmd == Command.PROXY:
+        return (args[1], "<init>")
+    elif cmd == Command.STATIC_METHOD:
+        return (args[0], args[3])
+    elif cmd == Command.DELETE:
+        # Deletes are sent while the object is released so it is no longer
+        # in the cache
+        return (nativeclass, "")
+    elif cmd == Command.RESULT:
+        return (args[1][0], "")
+    return ("", "")
+
+
+class EventStats(Atom):
+    """Totals for events with the same command, nativeclass, and method"""
+
+    #: Number of events sent
+    count = Int()
+
+    #: Total size of the events when encoded
+    size = Int()
+
+    #: Total time spent encoding the events in seconds
+    time = Float()
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "bytes": self.size, "time": self.time}
+
+
+class LatencyStats(Atom):
+    """A histogram of the time it takes to get results of a bridge method.
+    Latencies are grouped into buckets that are 10% wider than the previous
+    so the percentiles are accurate within 10%.
+
+    """
+
+    #: Upper bound of the first bucket in seconds
+    MIN = 1e-5
+
+    #: Ratio of the size of each bucket to the previous
+    GROWTH = 1.1
+
+    #: Number of results received
+    count = Int()
+
+    #: Total time spent waiting for results in seconds
+    total = Float()
+
+    #: Slowest result received
+    max = Float()
+
+    #: Number of results in each bucket
+    buckets = List(int)
+
+    def record(self, latency: float):
+        """Add the latency in seconds to the histogram"""
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+        i = 0
+        if latency > self.MIN:
+            i = int(log(latency / self.MIN) / log(self.GROWTH)) + 1
+        buckets = self.buckets
+        if i >= len(buckets):
+            buckets.extend([0] * (i + 1 - len(buckets)))
+        buckets[i] += 1
+
+    def percentile(self, p: float) -> float:
+        """Return the latency in seconds that `p` percent of the results were
+        received within.
+
+        """
+        if not self.count:
+            return 0.0
+        n = self.count * p / 100
+        total = 0
+        for i, count in enumerate(self.buckets):
+            total += count
+            if total >= n:
+                return min(self.MIN * self.GROWTH**i, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class BridgeProfiler(Atom):
+    """Records the traffic sent over the bridge. Set it as the `profiler` of
+    the app to start recording.
+
+    Each event sent is encoded separately to measure its size so this
+    slows down the app and should only be used while debugging.
+
+    """
+
+    #: Stats of events sent keyed by (command, nativeclass, method)
+    events = Dict()
+
+    #: Number of batches sent of each size
+    batch_sizes = Dict()
+
+    #: Number of batches sent for each flush reason. The reasons are:
+    #: "first" when the first event was queued and sent on the next loop
+    #: iteration, "now" when an event was sent with `now=True`, "timeout"
+    #: when the events were queued for too long, "size" when the flush
+    #: policy's `max_events` were queued, "batch" when an `app.batched()`
+    #: context exits, and "force" for `force_update`.
+    flushes = Dict()
+
+    #: Number of batches sent
+    batches = Int()
+
+    #: Total size of the batches sent
+    batch_bytes = Int()
+
+    #: Total time spent encoding batches in seconds
+    batch_time = Float()
+
+    #: Time to get results of bridge methods keyed by "nativeclass.method"
+    latencies = Dict()
+
+    #: Results that take longer than this many seconds trigger `slow_call`
+    slow_call_threshold = Float(0.1)
+
+    #: Triggered with a tuple of the method name and latency in seconds when
+    #: a result took longer than the `slow_call_threshold`
+    slow_call = Event(tuple)
+
+    def record_event(self, cmd: str, args: tuple, nativeclass: str = ""):
+        """Record an event that was added to the bridge queue"""
+        start = perf_counter()
+        size = len(dumps((cmd, args)))
+        dt = perf_counter() - start
+        key = (cmd, *describe_event(cmd, args, nativeclass))
+        stats = self.events.get(key)
+        if stats is None:
+            stats = self.events[key] = EventStats()
+        stats.count += 1
+        stats.size += size
+        stats.time += dt
+
+    def record_batch(self, count: int, size: int, dt: float, reason: str):
+        """Record a batch of events sent over the bridge"""
+        self.batches += 1
+        self.batch_bytes += size
+        self.batch_time += dt
+        self.batch_sizes[count] = self.batch_sizes.get(count, 0) + 1
+        self.flushes[reason] = self.flushes.get(reason, 0) + 1
+
+    def record_latency(self, method: str, latency: float):
+        """Record the time it took to get a result from the bridge"""
+        stats = self.latencies.get(method)
+        if stats is None:
+            stats = self.latencies[method] = LatencyStats()
+        stats.record(latency)
+        if latency > self.slow_call_threshold:
+            self.slow_call((method, latency))  # type: ignore
+
+    def reset(self):
+        """Clear all recorded stats"""
+        self.events = {}
+        self.batch_sizes = {}
+        self.flushes = {}
+        self.batches = 0
+        self.batch_bytes = 0
+        self.batch_time = 0
+        self.latencies = {}
+
+    def top(self, n: int = 10, key: str = "size") -> list[tuple[tuple, EventStats]]:
+        """Return the `n` event types with the largest value of `key`. This
+        can be "count", "size", or "time".
+
+        """
+        items = sorted(
+            self.events.items(), key=lambda it: getattr(it[1], key), reverse=True
+        )
+        return items[:n]
+
+    def dump(self) -> dict:
+        """Return all recorded stats in a json serializable format"""
+        return {
+            "events": [
+                {
+                    "command": COMMAND_NAMES.get(cmd, cmd),
+                    "nativeclass": nativeclass,
+                    "method": method,
+                    **stats.as_dict(),
+                }
+                for (cmd, nativeclass, method), stats in self.top(len(self.events))
+            ],
+            "batches": {
+                "count": self.batches,
+                "bytes": self.batch_bytes,
+                "time": self.batch_time,
+                "sizes": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+                "flushes": dict(self.flushes),
+            },
+            "latencies": {
+                method: stats.as_dict()
+                for method, stats in sorted(self.latencies.items())
+            },
+        }
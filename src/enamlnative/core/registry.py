@@ -0,0 +1,180 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+from typing import Any, Iterator
+from weakref import KeyedRef, WeakValueDictionary
+
+#: Number of low bits of an id used for the generation of the slot
+GEN_BITS = 10
+GEN_MASK = (1 << GEN_BITS) - 1
+
+
+class SlotMap:
+    """A table of weak references to the objects passed over the bridge.
+
+    Ids are the index of the slot in the table and a generation counter
+    which is incremented each time the slot is freed. This allows the slots
+    of objects that were released to be reused without the new object
+    getting the same id, so a late reference to the old object is not
+    resolved to the new one.
+
+    Ids which were not allocated by the table (such as the -1 of the
+    activity) are kept in a separate dict.
+
+    """
+
+    __slots__ = (
+        "_refs",
+        "_gens",
+        "_free",
+        "_other",
+        "_callback",
+        "_check_other",
+        "live",
+        "peak",
+        "stale",
+    )
+
+    def __init__(self):
+        #: Slot 0 is never used so all ids are positive
+        self._refs: list[Any] = [None]
+        self._gens: list[int] = [0]
+        self._free: list[int] = []
+        self._other: WeakValueDictionary[int, Any] = WeakValueDictionary()
+
+        #: Number of objects in the slots
+        self.live = 0
+
+        #: Largest number of objects that were in the slots at once
+        self.peak = 0
+
+        #: Number of lookups with an id of a slot that was already reused
+        self.stale = 0
+
+        #: Bound once as it's passed to every weakref
+        self._callback = self._remove
+
+        #: Set once a positive id was added to the other dict
+        self._check_other = False
+
+    def allocate(self) -> int:
+        """Return a new id. The id is not reused until an object stored with
+        it is released.
+
+        """
+        free = self._free
+        if free:
+            index = free.pop()
+        else:
+            index = len(self._refs)
+            self._refs.append(None)
+            self._gens.append(0)
+        gens = self._gens
+        key = (index << GEN_BITS) | gens[index]
+        if self._check_other:
+            # Skip ids used by objects added before the table was used
+            other = self._other
+            while key in other:
+                gens[index] = (gens[index] + 1) & GEN_MASK
+                key = (index << GEN_BITS) | gens[index]
+        return key
+
+    def __setitem__(self, key: int, obj: Any):
+        index = key >> GEN_BITS
+        if key > 0 and index < len(self._gens) and self._gens[index] == key & GEN_MASK:
+            refs = self._refs
+            if refs[index] is None:
+                live = self.live = self.live + 1
+                if live > self.peak:
+                    self.peak = live
+            refs[index] = KeyedRef(obj, self._callback, key)
+        else:
+            if key > 0:
+                self._check_other = True
+            self._other[key] = obj
+
+    def get(self, key: int, default: Any = None) -> Any:
+        try:
+            wr = self._refs[key >> GEN_BITS]
+            if wr.key == key:
+                obj = wr()
+                if obj is not None:
+                    return obj
+        except (IndexError, AttributeError):
+            pass  # Out of range or an empty slot
+        if key > 0:
+            index = key >> GEN_BITS
+            if index < len(self._gens) and self._gens[index] != key & GEN_MASK:
+                self.stale += 1
+        return self._other.get(key, default)
+
+    def __getitem__(self, key: int) -> Any:
+        obj = self.get(key)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def __contains__(self, key: int) -> bool:
+        return self.get(key) is not None
+
+    def __delitem__(self, key: int):
+        index = key >> GEN_BITS
+        if key > 0 and index < len(self._refs):
+            wr = self._refs[index]
+            if wr is not None and wr.key == key:
+                self._remove(wr)
+                return
+        del self._other[key]
+
+    def _remove(self, wr: KeyedRef):
+        """Free the slot of the released object"""
+        index = wr.key >> GEN_BITS
+        refs = self._refs
+        # The slot may have been reassigned before the callback runs
+        if refs[index] is wr:
+            refs[index] = None
+            gens = self._gens
+            gens[index] = (gens[index] + 1) & GEN_MASK
+            self._free.append(index)
+            self.live -= 1
+
+    def __len__(self) -> int:
+        return self.live + len(self._other)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.keys())
+
+    def items(self) -> list[tuple[int, Any]]:
+        items = []
+        for wr in self._refs:
+            if wr is not None:
+                obj = wr()
+                if obj is not None:
+                    items.append((wr.key, obj))
+        items.extend(self._other.items())
+        return items
+
+    def keys(self) -> list[int]:
+        return [k for k, obj in self.items()]
+
+    def values(self) -> list[Any]:
+        return [obj for k, obj in self.items()]
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of live objects of each class"""
+        counts: dict[str, int] = {}
+        for k, obj in self.items():
+            name = type(obj).__name__
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    @property
+    def capacity(self) -> int:
+        """Number of slots in the table"""
+        return len(self._refs) - 1
@@ -24,4 +24,5 @@ def log(msg):
 def publish(data):
     from enamlnative.core.dev import DevServerSession
 
-    DevServerSession.instance().write_message(data, True)
+    #: The data may be a memoryview that is only valid during this call
+    DevServerSession.instance().write_message(bytes(data), True)
@@ -0,0 +1,117 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Records what the event loop and bridge are doing in the Chrome Trace Event
+format so it can be viewed in chrome://tracing or https://ui.perfetto.dev
+
+Created on Oct 18, 2026
+"""
+import os
+import json
+import functools
+from inspect import iscoroutinefunction
+from collections import deque
+from threading import get_ident
+from time import perf_counter
+from typing import Callable, Optional
+from atom.api import Atom, Int, Typed
+
+
+class Tracer(Atom):
+    """Records spans of time in a ring buffer. Once full the oldest spans are
+    dropped.
+
+    """
+
+    #: Max number of spans to keep
+    maxlen = Int(100000)
+
+    #: Recorded spans of (name, category, start, end, thread id, args)
+    spans = Typed(deque, optional=False)
+
+    #: Process id used in the trace
+    pid = Int()
+
+    def _default_spans(self):
+        return deque(maxlen=self.maxlen)
+
+    def _default_pid(self):
+        return os.getpid()
+
+    def record(self, name: str, cat: str, start: float, args: Optional[dict] = None):
+        """Record a span that started at `start` and ended now.
+
+        Parameters
+        ----------
+        name: str
+            The name of the span
+        cat: str
+            The category of the span
+        start: float
+            The start time from `perf_counter`
+        args: dict
+            Any additional info to include with the span
+
+        """
+        self.spans.append((name, cat, start, perf_counter(), get_ident(), args))
+
+    def wrap(self, callback: Callable, cat: str = "loop") -> Callable:
+        """Wrap the callback so a span is recorded each time it's called.
+        The span of a coroutine function lasts until its coroutine is done.
+
+        """
+        name = getattr(callback, "__qualname__", None) or repr(callback)
+
+        if iscoroutinefunction(callback):
+
+            @functools.wraps(callback)
+            async def traced_async(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await callback(*args, **kwargs)
+                finally:
+                    self.record(name, cat, start)
+
+            return traced_async
+
+        @functools.wraps(callback)
+        def traced(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                self.record(name, cat, start)
+
+        return traced
+
+    def clear(self):
+        """Remove all recorded spans"""
+        self.spans.clear()
+
+    def dump(self) -> dict:
+        """Return the spans in the Chrome Trace Event format"""
+        pid = self.pid
+        events = []
+        for name, cat, start, end, tid, args in self.spans:
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str):
+        """Save the trace to a json file"""
+        with open(path, "w") as f:
+            json.dump(self.dump(), f)
@@ -49,6 +49,8 @@ class ENBridge(ObjcBridgeObject):
         by calling the processEvents method via ctypes."""
         objc = self.objc
         bridge = self.bridge
+        #: The data may be a memoryview which ctypes can't pass as a c_char_p
+        data = bytes(data)
         #: This must come after the above as it changes the arguments!
         objc.objc_msgSend.argtypes = [
             ctypes.c_void_p,
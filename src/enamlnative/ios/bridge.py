@@ -14,7 +14,7 @@ from enamlnative.core.bridge import (
     BridgeMethod,
     BridgeObject,
     Command,
-    CACHE,
+    cache_object,
     msgpack_encoder,
 )
 
@@ -142,7 +142,7 @@ class ObjcBridgeObject(BridgeObject):
             super(Atom, self).__init__()
 
         #: Send the event over the bridge to construct the view
-        CACHE[self.__id__] = self
+        cache_object(self)
         if __id__ is None:
             self.__app__.send_event(
                 Command.CREATE,  #: method
@@ -9,6 +9,7 @@ Created on Aug 3, 2017
 """
 
 from atom.api import Tuple, Typed, observe
+from enamlnative.core.declared import get_declared_items
 from enamlnative.widgets.view import ProxyView
 from .bridge import ObjcBridgeObject, ObjcCallback, ObjcMethod, ObjcProperty
 from .uikit_toolkit_object import UiKitToolkitObject
@@ -132,10 +133,20 @@ class UiKitView(UiKitToolkitObject, ProxyView):
         # Initialize the widget by updating only the members that
         # have read expressions declared. This saves a lot of time and
         # simplifies widget initialization code
-        for k, v in self.get_declared_items():
-            handler = getattr(self, "set_" + k, None)
-            if handler:
-                handler(v)
+        if type(self).get_declared_items is not UiKitView.get_declared_items:
+            for k, v in self.get_declared_items():
+                handler = getattr(self, "set_" + k, None)
+                if handler:
+                    handler(v)
+            return
+
+        d = self.declaration
+        engine = d._d_engine
+        if engine:
+            items = get_declared_items(type(self), engine)
+            for k, handler in zip(items.keys, items.handlers):
+                if handler:
+                    handler(self, getattr(d, k))
 
     def get_declared_items(self):
         """Get the members that were set in the enamldef block for this
@@ -151,12 +162,8 @@ class UiKitView(UiKitToolkitObject, ProxyView):
         d = self.declaration
         engine = d._d_engine
         if engine:
-            for k, h in engine._handlers.items():
-                # Handlers with read operations
-                if not h.read_pair:
-                    continue
-                v = getattr(d, k)
-                yield (k, v)
+            for k in get_declared_items(type(self), engine).keys:
+                yield (k, getattr(d, k))
 
     def init_layout(self):
         """Initialize the layout of the toolkit widget.
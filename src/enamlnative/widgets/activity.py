@@ -52,6 +52,9 @@ class Activity(ToolkitObject):
     #: Screen orientation
     orientation = Enum("portrait", "landscape", "square")
 
+    #: Refresh rate of the display in Hz
+    refresh_rate = Float(60)
+
     #: Build info from
     #: https://developer.android.com/reference/android/os/Build.VERSION.html
     build_info = Dict()
@@ -64,6 +67,7 @@ class Activity(ToolkitObject):
         """Start the activity."""
         if not self.is_initialized:
             self.initialize()
+        self.app.reset_bridge()
         await self.proxy.start()
         if not self.proxy_is_active:
             super().activate_proxy()
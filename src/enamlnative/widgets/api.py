@@ -42,7 +42,7 @@ from .image_view import ImageView
 
 #: Layouts
 from .linear_layout import LinearLayout
-from .list_view import ListItem, ListView
+from .list_view import ListItem, ListSource, ListView, SequenceSource
 from .notification import Notification
 from .picker import Picker
 from .popup_window import PopupWindow
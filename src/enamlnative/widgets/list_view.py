@@ -7,12 +7,224 @@ The full license is in the file LICENSE, distributed with this software.
 
 Created on May 20, 2017
 """
-from atom.api import Bool, ContainerList, Enum, ForwardTyped, Int, Typed, Value
+from asyncio import Future, ensure_future
+from collections import OrderedDict
+from functools import partial
+from inspect import isawaitable
+from typing import Any, Optional
+from atom.api import (
+    Atom,
+    Bool,
+    Callable,
+    ContainerList,
+    Dict,
+    Enum,
+    Event,
+    ForwardTyped,
+    Instance,
+    Int,
+    Typed,
+    Value,
+)
+from atom.api import observe as atom_observe
 from enaml.core.declarative import d_, observe
 from enaml.widgets.toolkit_object import ProxyToolkitObject, ToolkitObject
 from .view_group import ProxyViewGroup, ViewGroup
 
 
+class ListSource(Atom):
+    """Provides the items of a ListView on demand instead of a list so
+    only the pages of items around the visible rows are in memory.
+
+    Items are loaded a page at a time by `load_page`, which by default calls
+    the `loader`. Pages that are loaded asynchronously show `None` until
+    they arrive. The least recently used pages are released once more than
+    `max_pages` are loaded.
+
+        async def load(page, page_size):
+            return await api.fetch_feed(offset=page * page_size, limit=page_size)
+
+        ListView:
+            source = ListSource(loader=load, count=100000)
+
+    """
+
+    #: Number of items. Set it when it changes, only the pages that are no
+    #: longer complete are loaded again. Change the `page_size` or call
+    #: `clear` to reload all the items.
+    count = Int()
+
+    #: Number of items in each page
+    page_size = Int(50)
+
+    #: Number of pages kept loaded. This must be more than the pages of the
+    #: visible rows and the prefetch window.
+    max_pages = Int(16)
+
+    #: Number of pages before and after the visible positions to load ahead
+    prefetch_pages = Int(1)
+
+    #: Called with the page number and page size. It returns the items of
+    #: the page or an awaitable resolving to them.
+    loader = Callable()
+
+    #: Fired with the (start, stop) positions of the items of a page that
+    #: was loaded asynchronously
+    loaded = Event(tuple)
+
+    #: Fired with the page number and the exception if loading a page
+    #: failed. The page is loaded again the next time it is used.
+    failed = Event(tuple)
+
+    #: Loaded pages in the order they were last used
+    _pages = Typed(OrderedDict, ())
+
+    #: Pages being loaded asynchronously
+    _loading = Dict()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def load_page(self, page: int) -> Any:
+        """Load the items of a page. Subclasses can override this instead of
+        setting the `loader`.
+
+        Parameters
+        ----------
+        page: int
+            Index of the page
+
+        Returns
+        -------
+        items: list or Awaitable[list]
+            The items of the page or an awaitable that resolves to them.
+
+        """
+        if self.loader is None:
+            raise NotImplementedError
+        return self.loader(page, self.page_size)
+
+    def get(self, position: int) -> Optional[Any]:
+        """Return the item at the position or None if it is not loaded yet.
+        The page of the item is loaded if needed.
+
+        """
+        page, offset = divmod(position, self.page_size)
+        pages = self._pages
+        items = pages.get(page)
+        if items is None:
+            items = self.request(page)
+            if items is None:
+                return None
+        else:
+            pages.move_to_end(page)
+        return items[offset] if offset < len(items) else None
+
+    def prefetch(self, position: int):
+        """Load the pages within `prefetch_pages` of the position and mark
+        the loaded ones as recently used.
+
+        """
+        page = position // self.page_size
+        n = self.prefetch_pages
+        pages = self._pages
+        for p in range(page - n, page + n + 1):
+            if p in pages:
+                pages.move_to_end(p)
+            else:
+                self.request(p)
+
+    def request(self, page: int) -> Optional[list]:
+        """Start loading the page if it exists and is not loaded or loading.
+        Returns the items if they were loaded immediately.
+
+        """
+        if page < 0 or page * self.page_size >= self.count or page in self._loading:
+            return None
+        result = self.load_page(page)
+        if isawaitable(result):
+            task = self._loading[page] = ensure_future(result)
+            task.add_done_callback(partial(self._on_page_loaded, page))
+            return None
+        return self._store(page, result)
+
+    def clear(self):
+        """Release all loaded pages and cancel the pages being loaded"""
+        self._pages.clear()
+        loading = self._loading
+        self._loading = {}
+        for task in loading.values():
+            task.cancel()
+
+    def invalidate(self, position: int):
+        """Release the loaded pages with items at or after the position and
+        cancel loading them. Pages before it are kept.
+
+        """
+        first = position // self.page_size
+        pages = self._pages
+        for page in [p for p in pages if p >= first]:
+            del pages[page]
+        loading = self._loading
+        for page in [p for p in loading if p >= first]:
+            loading.pop(page).cancel()
+
+    def _store(self, page: int, items) -> list:
+        """Add the page to the cache and evict the least recently used"""
+        pages = self._pages
+        items = pages[page] = list(items)
+        pages.move_to_end(page)
+        while len(pages) > self.max_pages:
+            pages.popitem(last=False)
+        return items
+
+    def _on_page_loaded(self, page: int, task: Future):
+        if self._loading.get(page) is not task:
+            return
+        del self._loading[page]
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            print(f"Failed to load page {page}: {exc}")
+            self.failed((page, exc))  # type: ignore
+            return
+        items = self._store(page, task.result())
+        start = page * self.page_size
+        self.loaded((start, start + len(items)))  # type: ignore
+
+    @atom_observe("count", "page_size")
+    def _on_size_changed(self, change):
+        if change["type"] != "update":
+            return
+        if change["name"] == "page_size":
+            self.clear()
+        else:
+            # Only pages that were complete before and after are still valid
+            self.invalidate(min(change["oldvalue"], change["value"]))
+
+
+class SequenceSource(ListSource):
+    """A ListSource for an object with a length that can be indexed, such
+    as a lazy sequence backed by a database. The count is read from it when
+    it is set.
+
+    """
+
+    #: The sequence of items
+    sequence = Value()
+
+    def _observe_sequence(self, change):
+        self.clear()
+        self.count = len(self.sequence)
+
+    def load_page(self, page: int) -> list:
+        seq = self.sequence
+        start = page * self.page_size
+        stop = min(start + self.page_size, len(seq))
+        return [seq[i] for i in range(start, stop)]
+
+
 class ProxyListView(ProxyViewGroup):
     """The abstract definition of a proxy ListView object."""
 
@@ -22,6 +234,12 @@ class ProxyListView(ProxyViewGroup):
     def set_items(self, items: list):
         raise NotImplementedError
 
+    def set_item_key(self, item_key):
+        raise NotImplementedError
+
+    def set_source(self, source: Optional[ListSource]):
+        raise NotImplementedError
+
     def set_span_count(self, count: int):
         raise NotImplementedError
 
@@ -55,6 +273,16 @@ class ListView(ViewGroup):
     #: List of items to display
     items = d_(ContainerList())
 
+    #: Function that returns a key identifying each item. When the items
+    #: change only the rows of items with a key that was added, removed,
+    #: moved, or whose item changed are updated. By default hashable items
+    #: are their own key and compared by value and others by identity.
+    item_key = d_(Callable())
+
+    #: Loads the items on demand instead of the `items`. Use this for lists
+    #: too large to keep in memory or loaded from a paged API.
+    source = d_(Instance(ListSource))
+
     #: use this setting to improve performance if you know that changes
     #: in content do not change the layout size of the RecyclerView
     fixed_size = d_(Bool())
@@ -74,7 +302,15 @@ class ListView(ViewGroup):
     # -------------------------------------------------------------------------
     # Observers
     # -------------------------------------------------------------------------
-    @observe("items", "arrangement", "orientation", "span_count", "fixed_size")
+    @observe(
+        "items",
+        "item_key",
+        "source",
+        "arrangement",
+        "orientation",
+        "span_count",
+        "fixed_size",
+    )
     def _update_proxy(self, change):
 
         super()._update_proxy(change)
@@ -1,7 +1,69 @@
+import os
 import sys
+import pytest
 
 if "src" not in sys.path:
     sys.path.append("src")
 
 if "." not in sys.path:
     sys.path.append(".")
+
+
+#: Results the benchmarks are compared with by default
+BENCH_BASELINE = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks", "Offline bridge benchmarks")
+    group.addoption(
+        "--bench",
+        action="store_true",
+        help="Run the benchmarks, they are skipped by default",
+    )
+    group.addoption(
+        "--bench-json",
+        default=None,
+        help="Save the benchmark results to the given json file",
+    )
+    group.addoption(
+        "--bench-baseline",
+        default=BENCH_BASELINE,
+        help="Compare the benchmark results to a previously saved json file "
+        "or 'none' to skip the comparison (default tests/bench_baseline.json)",
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed fractional regression compared to the baseline "
+        "unless overridden by the baseline entry (default 0.25)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks unless they were asked for"""
+    if (
+        config.getoption("--bench")
+        or config.getoption("--bench-json")
+        or config.getoption("--bench-baseline") != BENCH_BASELINE
+    ):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --bench")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def headless_app():
+    """Yields the headless app class. The app must be created within the
+    test so it uses the test's event loop.
+
+    """
+    import nativehooks
+    from enaml.application import Application
+    from enamlnative.android.headless import HeadlessAndroidApplication
+
+    yield HeadlessAndroidApplication
+    nativehooks.messages = []
+    Application._instance = None  # Clear after every run
@@ -0,0 +1,258 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Offline benchmarks of the bridge hot paths. These run against the headless
+bridge so no device is needed.
+
+They only run with `--bench`. Results are compared with the baseline in
+tests/bench_baseline.json or the one given with `--bench-baseline`, and a
+benchmark fails if it regresses by more than `--bench-tolerance` (or the
+"tolerance" set on the baseline entry). Save results with
+`--bench-json=results.json` to make a new baseline.
+
+Created on Oct 18, 2026
+"""
+import gc
+import sys
+import json
+import time
+import platform
+import enaml
+import msgpack
+import pytest
+import enamlnative
+from glob import glob
+from pydoc import locate, ErrorDuringImport
+from atom.api import Int
+from enaml.application import Application
+from utils import render
+from enamlnative.android.bridge import encode_args
+from enamlnative.android.headless import HeadlessAndroidApplication
+
+pytestmark = pytest.mark.benchmark
+
+
+class BenchmarkResults:
+    """Collects results and compares them with the baseline"""
+
+    def __init__(self, baseline: dict, tolerance: float):
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.results: dict[str, dict] = {}
+
+    def record(self, name: str, value: float, unit: str, higher_is_better=True):
+        """Save the result and fail if it regressed from the baseline"""
+        self.results[name] = {
+            "value": value,
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+        expected = self.baseline.get(name)
+        if not expected:
+            return
+        tolerance = expected.get("tolerance", self.tolerance)
+        ref = expected["value"]
+        if higher_is_better:
+            limit = ref * (1 - tolerance)
+            assert value >= limit, f"{name} regressed: {value} {unit} < {limit}"
+        else:
+            limit = ref * (1 + tolerance)
+            assert value <= limit, f"{name} regressed: {value} {unit} > {limit}"
+
+    def dump(self) -> dict:
+        return {
+            "version": enamlnative.version,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "benchmarks": self.results,
+        }
+
+
+@pytest.fixture(scope="session")
+def bench(request):
+    config = request.config
+    baseline = {}
+    path = config.getoption("--bench-baseline")
+    if path and path != "none":
+        with open(path) as f:
+            baseline = json.load(f)["benchmarks"]
+    results = BenchmarkResults(baseline, config.getoption("--bench-tolerance"))
+    yield results
+    path = config.getoption("--bench-json")
+    if path:
+        with open(path, "w") as f:
+            json.dump(results.dump(), f, indent=2)
+
+
+class BenchmarkApp(HeadlessAndroidApplication):
+    """Counts what is sent without decoding it"""
+
+    batches = Int()
+    bytes_sent = Int()
+
+    def dispatch_events(self, data):
+        self.batches += 1
+        self.bytes_sent += len(data)
+
+
+@pytest.fixture
+def app():
+    app = BenchmarkApp()
+    yield app
+    Application._instance = None
+
+
+def best_rate(fn, number: int, repeat: int = 5) -> float:
+    """Return the best rate in calls per second of `fn` over `repeat` runs of
+    `number` calls.
+
+    """
+    best = float("inf")
+    for i in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for j in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def get_views():
+    from enamlnative.android.android_view import View
+    from enamlnative.android.android_text_view import TextView
+
+    return View, TextView
+
+
+def test_bench_object_create(app, bench):
+    View, TextView = get_views()
+    views = []
+
+    def create():
+        views.append(View(app))
+
+    bench.record("bridge_object_create", best_rate(create, 2000), "obj/s")
+    n = len(views)
+
+    def delete():
+        views.pop()
+
+    bench.record("bridge_object_delete", best_rate(delete, n // 5), "obj/s")
+
+
+def test_bench_method_call(app, bench):
+    View, TextView = get_views()
+    view = TextView(app)
+    bench.record(
+        "bridge_method_call",
+        best_rate(lambda: view.setAlpha(0.5), 5000),
+        "calls/s",
+    )
+    bench.record(
+        "bridge_method_call_args",
+        best_rate(lambda: view.setPadding(1, 2, 3, 4), 5000),
+        "calls/s",
+    )
+    bench.record(
+        "bridge_method_call_object",
+        best_rate(lambda: view.setTag(view), 5000),
+        "calls/s",
+    )
+    method = View.setPadding
+    args = (1, 2, 3, 4)
+    bench.record(
+        "encode_args",
+        best_rate(lambda: encode_args(method, args), 10000),
+        "calls/s",
+    )
+
+
+def test_bench_bridge_send(app, bench):
+    View, TextView = get_views()
+    app.force_update()
+
+    # Capture the queued events to resend them
+    events = []
+    app.bridge_optimizers = [lambda queue: events.extend(queue) or queue]
+    views = [TextView(app) for i in range(100)]
+    for i, view in enumerate(views):
+        view.setTextKeepState(f"Item {i}")
+        view.setAlpha(0.5)
+        view.setPadding(1, 2, 3, 4)
+        view.setTag(views[0])
+    app.bytes_sent = 0
+    app.force_update()
+    app.bridge_optimizers = []
+    n = len(events)
+    size = app.bytes_sent
+
+    def send():
+        send_event = app.send_event
+        for name, args in events:
+            send_event(name, *args)
+        app._bridge_send()
+
+    bench.record("bridge_send", best_rate(send, 50) * n, "events/s")
+    bench.record("bridge_send_bytes", size / n, "B/event", False)
+
+
+async def test_bench_process_events(app, bench):
+    View, TextView = get_views()
+    view = View(app)
+    clicks = []
+    view.onClick.connect(clicks.append)
+    n = 1000
+    data = msgpack.dumps(
+        [("event", (0, view.__id__, "onClick", [("", view.__id__)]))] * n
+    )
+    start = time.perf_counter()
+    await app.process_events(data)
+    dt = time.perf_counter() - start
+    assert len(clicks) == n
+    bench.record("process_events", n / dt, "events/s")
+
+    # Callbacks that return a value also send the result back
+    data = msgpack.dumps(
+        [("event", (i + 1, view.__id__, "hashCode", [])) for i in range(n)]
+    )
+    start = time.perf_counter()
+    await app.process_events(data)
+    dt = time.perf_counter() - start
+    app.force_update()
+    bench.record("process_events_result", n / dt, "events/s")
+
+
+# Objects from the previous run may be released after the app is cleared
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+@pytest.mark.parametrize("path", sorted(glob("examples/*.enaml")))
+async def test_bench_activate(path, bench):
+    example = path[:-6].replace("/", ".")
+    if "thermostat" in example:
+        return pytest.skip("thermostat example needs updated")
+
+    best = float("inf")
+    for i in range(3):
+        app = HeadlessAndroidApplication()
+        app.native.record = False
+        try:
+            # Examples may lookup the app instance on import
+            with enaml.imports():
+                try:
+                    ContentView = locate(f"{example}.ContentView")
+                except ErrorDuringImport as e:
+                    return pytest.skip(f"{e}")
+            start = time.perf_counter()
+            assert await render(app, ContentView)
+            best = min(best, time.perf_counter() - start)
+            native = app.native
+        finally:
+            Application._instance = None
+
+    name = example.split(".")[-1]
+    bench.record(f"activate[{name}]", best * 1000, "ms", False)
+    bench.record(f"activate_events[{name}]", native.event_count, "events", False)
+    bench.record(f"activate_bytes[{name}]", native.bytes_received, "B", False)
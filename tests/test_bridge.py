@@ -0,0 +1,349 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import gc
+import asyncio
+import weakref
+import msgpack
+import pytest
+from atom.api import List
+from enaml.application import Application
+from enamlnative.core.bridge import Command, ExtType, encode
+from enamlnative.android.headless import HeadlessAndroidApplication
+
+
+class DispatchApp(HeadlessAndroidApplication):
+    batches = List()
+
+    def dispatch_events(self, data):
+        assert isinstance(data, memoryview)
+        self.batches.append(msgpack.loads(data))
+        if len(self.batches) == 1:
+            # Events sent while dispatching go in the next batch
+            self.send_event(Command.ERROR, "Next")
+            self.force_update()
+
+
+@pytest.fixture
+def app():
+    app = DispatchApp()
+    yield app
+    Application._instance = None
+
+
+def test_encode_ref(app):
+    from enamlnative.android.android_view import View
+
+    view = View(app)
+    ref = encode(view)
+    assert ref is encode(view)
+    assert ref == msgpack.ExtType(ExtType.REF, msgpack.packb(view.__id__))
+    assert encode(1) == 1
+
+
+def test_dispatch_memoryview(app):
+    app.send_event(Command.ERROR, "First")
+    app.force_update()
+    app.send_event(Command.ERROR, "Last")
+    app.force_update()
+    assert app.batches == [[["e", ["First"]]], [["e", ["Next"]]], [["e", ["Last"]]]]
+
+
+def test_compiled_packers(app):
+    from enamlnative.android.android_view import View
+    from enamlnative.android.bridge import JavaBridgeObject, JavaMethod, encode_args
+
+    class Dummy(JavaBridgeObject):
+        __nativeclass__ = "com.example.Dummy"
+        noArgs = JavaMethod()
+        setViews = JavaMethod(View, "android.view.View...")
+        setPadding = JavaMethod(int, int, int, int)
+
+    view = View(app)
+    cases = [
+        (Dummy.noArgs, ()),
+        (Dummy.setViews, (view,)),
+        (Dummy.setViews, (view, view)),
+        (Dummy.setPadding, (1, 2, 3, 4)),
+    ]
+    for method, args in cases:
+        assert method.__packer__ is not None
+        assert method.__packer__(args, {}) == encode_args(method, args)
+    with pytest.raises(ValueError):
+        Dummy.setViews.__packer__((view, view, view), {})
+
+
+def test_bound_methods(app):
+    from enamlnative.android.android_view import View
+
+    view = View(app)
+    with view.setVisibility.suppressed():
+        assert view.__suppressed__["setVisibility"]
+        view.setVisibility(1)
+    assert not view.__suppressed__["setVisibility"]
+
+    clicks = []
+    view.onClick.connect(lambda: clicks.append(True))
+    view.onClick()
+    view.onClick.disconnect()
+    view.onClick()
+    assert clicks == [True]
+
+
+async def test_future_timeout(app):
+    from enamlnative.android.bridge import JavaBridgeObject, JavaMethod
+
+    class Service(JavaBridgeObject):
+        __nativeclass__ = "com.example.Service"
+        getValue = JavaMethod(returns=int)
+        getSlowValue = JavaMethod(returns=int, timeout=0.01)
+
+    # Results are never received as the app does not forward the events
+    service = Service()
+    with pytest.raises(asyncio.TimeoutError):
+        await service.getSlowValue()
+    with pytest.raises(asyncio.TimeoutError):
+        await service.getValue(timeout=0.01)
+    profiler = app.start_profiling()
+    errors = []
+    app.observe("error_occurred", lambda change: errors.append(change["value"]))
+    app.bridge_timeout = 0.01
+    f = service.getValue()
+    with pytest.raises(asyncio.TimeoutError):
+        await f
+    assert not Service.getValue.__cache__
+    assert not profiler.latencies  # A timeout is not a slow result
+    f.set_result(1)  # A late result is ignored
+
+    # The native side deletes results that expired or were cancelled
+    assert f.__app__ is app
+    app.force_update()
+    deleted = [args[0] for batch in app.batches for cmd, args in batch if cmd == "d"]
+    assert f.__id__ in deleted
+
+    # A late result from the native side is dropped once the future is freed
+    def result(f):
+        return msgpack.dumps([("event", (0, f.__id__, "set_result", [("int", 1)]))])
+
+    late = result(f)
+    del f
+    await app.process_events(late)
+    assert not errors
+
+    app.bridge_timeout = 0
+    f = service.getValue()
+    f.cancel()
+    await asyncio.sleep(0)
+    assert not Service.getValue.__cache__
+    app.force_update()
+    assert ["d", [f.__id__]] in app.batches[-1]
+    late = result(f)
+    del f
+    await app.process_events(late)
+    assert not errors
+
+    # Unknown results are still reported
+    await app.process_events(late)
+    assert len(errors) == 1
+
+
+def test_sweep_futures(app):
+    from enamlnative.android.bridge import JavaBridgeObject, JavaMethod
+
+    class Service(JavaBridgeObject):
+        __nativeclass__ = "com.example.Service"
+        getValue = JavaMethod(returns=int)
+
+    service = Service()
+    futures = [service.getValue() for i in range(3)]
+    assert app.pending_futures() == futures
+    assert app.sweep_futures(max_age=60) == {}
+    pending = []
+    app.observe("futures_pending", lambda change: pending.append(change["value"]))
+    result = app.sweep_futures(max_age=0, cancel=True)
+    count, age = result["com.example.Service.getValue"]
+    assert count == 3 and age >= 0
+    assert pending == [result]
+    assert all(f.cancelled() for f in futures)
+    assert not app.pending_futures()
+
+
+async def test_coalesce_callbacks(headless_app):
+    from enamlnative.android.bridge import JavaBridgeObject, JavaCallback
+
+    app = headless_app()
+
+    class Sensor(JavaBridgeObject):
+        __nativeclass__ = "com.example.Sensor"
+        onChanged = JavaCallback(int)
+        onLatest = JavaCallback(int, coalesce="latest")
+        onThrottled = JavaCallback(int, throttle=20)
+
+    with pytest.raises(ValueError):
+        JavaCallback(int, coalesce="first")
+
+    a, b = Sensor(), Sensor()
+    calls = []
+    for sensor in (a, b):
+        for name in ("onChanged", "onLatest", "onThrottled"):
+            getattr(sensor, name).connect(
+                lambda v, sensor=sensor, name=name: calls.append((sensor, name, v))
+            )
+
+    def batch(*events):
+        return msgpack.dumps(
+            [("event", (0, obj.__id__, name, [("int", v)])) for obj, name, v in events]
+        )
+
+    await app.process_events(
+        batch(
+            (a, "onLatest", 1),
+            (a, "onChanged", 1),
+            (b, "onLatest", 1),
+            (a, "onLatest", 2),
+            (a, "onChanged", 2),
+        )
+    )
+    assert calls == [
+        (a, "onChanged", 1),
+        (b, "onLatest", 1),
+        (a, "onLatest", 2),
+        (a, "onChanged", 2),
+    ]
+
+    # The first event is handled, the last in the interval when it ends
+    calls.clear()
+    for i in range(3):
+        await app.process_events(batch((a, "onThrottled", i)))
+    await app.process_events(batch((a, "onChanged", 3)))
+    assert calls == [(a, "onThrottled", 0), (a, "onChanged", 3)]
+    # The held event is handled after the events received later
+    await asyncio.sleep(0.03)
+    assert calls == [(a, "onThrottled", 0), (a, "onChanged", 3), (a, "onThrottled", 2)]
+    await asyncio.sleep(0.03)
+    assert not app._throttled
+
+
+async def test_dispatch_events(headless_app):
+    from enamlnative.android.bridge import JavaBridgeObject, JavaCallback
+    from enamlnative.core.bridge import REGISTRY, get_handler_info
+
+    class Service(JavaBridgeObject):
+        __nativeclass__ = "com.example.Service"
+        onSync = JavaCallback(int, returns=int)
+        onAsync = JavaCallback(int, returns=int)
+        onSerial = JavaCallback(int)
+        onConcurrent = JavaCallback(int, concurrent=True)
+
+    app = headless_app()
+    native = app.native
+    service = Service()
+    info = get_handler_info(Service, "onSync")
+    assert info.returns == "int" and not info.concurrent
+    assert get_handler_info(Service, "onConcurrent").concurrent
+    assert not get_handler_info(type(None), "onSync").returns
+
+    # Subclasses do not share it and it does not keep classes alive
+    class Temporary(Service):
+        __nativeclass__ = "com.example.Temporary"
+        onSync = JavaCallback(int, concurrent=True)
+
+    assert get_handler_info(Temporary, "onSync").concurrent
+    assert not get_handler_info(Service, "onSync").concurrent
+    ref = weakref.ref(Temporary)
+    del Temporary, REGISTRY["com.example.Temporary"]  # As if it was replaced
+    gc.collect()
+    assert ref() is None
+
+    async def double(v):
+        await asyncio.sleep(0)
+        return v * 2
+
+    service.onSync.connect(lambda v: v + 1)
+    service.onAsync.connect(double)
+    assert (
+        await asyncio.wait_for(
+            native.send_event(service.__id__, "onSync", 1, returns=True), 1
+        )
+        == 2
+    )
+    assert (
+        await asyncio.wait_for(
+            native.send_event(service.__id__, "onAsync", 2, returns=True), 1
+        )
+        == 4
+    )
+
+    calls = []
+
+    async def slow(v):
+        await asyncio.sleep(0.01 * (3 - v))
+        calls.append(v)
+
+    service.onSerial.connect(slow)
+    service.onConcurrent.connect(slow)
+
+    def batch(name):
+        return msgpack.dumps(
+            [("event", (0, service.__id__, name, [("int", i)])) for i in range(3)]
+        )
+
+    await app.process_events(batch("onSerial"))
+    assert calls == [0, 1, 2]
+    calls.clear()
+    await app.process_events(batch("onConcurrent"))
+    assert calls == []
+    await asyncio.sleep(0.05)
+    assert calls == [2, 1, 0]
+
+
+async def test_pipelining(headless_app):
+    from enamlnative.android.bridge import JavaBridgeObject, JavaMethod
+
+    class Item(JavaBridgeObject):
+        __nativeclass__ = "com.example.Item"
+        setName = JavaMethod(str)
+
+    class Store(JavaBridgeObject):
+        __nativeclass__ = "com.example.Store"
+        create = JavaMethod(returns=Item)
+        add = JavaMethod(Item)
+        count = JavaMethod(returns=int)
+        setCount = JavaMethod(int)
+
+    app = headless_app()
+    native = app.native
+    store = Store()
+    f = store.create()
+    item = f.proxy()
+    assert f.proxy() is item
+    item.setName("a")  # Called before the result is received
+    store.add(f)
+    with pytest.raises(TypeError):
+        store.setCount(store.count())
+    n = native.batch_count
+    assert await asyncio.wait_for(f, 1) is item
+    assert native.batch_count == n + 1  # No round trips
+    obj = native.objects[item.__id__]
+    assert obj.nativeclass == "com.example.Item"
+    assert obj.state["setName"] == ["a"]
+    assert native.objects[store.__id__].state["add"] == [obj]
+
+    # Results which are not objects can be passed once received
+    count = store.count()
+    await asyncio.wait_for(count, 1)
+    store.setCount(count)
+    app.force_update()
+    assert native.objects[store.__id__].state["setCount"] == [0]
+
+    # The toast is shown without waiting for it to be created
+    app.show_toast("Hello")
+    app.force_update()
+    toast = native.find("android.widget.Toast")[0]
+    assert "show" in toast.state
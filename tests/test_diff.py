@@ -0,0 +1,106 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import random
+import pytest
+from enamlnative.core.diff import Op, diff, item_changed
+
+
+def apply(items: list, new: list, ops: list) -> list:
+    """Apply the ops like a RecyclerView adapter would"""
+    result = list(items)
+    for op, a, b in ops:
+        if op == Op.MOVE:
+            result.insert(b, result.pop(a))
+            continue
+        stop = a + b
+        if op == Op.REMOVE:
+            del result[a:stop]
+        elif op == Op.INSERT:
+            result[a:a] = new[a:stop]
+        elif op == Op.CHANGE:
+            result[a:stop] = new[a:stop]
+    return result
+
+
+@pytest.mark.parametrize(
+    "old, new, expected",
+    [
+        ([1, 2, 3], [1, 2, 3], []),
+        ([1, 2, 3], [1, 2, 3, 4, 5], [(Op.INSERT, 3, 2)]),
+        ([1, 2, 3, 4], [1, 4], [(Op.REMOVE, 1, 2)]),
+        ([1, 2, 3, 4], [4, 1, 2, 3], [(Op.MOVE, 3, 0)]),
+        ([1, 2, 3, 4], [2, 3, 4, 1], [(Op.MOVE, 0, 3)]),
+        ([1, 2, 3], [], [(Op.REMOVE, 0, 3)]),
+        ([], [1, 2], [(Op.INSERT, 0, 2)]),
+    ],
+)
+def test_diff(old, new, expected):
+    assert diff(old, new) == expected
+
+
+def test_diff_changed():
+    old = [{"id": i} for i in range(5)]
+    new = [old[0], {"id": 1}, {"id": 2}, old[3], {"id": 5}]
+    ops = diff(
+        [d["id"] for d in old],
+        [d["id"] for d in new],
+        changed=lambda i, j: old[i] is not new[j],
+    )
+    assert ops == [(Op.REMOVE, 4, 1), (Op.INSERT, 4, 1), (Op.CHANGE, 1, 2)]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_diff_random(seed):
+    rng = random.Random(seed)
+    old = rng.sample(range(40), rng.randint(0, 30))
+    new = list(old)
+    for i in range(rng.randint(0, 10)):
+        action = rng.choice(("insert", "remove", "move", "shuffle"))
+        if action == "insert":
+            new.insert(rng.randint(0, len(new)), 100 + i)
+        elif new and action == "remove":
+            new.pop(rng.randrange(len(new)))
+        elif new and action == "move":
+            new.insert(rng.randint(0, len(new) - 1), new.pop(rng.randrange(len(new))))
+        elif action == "shuffle" and rng.random() < 0.2:
+            rng.shuffle(new)
+    ops = diff(old, new)
+    assert apply(old, new, ops) == new
+    moves = sum(1 for op in ops if op[0] == Op.MOVE)
+    assert moves < max(len(new), 1)
+
+
+def test_diff_limit():
+    assert diff([1, 2, 3], [1, 2, 3, 4], limit=0) is None
+    assert diff([1, 2, 3], [1, 2, 3, 4], limit=1) == [(Op.INSERT, 3, 1)]
+    old = list(range(100))
+    new = old[::-1]
+    assert diff(old, new, limit=10) is None
+    assert apply(old, new, diff(old, new, limit=100)) == new
+
+
+def test_diff_shuffle_large():
+    rng = random.Random(0)
+    old = list(range(5000))
+    new = list(old)
+    rng.shuffle(new)
+    del new[::7]
+    new[::11] = [-i - 1 for i in range(len(new[::11]))]
+    assert apply(old, new, diff(old, new)) == new
+
+
+def test_item_changed():
+    # Equal items are not updated even if they were rebuilt
+    assert not item_changed(("a", 1), ("a", 1))
+    assert item_changed(("a", 1), ("a", 2))
+    # Unhashable items are compared by identity
+    item = {"id": 1}
+    assert not item_changed(item, item)
+    assert item_changed(item, {"id": 1})
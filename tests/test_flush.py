@@ -0,0 +1,206 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import asyncio
+import pytest
+from time import time
+from utils import load, render
+from enaml.application import Application
+from enamlnative.core.bridge import Command
+from enamlnative.core.flush import FlushPolicy, FrameFlushPolicy, Lane
+
+
+def test_flush_policy():
+    policy = FlushPolicy(max_delay=1, max_events=10)
+    assert policy.check(1, 0) is None
+    assert policy.check(10, 0) == "size"
+    assert policy.check(1, 2) == "timeout"
+
+
+async def test_flush_policy_app(headless_app):
+    app = headless_app()
+    app.force_update()
+    native = app.native
+    app.flush_policy = FlushPolicy(max_delay=60, max_events=3)
+    n = native.batch_count
+    for i in range(7):
+        app.send_event(Command.ERROR, f"{i}")
+    assert native.batch_count == n + 2
+    await asyncio.sleep(0.01)
+    assert native.batch_count == n + 3
+    assert native.errors == [f"{i}" for i in range(7)]
+
+
+async def test_batched(headless_app):
+    app = headless_app()
+    app.force_update()
+    native = app.native
+    profiler = app.start_profiling()
+    app.flush_policy = FlushPolicy(max_delay=0)
+    n = native.batch_count
+    with app.batched():
+        for i in range(3):
+            app.send_event(Command.ERROR, "a")
+        with app.batched():
+            app.send_event(Command.ERROR, "b")
+        assert native.batch_count == n
+        async with app.batched():
+            app.send_event(Command.ERROR, "c")
+            await asyncio.sleep(0)  # A deferred send does not run
+        assert native.batch_count == n
+    assert native.batch_count == n + 1
+    assert native.errors == ["a", "a", "a", "b", "c"]
+    assert profiler.flushes == {"batch": 1}
+
+    with pytest.raises(ValueError):
+        with app.batched():
+            app.send_event(Command.ERROR, "d")
+            raise ValueError()
+    assert native.errors[-1] == "d"
+
+
+async def test_batched_result(headless_app):
+    from enamlnative.android.bridge import JavaBridgeObject, JavaMethod
+
+    class Service(JavaBridgeObject):
+        __nativeclass__ = "com.example.Service"
+        setValue = JavaMethod(int)
+        getValue = JavaMethod(returns=int)
+
+    app = headless_app()
+    app.force_update()
+    native = app.native
+    app.flush_policy = FlushPolicy(max_delay=0)
+    n = native.batch_count
+    async with app.batched():
+        service = Service()
+        service.setValue(1)
+        # Calls that return a result are sent with the events before them
+        assert await asyncio.wait_for(service.getValue(), 1) == 0
+        assert native.batch_count == n + 1
+        (obj,) = native.find("com.example.Service")
+        assert obj.state["setValue"] == [1]
+        service.setValue(2)
+        app.send_event(Command.ERROR, "now", now=True)
+        assert native.errors == ["now"]
+        service.setValue(3)
+        await asyncio.sleep(0)
+        assert obj.state["setValue"] == [2]
+    assert obj.state["setValue"] == [3]
+
+
+def test_frame_flush_policy():
+    policy = FrameFlushPolicy(refresh_rate=100, epoch=0, max_events=10)
+    assert policy.check(1, 1) is None
+    assert policy.check(10, 0) == "size"
+    assert policy.schedule(1.002) == pytest.approx(0.008)
+    assert policy.budget_left(1.002) == pytest.approx(0.003)
+    assert policy.budget_left(1.007) < 0
+
+
+async def test_frame_flush_policy_app(headless_app):
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox
+
+    enamldef ContentView(Flexbox):
+        pass
+    """
+    )
+    # A policy that was set is kept
+    app = headless_app()
+    app.build_info = dict(app.build_info, DISPLAY_REFRESH_RATE=90.0)
+    app.flush_policy = policy = FlushPolicy()
+    assert await render(app, ContentView)
+    assert app.activity.refresh_rate == 90
+    assert app.flush_policy is policy
+    Application._instance = None
+
+    # Otherwise the frame policy is used once the refresh rate is known
+    app = headless_app()
+    app.build_info = dict(app.build_info, DISPLAY_REFRESH_RATE=90.0)
+    assert await render(app, ContentView)
+    assert isinstance(app.flush_policy, FrameFlushPolicy)
+    assert app.flush_policy.refresh_rate == 90
+    app.set_refresh_rate(60)
+    assert app.flush_policy.refresh_rate == 60
+    app.force_update()
+    native = app.native
+    n = native.batch_count
+    for i in range(10):
+        app.send_event(Command.ERROR, f"{i}")
+    assert native.batch_count == n
+    await asyncio.sleep(0.05)
+    assert native.batch_count == n + 1
+    # Views released after the loop closes can't schedule a timed call
+    app.flush_policy = FlushPolicy()
+
+
+async def test_idle_call(headless_app):
+    app = headless_app()
+    # Over budget from the start of each frame
+    app.flush_policy = FrameFlushPolicy(refresh_rate=20, budget=0, epoch=time())
+    calls = []
+    for i in range(3):
+        app.idle_call(calls.append, i)
+    await asyncio.sleep(0.001)
+    assert calls == [0]  # One runs each frame
+    await asyncio.sleep(0.15)
+    assert calls == [0, 1, 2]
+
+    app.flush_policy = FlushPolicy()
+    for i in range(3):
+        app.idle_call(calls.append, i)
+    await asyncio.sleep(0.001)
+    assert calls == [0, 1, 2, 0, 1, 2]
+
+
+async def test_lanes(headless_app):
+    app = headless_app()
+    app.force_update()
+    native = app.native
+    calls = []
+    native.observe("called", lambda change: calls.append(change["value"][1]))
+    # Hold the normal lane
+    app.flush_policy = FlushPolicy(first_delay=60, max_delay=60)
+    app.send_event(Command.METHOD, 9001, 0, -1, "requestLayout", [])
+    app.send_event(
+        Command.METHOD,
+        9002,
+        0,
+        -2,
+        "setPressed",
+        [("boolean", True)],
+        lane=Lane.INTERACTION,
+    )
+    await asyncio.sleep(0.01)
+    assert calls == ["setPressed"]
+
+    # Results are not held by the normal lane
+    f = native.results[9003] = asyncio.Future()
+    app.send_event(Command.RESULT, 9003, ("boolean", True), now=True)
+    assert await asyncio.wait_for(f, 1) is True
+
+    # Events of an object are not sent before the ones queued in a lower
+    # priority lane
+    app.send_event(
+        Command.METHOD,
+        9001,
+        0,
+        -2,
+        "setPressed",
+        [("boolean", True)],
+        lane=Lane.INTERACTION,
+    )
+    assert app._bridge_lanes[Lane.INTERACTION].events == []
+    await asyncio.sleep(0.01)
+    assert calls == ["setPressed"]
+    app.force_update()
+    assert calls == ["setPressed", "requestLayout", "setPressed"]
+    app.flush_policy = FlushPolicy()
@@ -0,0 +1,498 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import gc
+import os
+import sys
+import asyncio
+import subprocess
+import enaml
+import pytest
+import enamlnative
+from functools import partial
+from glob import glob
+from pydoc import locate, ErrorDuringImport
+from enaml.core.expression_engine import ExpressionEngine
+from utils import load, render
+from enamlnative.widgets.list_view import ListSource
+
+
+def test_headless_import(tmp_path):
+    # Importing it without a device must not install any nativehooks
+    src = os.path.dirname(os.path.dirname(enamlnative.__file__))
+    code = (
+        "import sys\n"
+        "from enamlnative.android.headless import HeadlessAndroidApplication\n"
+        "assert 'nativehooks' not in sys.modules\n"
+    )
+    env = dict(os.environ, PYTHONPATH=src)
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+
+
+@pytest.mark.parametrize("path", glob("examples/*.enaml"))
+async def test_headless_examples(headless_app, path):
+    app = headless_app()
+    example = path[:-6].replace("/", ".")
+    if "thermostat" in example:
+        return pytest.skip("thermostat example needs updated")
+    with enaml.imports():
+        try:
+            ContentView = locate(f"{example}.ContentView")
+        except ErrorDuringImport as e:
+            return pytest.skip(f"{e}")
+    assert await render(app, ContentView)
+    native = app.native
+    assert not native.errors
+    activity = native.objects[-1]
+    (view,) = activity.state["setView"]
+    assert view.nativeclass
+
+
+async def test_headless_callbacks(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox, Button, TextView
+
+    enamldef ContentView(Flexbox):
+        attr clicks = 0
+        Button: btn:
+            text = "Click"
+            clicked :: parent.clicks += 1
+        TextView:
+            text << "Clicks: {}".format(parent.clicks)
+    """
+    )
+    assert await render(app, ContentView)
+    native = app.native
+    (button,) = native.find("android.widget.Button")
+    (label,) = native.find("android.widget.TextView")
+    assert button.state["setTextKeepState"] == ["Click"]
+    assert label.state["setTextKeepState"] == ["Clicks: 0"]
+
+    # Click it from the "native" side
+    native.send_event(button.__id__, "onClick", button.__id__)
+    f = native.send_event(button.__id__, "hashCode", returns=True)
+    assert await f == button.__id__
+    app.force_update()
+    assert label.state["setTextKeepState"] == ["Clicks: 1"]
+
+
+@pytest.mark.parametrize("bulk", (True, False))
+async def test_headless_bulk_add_views(headless_app, bulk):
+    app = headless_app()
+    app.build_info = {**app.build_info, "BULK_ADD_VIEWS": bulk}
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        attr items = list(range(10))
+        Looper:
+            iterable << parent.items
+            TextView:
+                text = f"{loop.item}"
+    """
+    )
+    calls = []
+
+    def on_called(change):
+        obj, method, args = change["value"]
+        if method in ("addView", "addViews"):
+            calls.append((method, args))
+
+    app.native.observe("called", on_called)
+    assert await render(app, ContentView)
+    native = app.native
+    assert not native.errors
+    labels = native.find("android.widget.TextView")
+    assert len(labels) == 10
+    methods = [m for m, args in calls if m == "addViews"]
+    if bulk:
+        assert len(methods) == 1
+        ((method, (parent, views, indices, params)),) = [
+            c for c in calls if c[0] == "addViews"
+        ]
+        assert list(indices) == list(range(10))
+        assert [v.__id__ for v in views] == [v.__id__ for v in labels]
+    else:
+        assert not methods
+
+    # Items added later are also merged into one call
+    calls.clear()
+    view = app.activity.example
+    view.items = list(range(13))
+    app.force_update()
+    methods = [m for m, args in calls]
+    if bulk:
+        assert methods == ["addViews"]
+        assert list(calls[0][1][2]) == [10, 11, 12]
+    else:
+        assert methods == ["addView"] * 3
+
+
+async def test_headless_declared_items_cache(headless_app):
+    from enamlnative.core import declared
+
+    app = headless_app()
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        Looper:
+            iterable = range(5)
+            TextView:
+                text = f"{loop.item}"
+                margin = (loop.item, 0, 0, 0)
+                text_color = "#f00"
+    """
+    )
+    assert await render(app, ContentView)
+    native = app.native
+    labels = native.find("android.widget.TextView")
+    assert [v.state["setTextKeepState"] for v in labels] == [[f"{i}"] for i in range(5)]
+    assert all("setTextColor" in v.state for v in labels)
+
+    # All rows share the items of one engine
+    view = app.activity.example
+    rows = [c for c in view.children if hasattr(c, "proxy")]
+    assert len(rows) == 5
+    engines = {id(c._d_engine) for c in rows}
+    assert len(engines) == 1
+    (engine_id,) = engines
+    ref, cache = declared.CACHE[engine_id]
+    assert ref() is rows[0]._d_engine
+    ((key, items),) = cache.items()
+    assert items.keys == ("text", "text_color")
+    assert items.layout == ("margin",)
+
+    # The cache does not keep released engines alive
+    engine = ExpressionEngine()
+    declared.get_declared_items(type(rows[0].proxy), engine)
+    ref, cache = declared.CACHE[id(engine)]
+    del engine
+    gc.collect()
+    assert not ref
+    declared.sweep()
+    assert engine_id in declared.CACHE
+    assert all(ref for ref, cache in declared.CACHE.values())
+
+
+async def test_headless_layout_batching(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        attr size = 10
+        TextView:
+            text = "Box"
+            margin = (1, 2, 3, 4)
+            width << size
+            height << size * 2
+    """
+    )
+    assert await render(app, ContentView)
+    native = app.native
+    (label,) = native.find("android.widget.TextView")
+    view = app.activity.example
+    app.force_update()
+    calls = label.calls
+    for i in range(5):
+        view.size += 1
+    app.force_update()
+
+    # Both keys are applied with one set of params for all changes
+    assert label.calls == calls + 1
+    (params,) = label.state["setLayoutParams"]
+    dp = view.children[0].proxy.dp
+    assert list(params.args) == [int(15 * dp), int(30 * dp)]
+    assert list(params.state["setMargins"]) == [int(i * dp) for i in (1, 2, 3, 4)]
+
+
+async def test_headless_shared_layout_params(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        Looper:
+            iterable = range(10)
+            TextView:
+                text = f"{loop.item}"
+                margin = (1, 2, 3, 4)
+                flex_grow = 1
+    """
+    )
+    assert await render(app, ContentView)
+    native = app.native
+    view = app.activity.example
+    rows = [c.proxy for c in view.children if hasattr(c, "proxy")]
+    assert len(rows) == 10
+    (params,) = {r.layout_params for r in rows}
+    found = native.find("com.google.android.flexbox.FlexboxLayout$LayoutParams")
+    assert params.__id__ in [p.__id__ for p in found]
+    assert len(found) == 2  # The root and the rows
+
+    # A row that changes gets new params and the rest keep theirs
+    rows[0].declaration.margin = (5, 5, 5, 5)
+    app.force_update()
+    assert rows[0].layout_params is not params
+    assert all(r.layout_params is params for r in rows[1:])
+    label = native.objects[rows[0].widget.__id__]
+    (new_params,) = label.state["setLayoutParams"]
+    assert new_params.__id__ == rows[0].layout_params.__id__
+
+
+async def test_headless_shared_layout_params_base(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import FrameLayout, TextView
+
+    enamldef ContentView(FrameLayout):
+        Looper:
+            iterable = range(3)
+            TextView:
+                text = f"{loop.item}"
+                margin = (1, 2, 3, 4)
+    """
+    )
+    assert await render(app, ContentView)
+    native = app.native
+    view = app.activity.example
+    rows = [c.proxy for c in view.children if hasattr(c, "proxy")]
+    (params,) = {r.layout_params for r in rows}
+
+    # Shared params are replaced instead of modified
+    rows[0].declaration.margin = (5, 5, 5, 5)
+    rows[1].declaration.padding = (5, 5, 5, 5)
+    app.force_update()
+    assert rows[0].layout_params is not params
+    assert all(r.layout_params is params for r in rows[1:])
+    margins = native.objects[rows[0].layout_params.__id__].state["setMargins"]
+    assert list(margins) == [int(5 * view.proxy.dp)] * 4
+    assert native.objects[params.__id__].calls == 1
+
+
+async def test_headless_shared_layout_params_widget_keys(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, LinearLayout, TextView
+
+    enamldef ContentView(Flexbox):
+        alias flexbox
+        alias linear_layout
+        Flexbox: flexbox:
+            Looper:
+                iterable = range(3)
+                TextView:
+                    text = f"{loop.item}"
+                    padding = (loop.index, 0, 0, 0)
+                    min_width = 10 if loop.index else 20
+        LinearLayout: linear_layout:
+            Looper:
+                iterable = range(3)
+                TextView:
+                    text = f"{loop.item}"
+                    margin = (1, 2, 3, 4)
+    """
+    )
+    assert await render(app, ContentView)
+    view = app.activity.example
+
+    def rows(parent):
+        return [c.proxy for c in parent.children if hasattr(c, "proxy")]
+
+    # Padding is applied on the view so it does not split the params but
+    # the min size is part of the flexbox params
+    a, b, c = rows(view.flexbox)
+    assert b.layout_params is c.layout_params
+    assert a.layout_params is not b.layout_params
+
+    # Linear layout params are never shared
+    params = {r.layout_params for r in rows(view.linear_layout)}
+    assert len(params) == 3
+
+
+async def test_headless_list_view_diff(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, ListView, ListItem, TextView
+
+    enamldef ContentView(Flexbox):
+        alias items: list_view.items
+        ListView: list_view:
+            items = [{"id": i} for i in range(10)]
+            item_key = lambda it: it["id"]
+            Looper:
+                iterable = range(4)
+                ListItem:
+                    TextView:
+                        text << str(parent.item)
+    """
+    )
+    calls = []
+
+    def on_called(change):
+        obj, method, args = change["value"]
+        if method.startswith("notify") or method == "setItemCount":
+            calls.append((method, list(args)))
+
+    app.native.observe("called", on_called)
+    assert await render(app, ContentView)
+    assert calls == [("setItemCount", [10]), ("notifyDataSetChanged", [])]
+
+    view = app.activity.example
+    old = view.items
+    calls.clear()
+    view.items = [old[9], {"id": 100}] + old[0:4] + [{"id": 5}] + old[6:9]
+    app.force_update()
+    assert calls == [
+        ("setItemCount", [10]),
+        ("notifyItemRangeRemoved", [4, 1]),
+        ("notifyItemMoved", [8, 0]),
+        ("notifyItemRangeInserted", [1, 1]),
+        ("notifyItemRangeChanged", [6, 1]),
+    ]
+
+    # Appending does not diff
+    calls.clear()
+    view.items.append({"id": 200})
+    app.force_update()
+    assert calls == [("setItemCount", [11]), ("notifyItemRangeInserted", [10, 1])]
+
+    calls.clear()
+    view.items.reverse()
+    app.force_update()
+    assert calls[0] == ("setItemCount", [11])
+    assert all(method == "notifyItemMoved" for method, args in calls[1:])
+
+
+async def test_headless_list_view_batch_recycle(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, ListView, ListItem, TextView
+
+    enamldef ContentView(Flexbox):
+        ListView: list_view:
+            items = [f"Item {i}" for i in range(20)]
+            Looper:
+                iterable = range(4)
+                ListItem:
+                    TextView:
+                        text << str(parent.item)
+    """
+    )
+    assert await render(app, ContentView)
+    native = app.native
+    (adapter,) = native.find("com.codelv.enamlnative.adapters.BridgedRecyclerAdapter")
+    assert adapter.state["setBatchRecycle"] == [True]
+    labels = native.find("android.widget.TextView")
+    assert len(labels) == 4
+
+    # Scroll the views to show items 10 to 13 in one event
+    batches = set()
+
+    def on_called(change):
+        obj, method, args = change["value"]
+        if method == "setTextKeepState":
+            batches.add(native.batch_count)
+
+    native.observe("called", on_called)
+    native.send_event(adapter.__id__, "onRecycleViews", [0, 1, 2, 3], [10, 11, 12, 13])
+    assert await native.send_event(adapter.__id__, "hashCode", returns=True)
+    native.unobserve("called", on_called)
+    assert len(batches) == 1
+    assert [v.state["setTextKeepState"] for v in labels] == [
+        [f"Item {i}"] for i in range(10, 14)
+    ]
+
+    # The per row event still works
+    native.send_event(adapter.__id__, "onRecycleView", 0, 19)
+    assert await native.send_event(adapter.__id__, "hashCode", returns=True)
+    assert labels[0].state["setTextKeepState"] == ["Item 19"]
+
+
+async def test_headless_list_view_source(headless_app):
+    app = headless_app()
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, ListView, ListItem, TextView
+
+    enamldef ContentView(Flexbox):
+        attr source
+        ListView: list_view:
+            source = parent.source
+            Looper:
+                iterable = range(4)
+                ListItem:
+                    TextView:
+                        text << str(parent.item)
+    """
+    )
+    pages = []
+
+    async def loader(page, page_size):
+        pages.append(page)
+        await asyncio.sleep(0)
+        return [f"Item {i}" for i in range(page * page_size, (page + 1) * page_size)]
+
+    source = ListSource(loader=loader, count=10000, page_size=10, max_pages=4)
+    assert await render(app, partial(ContentView, source=source))
+    native = app.native
+    (adapter,) = native.find("com.codelv.enamlnative.adapters.BridgedRecyclerAdapter")
+    assert adapter.state["setItemCount"] == [10000]
+    labels = native.find("android.widget.TextView")
+
+    # Rows show None until their page is loaded
+    await asyncio.sleep(0.01)
+    app.force_update()
+    assert pages == [0]
+    assert [v.state["setTextKeepState"] for v in labels] == [
+        [f"Item {i}"] for i in range(4)
+    ]
+
+    # Scrolling loads the page and the pages around it
+    native.send_event(
+        adapter.__id__, "onRecycleViews", [0, 1, 2, 3], [500, 501, 502, 503]
+    )
+    assert await native.send_event(adapter.__id__, "hashCode", returns=True)
+    await asyncio.sleep(0.01)
+    app.force_update()
+    assert pages == [0, 50, 49, 51]
+    assert [v.state["setTextKeepState"] for v in labels] == [
+        [f"Item {i}"] for i in range(500, 504)
+    ]
+    assert len(source._pages) == 4
+
+    # Changing the count reloads the list
+    source.count = 5
+    app.force_update()
+    assert adapter.state["setItemCount"] == [5]
+
+    # Growing it inserts the items added
+    source.count = 8
+    app.force_update()
+    assert adapter.state["setItemCount"] == [8]
+    assert adapter.state["notifyItemRangeInserted"] == [5, 3]
@@ -0,0 +1,112 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import asyncio
+from enamlnative.widgets.list_view import ListSource, SequenceSource
+
+
+def test_sequence_source_pages():
+    loaded = []
+
+    class Source(SequenceSource):
+        def load_page(self, page):
+            loaded.append(page)
+            return super().load_page(page)
+
+    source = Source(sequence=range(95), page_size=10, max_pages=3)
+    assert len(source) == 95
+    assert source.get(0) == 0
+    assert source.get(9) == 9
+    assert source.get(94) == 94
+    assert source.get(95) is None
+    assert loaded == [0, 9]
+
+    # The least recently used page is evicted
+    assert source.get(5) == 5
+    assert source.get(20) == 20
+    assert source.get(30) == 30
+    assert list(source._pages) == [0, 2, 3]
+
+    # Prefetch loads the pages around the position
+    source.prefetch(55)
+    assert list(source._pages) == [4, 5, 6]
+    source.prefetch(0)
+    assert list(source._pages) == [6, 0, 1]
+
+    # Setting the sequence updates the count and clears the pages
+    source.sequence = range(5)
+    assert len(source) == 5
+    assert not source._pages
+
+
+async def test_list_source_async_loader():
+    requests = []
+
+    async def loader(page, page_size):
+        requests.append(page)
+        await asyncio.sleep(0)
+        return [f"{page}-{i}" for i in range(page_size)]
+
+    source = ListSource(loader=loader, count=100, page_size=20, prefetch_pages=1)
+    events = []
+    source.observe("loaded", lambda change: events.append(change["value"]))
+
+    assert source.get(25) is None
+    source.prefetch(25)
+    await asyncio.sleep(0.01)
+    assert sorted(requests) == [0, 1, 2]
+    assert sorted(events) == [(0, 20), (20, 40), (40, 60)]
+    assert source.get(25) == "1-5"
+
+    # Pages past the new count are dropped when it changes
+    source.prefetch(90)
+    source.count = 50
+    await asyncio.sleep(0.01)
+    assert len(events) == 3
+    assert list(source._pages) == [0, 1]
+
+    # Growing it keeps the pages that were complete
+    source.count = 95
+    assert list(source._pages) == [0, 1]
+    source.prefetch(90)
+    await asyncio.sleep(0.01)
+    source.count = 200
+    assert sorted(source._pages) == [0, 1, 3]
+
+    # Changing the page size drops all the pages
+    source.page_size = 10
+    assert not source._pages
+
+
+async def test_list_source_loader_error(capsys):
+    requests = []
+
+    async def loader(page, page_size):
+        requests.append(page)
+        await asyncio.sleep(0)
+        if len(requests) == 1:
+            raise ValueError("offline")
+        return list(range(page_size))
+
+    source = ListSource(loader=loader, count=10, page_size=10, prefetch_pages=0)
+    errors = []
+    source.observe("failed", lambda change: errors.append(change["value"]))
+
+    assert source.get(0) is None
+    await asyncio.sleep(0.01)
+    assert [(page, str(exc)) for page, exc in errors] == [(0, "offline")]
+    assert "Failed to load page 0: offline" in capsys.readouterr().out
+    assert not source._pages
+    assert not source._loading
+
+    # The failed page is requested again the next time it is used
+    assert source.get(0) is None
+    await asyncio.sleep(0.01)
+    assert requests == [0, 0]
+    assert source.get(0) == 0
@@ -0,0 +1,266 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import asyncio
+import gc
+import msgpack
+from enaml.application import Application
+from utils import load, render
+from enamlnative.core.bridge import Command, ExtType
+from enamlnative.core.flush import FlushPolicy
+from enamlnative.core.optimize import (
+    NameTable,
+    coalesce_setters,
+    elide_temporary_objects,
+    merge_deletes,
+)
+
+
+def method(obj_id, name, *args, result_id=0, method_id=None):
+    # Use negative ids so they never match a real method in COALESCE
+    method_id = method_id or -(hash(name) % 1000) - 1
+    return (Command.METHOD, (obj_id, result_id, method_id, name, list(args)))
+
+
+def test_coalesce_setters():
+    events = [
+        (Command.CREATE, (1, 0, "android.widget.TextView", [])),
+        method(1, "setText", "a"),
+        method(2, "setText", "b"),
+        method(1, "setAlpha", 0.5),
+        method(1, "setText", "c"),
+        (Command.FIELD, (2, 5, "width", [1])),
+        (Command.FIELD, (2, 5, "width", [2])),
+        method(1, "setAlpha", 1.0),
+    ]
+    assert coalesce_setters(events) == [
+        events[0],
+        events[2],
+        events[4],
+        events[6],
+        events[7],
+    ]
+
+
+def test_coalesce_setters_barriers():
+    events = [
+        method(1, "setText", "a"),
+        method(1, "invalidate"),  # Barrier for obj 1 only
+        method(2, "setText", "b"),
+        method(1, "setText", "c"),
+        method(2, "setText", "d"),
+        method(3, "getText", result_id=5),  # Barrier for all
+        method(1, "setText", "e"),
+        method(2, "setPadding", 1, 2, 3, 4),  # Not a setter by default
+        method(2, "setPadding", 1, 2, 3, 4),
+        (Command.DELETE, (1,)),
+        (Command.CREATE, (1, 0, "android.view.View", [])),
+        method(1, "setText", "f"),
+    ]
+    assert coalesce_setters(events) == [
+        events[0],
+        events[1],
+        events[3],
+        events[4],
+        events[5],
+        *events[6:],
+    ]
+    events = [method(1, "setTag", 1, "a"), method(1, "setTag", 2, "b")]
+    assert coalesce_setters(events) is events
+
+
+def test_coalesce_setters_refs():
+    params = msgpack.ExtType(ExtType.REF, msgpack.packb(2))
+    events = [
+        (Command.FIELD, (2, 5, "width", [1])),
+        method(1, "setLayoutParams", params),  # Uses the width set above
+        (Command.FIELD, (2, 5, "width", [2])),
+        method(2, "setHeight", 1),
+        (Command.CREATE, (3, 0, "android.view.View", [[params]])),
+        method(2, "setHeight", 2),
+    ]
+    assert coalesce_setters(events) is events
+    events[1] = method(1, "setAlpha", 0.5)
+    assert coalesce_setters(events) == events[1:]
+
+
+async def test_coalesce_setters_app(headless_app):
+    app = headless_app()
+    app.bridge_optimizers = [coalesce_setters]
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        attr count = 0
+        TextView:
+            text << "Count {}".format(count)
+            padding << (count, count, count, count)
+    """
+    )
+    assert await render(app, ContentView)
+    native = app.native
+    (label,) = native.find("android.widget.TextView")
+    view = app.activity.example
+    app.force_update()
+    calls = label.calls
+    for i in range(10):
+        view.count += 1
+    app.force_update()
+    assert label.calls == calls + 2
+    assert label.state["setTextKeepState"] == ["Count 10"]
+    assert label.state["setPadding"] == [int(app.activity.dp * 10)] * 4
+
+
+def ref(obj_id):
+    return msgpack.ExtType(ExtType.REF, msgpack.packb(obj_id))
+
+
+def test_elide_temporary_objects():
+    events = [
+        (Command.CREATE, (1, 0, "android.view.View", [("Context", ref(-1))])),
+        method(1, "setAlpha", 0.5),
+        (Command.CREATE, (2, 0, "android.view.ViewGroup$LayoutParams", [])),
+        method(2, "setMargins", 1, 2, 3, 4),
+        (Command.CREATE, (3, 0, "android.view.ViewGroup$LayoutParams", [])),
+        method(1, "setLayoutParams", ("LayoutParams", ref(3))),
+        (Command.CREATE, (4, 0, "android.app.Dialog", [])),
+        method(4, "show"),
+        (Command.DELETE, (2,)),
+        (Command.DELETE, (3,)),
+        (Command.DELETE, (4,)),
+        (Command.DELETE, (5,)),
+    ]
+    assert elide_temporary_objects(events) == [
+        events[0],
+        events[1],
+        *events[4:8],
+        *events[9:],
+    ]
+    events = events[:2]
+    assert elide_temporary_objects(events) is events
+
+
+def test_merge_deletes():
+    events = [
+        (Command.DELETE, (1,)),
+        method(2, "setAlpha", 0.5),
+        (Command.DELETE, (3,)),
+        (Command.CREATE, (1, 0, "android.view.View", [])),
+        (Command.DELETE, (4,)),
+    ]
+    assert merge_deletes(events) == [
+        method(2, "setAlpha", 0.5),
+        (Command.BULK_DELETE, ([1, 3],)),
+        (Command.CREATE, (1, 0, "android.view.View", [])),
+        (Command.BULK_DELETE, ([4],)),
+    ]
+    events = events[:2]
+    assert merge_deletes(events) is events
+
+    # The id of a result can also be reused
+    static = (Command.STATIC_METHOD, ("android.widget.Toast", 1, 1, "makeText", []))
+    events = [
+        (Command.DELETE, (1,)),
+        static,
+        (Command.DELETE, (2,)),
+        method(3, "getValue", result_id=2),
+    ]
+    assert merge_deletes(events) == [
+        (Command.BULK_DELETE, ([1],)),
+        static,
+        (Command.BULK_DELETE, ([2],)),
+        method(3, "getValue", result_id=2),
+    ]
+
+
+async def test_bulk_delete_app(headless_app):
+    from enamlnative.android.android_view import View
+
+    app = headless_app()
+    app.bridge_optimizers = [elide_temporary_objects, merge_deletes]
+    # A slow collection must not flush the deletes before the force_update
+    app.flush_policy = FlushPolicy(max_delay=60)
+    native = app.native
+    keep = [View(app) for i in range(3)]
+    app.force_update()
+    assert all(v.__id__ in native.objects for v in keep)
+
+    temp = [View(app) for i in range(3)]
+    temp[0].setAlpha(0.5)
+    del temp
+    del keep
+    gc.collect()
+    n = native.event_count
+    app.force_update()
+    assert native.event_count == n + 1  # Only the bulk delete
+    assert not native.objects.keys() - {-1}
+
+
+def test_name_table():
+    table = NameTable()
+    events = [
+        (Command.CREATE, (1, 2, "android.widget.TextView", [])),
+        method(1, "setText", "a", method_id=3),
+        (Command.FIELD, (1, 4, "width", [1])),
+        (Command.PROXY, (2, "android.widget.TextView", 1)),
+        method(2, "setText", "b", method_id=3),
+        (Command.STATIC_METHOD, ("android.widget.Toast", 3, 5, "makeText", [])),
+        (Command.DELETE, (1,)),
+    ]
+    assert table.intern(events) == [
+        (Command.DEF, (1, "android.widget.TextView")),
+        (Command.CREATE, (1, 2, 1, [])),
+        (Command.DEF, (2, "setText")),
+        method(1, 2, "a", method_id=3),
+        (Command.DEF, (3, "width")),
+        (Command.FIELD, (1, 4, 3, [1])),
+        (Command.PROXY, (2, 1, 1)),
+        method(2, 2, "b", method_id=3),
+        (Command.DEF, (4, "android.widget.Toast")),
+        (Command.DEF, (5, "makeText")),
+        (Command.STATIC_METHOD, (4, 3, 5, 5, [])),
+        events[-1],
+    ]
+    # Names are only sent once
+    assert table.intern(events[1:2]) == [method(1, 2, "a", method_id=3)]
+
+
+async def test_name_table_app(headless_app):
+    ContentView = load(
+        """
+    from enaml.core.api import Looper
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        Looper:
+            iterable = range(20)
+            TextView:
+                text = "Item {}".format(loop.index)
+    """
+    )
+    sizes = []
+    for name_table in (None, NameTable()):
+        app = headless_app(name_table=name_table)
+        assert await render(app, ContentView)
+        app.force_update()
+        native = app.native
+        labels = native.find("android.widget.TextView")
+        assert len(labels) == 20
+        assert labels[-1].state["setTextKeepState"] == ["Item 19"]
+        sizes.append(native.bytes_received)
+        if name_table is None:
+            Application._instance = None
+    assert sizes[1] < sizes[0]
+
+    # Names are sent again when the native side restarts
+    native.names.clear()
+    await asyncio.wait_for(app.activity.start(), 1)
+    app.force_update()
+    assert native.names and not native.errors
@@ -0,0 +1,96 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import gc
+import json
+from utils import load, render
+from enamlnative.core.bridge import Command
+from enamlnative.core.profiler import LatencyStats
+
+
+async def test_profiler(headless_app):
+    app = headless_app()
+    profiler = app.start_profiling()
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        TextView:
+            text = "Hello"
+            padding = (1, 2, 3, 4)
+    """
+    )
+    assert await render(app, ContentView)
+    app.force_update()
+
+    key = (Command.CREATE, "android.widget.TextView", "<init>")
+    assert profiler.events[key].count == 1
+    key = (Command.METHOD, "android.widget.TextView", "setTextKeepState")
+    stats = profiler.events[key]
+    assert stats.count == 1 and stats.size > len("Hello")
+    assert profiler.top(1, "count")[0][1].count >= 1
+
+    assert profiler.batches == sum(profiler.batch_sizes.values())
+    assert profiler.flushes["first"] >= 1
+    assert profiler.batch_bytes == app.native.bytes_received
+
+    data = json.loads(json.dumps(profiler.dump()))
+    assert data["batches"]["count"] == profiler.batches
+    assert {"command", "nativeclass", "method", "count", "bytes"} <= set(
+        data["events"][0]
+    )
+
+    # Deletes are counted for the class of the released object
+    view = app.activity.example
+    view.destroy()
+    gc.collect()
+    key = (Command.DELETE, "android.widget.TextView", "")
+    assert profiler.events[key].count == 1
+
+    assert app.stop_profiling() is profiler
+    profiler.reset()
+    app.show_error("Not recorded")
+    app.force_update()
+    assert not profiler.events and not profiler.batches
+
+
+def test_latency_stats():
+    stats = LatencyStats()
+    for i in range(1, 101):
+        stats.record(i / 1000)
+    assert stats.count == 100
+    assert stats.max == 0.1
+    assert 0.05 <= stats.percentile(50) <= 0.05 * LatencyStats.GROWTH
+    assert 0.099 <= stats.percentile(99) <= 0.1
+    assert stats.percentile(100) == stats.max
+    assert LatencyStats().percentile(50) == 0
+
+
+async def test_profiler_latency(headless_app):
+    app = headless_app()
+    profiler = app.start_profiling()
+    profiler.slow_call_threshold = 0
+    slow = []
+    profiler.observe("slow_call", lambda change: slow.append(change["value"]))
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox
+
+    enamldef ContentView(Flexbox):
+        pass
+    """
+    )
+    assert await render(app, ContentView)
+    stats = profiler.latencies["com.codelv.enamlnative.EnamlActivity.getBuildInfo"]
+    assert stats.count == 1
+    assert 0 < stats.percentile(50) <= stats.max
+    assert slow and slow[0][0] in profiler.latencies
+    data = profiler.dump()
+    assert data["latencies"][slow[0][0]]["count"] >= 1
@@ -0,0 +1,90 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import gc
+import pytest
+from enaml.application import Application
+from utils import load, render
+from enamlnative.core import bridge
+from enamlnative.core.registry import GEN_BITS, SlotMap
+from enamlnative.android.headless import HeadlessAndroidApplication
+
+
+class Obj:
+    pass
+
+
+def test_slot_map():
+    table = SlotMap()
+    a, b = Obj(), Obj()
+    ka = table.allocate()
+    table[ka] = a
+    kb = table.allocate()
+    table[kb] = b
+    assert table[ka] is a and table.get(kb) is b
+    assert len(table) == 2 and table.peak == 2
+    assert table.counts() == {"Obj": 2}
+
+    # Released objects free the slot and the next id uses a new generation
+    del a
+    gc.collect()
+    assert ka not in table and len(table) == 1
+    kc = table.allocate()
+    assert kc != ka and kc >> GEN_BITS == ka >> GEN_BITS
+    c = Obj()
+    table[kc] = c
+    assert table.get(ka) is None and table.stale == 2
+    assert table.capacity == 2
+
+    del table[kb]
+    with pytest.raises(KeyError):
+        table[kb]
+
+    # Ids not allocated by the table still work
+    d = Obj()
+    table[-1] = d
+    assert table[-1] is d
+    assert sorted(table.keys()) == [-1, kc]
+
+
+def test_slot_map_existing_ids():
+    table = SlotMap()
+    obj = Obj()
+    key = 1 << GEN_BITS
+    table[key] = obj
+    assert table[key] is obj
+    assert table.allocate() != key
+
+
+@pytest.fixture
+def slot_map():
+    cache = bridge.CACHE
+    table = SlotMap()
+    bridge.set_registry(table)
+    yield table
+    bridge.set_registry(cache)
+    Application._instance = None
+
+
+async def test_slot_map_app(slot_map):
+    app = HeadlessAndroidApplication()
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox, TextView
+
+    enamldef ContentView(Flexbox):
+        TextView:
+            text = "Hello"
+    """
+    )
+    assert await render(app, ContentView)
+    app.force_update()
+    (label,) = app.native.find("android.widget.TextView")
+    assert slot_map[label.__id__].__nativeclass__ == "android.widget.TextView"
+    assert slot_map.live > 0 and slot_map.peak >= slot_map.live
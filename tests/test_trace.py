@@ -0,0 +1,71 @@
+"""
+Copyright (c) 2017-2022, Jairus Martin.
+
+Distributed under the terms of the MIT License.
+
+The full license is in the file LICENSE, distributed with this software.
+
+Created on Oct 18, 2026
+"""
+import asyncio
+import json
+from time import perf_counter
+from utils import load, render
+from enamlnative.core.trace import Tracer
+
+
+def test_tracer_ring_buffer():
+    tracer = Tracer(maxlen=10)
+    for i in range(20):
+        tracer.record(f"span{i}", "test", perf_counter())
+    assert len(tracer.spans) == 10
+    events = tracer.dump()["traceEvents"]
+    assert [e["name"] for e in events] == [f"span{i}" for i in range(10, 20)]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+async def test_tracer_wrap_async():
+    tracer = Tracer()
+
+    async def task():
+        await asyncio.sleep(0.02)
+        return 1
+
+    assert await tracer.wrap(task)() == 1
+    ((name, cat, start, end, tid, args),) = tracer.spans
+    assert name.endswith("task") and end - start >= 0.02
+
+
+async def test_trace(headless_app, tmp_path):
+    app = headless_app()
+    tracer = app.start_tracing()
+    ContentView = load(
+        """
+    from enamlnative.widgets.api import Flexbox, Button
+
+    enamldef ContentView(Flexbox):
+        Button:
+            text = "Click"
+    """
+    )
+    assert await render(app, ContentView)
+    (button,) = app.native.find("android.widget.Button")
+    app.native.send_event(button.__id__, "onClick", button.__id__)
+    assert await app.native.send_event(button.__id__, "hashCode", returns=True)
+
+    path = tmp_path / "trace.json"
+    tracer.save(path)
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    cats = {e["cat"] for e in events}
+    assert {"loop", "bridge", "handle_event"} <= cats
+    sends = [e for e in events if e["name"] == "bridge_send"]
+    assert sends and all(e["args"]["events"] > 0 for e in sends)
+    assert any(e["name"] == "process_events" for e in events)
+    (click,) = [e for e in events if e["name"] == "onClick"]
+    assert click["args"]["ptr"] == button.__id__
+
+    assert app.stop_tracing() is tracer
+    n = len(tracer.spans)
+    app.force_update()
+    assert len(tracer.spans) == n
@@ -7,6 +7,7 @@
 # ------------------------------------------------------------------------------
 import os
 import sh
+import enaml
 from contextlib import contextmanager
 from textwrap import dedent
 from enaml.core.enaml_compiler import EnamlCompiler
@@ -37,10 +38,41 @@ def compile_source(source, item, filename="<test>"):
     ast = parse(source, filename)
     code = EnamlCompiler.compile(ast, filename)
     namespace = {}
-    exec(code, {}, namespace)
+    exec(code, namespace)
     return namespace[item]
 
 
+async def render(app, ContentView, timeout=5):
+    """Start the app's activity with the given view and wait until the view
+    is set on the headless bridge. Returns False if it timed out.
+
+    """
+    with enaml.imports():
+        from activity import ExampleActivity
+
+    app.activity = ExampleActivity(example=ContentView())
+    f = app.create_future()
+
+    def on_called(change):
+        obj, method, args = change["value"]
+        if method == "setView" and not f.done():
+            f.set_result(True)
+
+    def on_error(change):
+        if not f.done():
+            f.set_exception(change["value"])
+
+    app.native.observe("called", on_called)
+    app.observe("error_occurred", on_error)
+    app.timed_call(timeout * 1000, lambda: f.done() or f.set_result(False))
+    app.deferred_call(app.activity.start)
+    try:
+        return await f
+    finally:
+        app.native.unobserve("called", on_called)
+        app.unobserve("error_occurred", on_error)
+
+
 @contextmanager
 def cd(newdir):
     prevdir = os.getcwd()